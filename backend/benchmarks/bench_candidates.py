@@ -0,0 +1,116 @@
+"""
+Recall and latency of approximate top-k candidate retrieval
+
+Indexes a synthetic org-wide pool (members drawn from skill families,
+like teams of a large organisation) and compares CandidateIndex
+searches at several n_probe settings with exact top-k search, reporting
+recall@k and per-task latency. Also times the exact T x M skill matrix
+the index replaces, index build and incremental member updates.
+
+Usage:
+    python benchmarks/bench_candidates.py [--members 10000] [--tasks 500]
+        [--top-k 50] [--lists 100] [--probes 1,2,4,8,16,32]
+"""
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from src.data_model.task import Task, Priority
+from src.data_model.team_member import TeamMember, Skill
+from src.decision_engine.candidate_index import CandidateIndex
+from src.feature_engine.feature_extractor import FeatureExtractor
+from src.feature_engine.skill_taxonomy import SkillTaxonomy
+
+
+def make_org(num_members: int, num_tasks: int, families: int, seed: int = 0):
+    rng = random.Random(seed)
+    family_skills = [[f"family-{f}-skill-{s}" for s in range(12)] for f in range(families)]
+    shared = [f"shared-{s}" for s in range(20)]
+
+    def skills_for() -> list:
+        family = rng.choice(family_skills)
+        return rng.sample(family, rng.randint(3, 6)) + rng.sample(shared, rng.randint(0, 2))
+
+    members = [
+        TeamMember(
+            id=f"member-{i}",
+            name=f"Member {i}",
+            email=f"member-{i}@example.com",
+            skills=[Skill(name=s, proficiency=rng.uniform(0.3, 1.0)) for s in skills_for()],
+            total_hours_available=80.0
+        )
+        for i in range(num_members)
+    ]
+    deadline = datetime.utcnow() + timedelta(days=14)
+    tasks = [
+        Task(
+            id=f"task-{i}",
+            title=f"Task {i}",
+            description="Benchmark task",
+            required_skills=skills_for()[:rng.randint(1, 3)],
+            complexity=rng.random(),
+            estimated_hours=8.0,
+            priority=Priority.MEDIUM,
+            deadline=deadline
+        )
+        for i in range(num_tasks)
+    ]
+    return members, tasks, rng
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--members", type=int, default=10_000)
+    parser.add_argument("--tasks", type=int, default=500)
+    parser.add_argument("--families", type=int, default=40, help="Skill families members are drawn from")
+    parser.add_argument("--top-k", type=int, default=50)
+    parser.add_argument("--lists", type=int, default=None, help="IVF lists (default: about sqrt(members))")
+    parser.add_argument("--probes", default="1,2,4,8,16,32", help="n_probe values to compare")
+    args = parser.parse_args()
+
+    members, tasks, rng = make_org(args.members, args.tasks, args.families)
+    taxonomy = SkillTaxonomy()
+
+    start = time.perf_counter()
+    FeatureExtractor.skill_compatibility_matrix(tasks, members, taxonomy)
+    matrix_seconds = time.perf_counter() - start
+
+    index = CandidateIndex(top_k=args.top_k, n_lists=args.lists, min_members=1, taxonomy=taxonomy)
+    start = time.perf_counter()
+    for member in members:
+        index.upsert(member)
+    index.train()
+    build_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    exact = [set(index.exact_search(task)) for task in tasks]
+    exact_ms = (time.perf_counter() - start) / len(tasks) * 1000
+
+    print(f"{args.members} members, {args.tasks} tasks, top-k {args.top_k}, {len(index._lists)} lists")
+    print(f"exact skill matrix (T x M): {matrix_seconds:.2f}s   index build: {build_seconds:.2f}s")
+    print(f"{'search':<12}{'recall@k':>10}{'ms/task':>10}{'speedup':>10}")
+    print(f"{'exact':<12}{1.0:>10.3f}{exact_ms:>10.3f}{1.0:>9.1f}x")
+    for n_probe in [int(p) for p in args.probes.split(",")]:
+        index.n_probe = n_probe
+        start = time.perf_counter()
+        found = [set(index.search(task)) for task in tasks]
+        ms = (time.perf_counter() - start) / len(tasks) * 1000
+        recall = np.mean([len(f & e) / len(e) if e else 1.0 for f, e in zip(found, exact)])
+        print(f"{f'n_probe={n_probe}':<12}{recall:>10.3f}{ms:>10.3f}{exact_ms / ms:>9.1f}x")
+
+    updates = [m.model_copy(update={"id": f"member-{rng.randrange(args.members)}"}) for m in members[:200]]
+    start = time.perf_counter()
+    for member in updates:
+        index.upsert(member)
+    print(f"incremental upsert: {(time.perf_counter() - start) / len(updates) * 1000:.3f} ms/member")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Roadmap planning time for large backlogs
+
+Plans a synthetic backlog (with dependency chains and spread-out
+deadlines) over several sprints with HorizonPlanner.
+
+Usage:
+    python benchmarks/bench_roadmap.py [--tasks 10000] [--members 100] [--sprints 8]
+"""
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.data_model.task import Task, Priority
+from src.data_model.team_member import TeamMember, Skill
+from src.sprint_planner.horizon_planner import HorizonPlanner
+
+SKILLS = [f"skill-{i}" for i in range(30)]
+
+
+def make_backlog(num_tasks: int, num_members: int, num_sprints: int, seed: int = 0):
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    members = [
+        TeamMember(
+            id=f"member-{i}",
+            name=f"Member {i}",
+            email=f"member-{i}@example.com",
+            skills=[Skill(name=s, proficiency=rng.uniform(0.3, 1.0)) for s in rng.sample(SKILLS, 8)],
+            total_hours_available=80.0
+        )
+        for i in range(num_members)
+    ]
+    tasks = []
+    for i in range(num_tasks):
+        depends_on = [f"task-{j}" for j in rng.sample(range(i), min(i, 2))] if rng.random() < 0.3 else []
+        tasks.append(Task(
+            id=f"task-{i}",
+            title=f"Task {i}",
+            description="Benchmark task",
+            required_skills=rng.sample(SKILLS, 2),
+            complexity=rng.random(),
+            estimated_hours=float(rng.randint(2, 16)),
+            priority=rng.choice(list(Priority)),
+            deadline=now + timedelta(days=rng.randint(0, 14 * num_sprints)),
+            depends_on=depends_on
+        ))
+    return tasks, members, now
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=10_000)
+    parser.add_argument("--members", type=int, default=100)
+    parser.add_argument("--sprints", type=int, default=8)
+    args = parser.parse_args()
+
+    tasks, members, now = make_backlog(args.tasks, args.members, args.sprints)
+    start = time.perf_counter()
+    roadmap = HorizonPlanner().plan(tasks, members, args.sprints, as_of=now)
+    elapsed = time.perf_counter() - start
+
+    print(f"{args.tasks} tasks, {args.members} members, {args.sprints} sprints: {elapsed:.2f}s")
+    print(f"scheduled={len(roadmap.scheduled)} unscheduled={len(roadmap.unscheduled)} late={len(roadmap.late_task_ids)}")
+    for sprint in roadmap.sprints:
+        print(f"  sprint {sprint.index}: {sprint.task_count} tasks, "
+              f"utilization {sprint.utilization:.0%}, backlog done {sprint.completed_fraction:.0%}")
+
+
+if __name__ == "__main__":
+    main()
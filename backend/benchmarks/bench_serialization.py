@@ -0,0 +1,91 @@
+"""
+Serialization throughput for /sprints/plan responses
+
+Compares the legacy path (``.dict()`` per model, then FastAPI's
+jsonable_encoder and json.dumps) with the pydantic-core path used by
+the routes (``SprintPlanResult.model_dump_json``).
+
+Usage:
+    python benchmarks/bench_serialization.py [--tasks 100 1000 5000]
+"""
+import argparse
+import json
+import sys
+import time
+import warnings
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi.encoders import jsonable_encoder
+from src.api.models import SprintPlanResult
+from src.data_model.sprint import Sprint
+from src.data_model.task import Task, Priority
+
+
+def make_plan(num_tasks: int):
+    now = datetime.utcnow()
+    sprint = Sprint(
+        id="sprint-1",
+        name="Benchmark Sprint",
+        start_date=now,
+        end_date=now + timedelta(days=14),
+        team_members=[f"member-{i}" for i in range(20)],
+        task_ids=[f"task-{i}" for i in range(num_tasks)],
+        planned_tasks=num_tasks
+    )
+    tasks = [
+        Task(
+            id=f"task-{i}",
+            title=f"Task {i}",
+            description="Benchmark task with a realistic description length",
+            required_skills=["Python", "FastAPI", "SQL"][: 1 + i % 3],
+            complexity=(i % 10) / 10,
+            estimated_hours=1.0 + i % 16,
+            priority=list(Priority)[i % 4],
+            deadline=now + timedelta(days=i % 30),
+            assigned_to=f"member-{i % 20}"
+        )
+        for i in range(num_tasks)
+    ]
+    return sprint, tasks
+
+
+def legacy_encode(sprint: Sprint, tasks) -> bytes:
+    """What FastAPI did for the old dict-returning route"""
+    content = jsonable_encoder({"sprint": sprint.dict(), "tasks": [t.dict() for t in tasks]})
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode()
+
+
+def fast_encode(sprint: Sprint, tasks) -> bytes:
+    return SprintPlanResult.model_construct(sprint=sprint, tasks=tasks).model_dump_json().encode()
+
+
+def measure(fn, sprint, tasks, min_seconds: float = 1.0) -> float:
+    """Return calls per second"""
+    calls = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < min_seconds:
+        fn(sprint, tasks)
+        calls += 1
+    return calls / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--tasks", type=int, nargs="+", default=[100, 1000, 5000])
+    args = parser.parse_args()
+    warnings.filterwarnings("ignore", message="The `dict` method is deprecated")
+
+    print(f"{'tasks':>7} {'legacy plans/s':>15} {'fast plans/s':>13} {'speedup':>8}")
+    for num_tasks in args.tasks:
+        sprint, tasks = make_plan(num_tasks)
+        assert json.loads(legacy_encode(sprint, tasks)) == json.loads(fast_encode(sprint, tasks))
+        legacy = measure(legacy_encode, sprint, tasks)
+        fast = measure(fast_encode, sprint, tasks)
+        print(f"{num_tasks:>7} {legacy:>15.1f} {fast:>13.1f} {fast / legacy:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
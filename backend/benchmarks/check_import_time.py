@@ -0,0 +1,97 @@
+"""
+Import-time budget check for the API process
+
+Runs ``python -X importtime -c "import src.main"`` in a clean
+interpreter, fails if the total exceeds the budget or if any module
+that should only be loaded on first use (ML, optimization and LLM
+SDKs) was imported, and prints the slowest imports.
+
+Usage:
+    python benchmarks/check_import_time.py [--budget-ms 1500] [--top 15]
+"""
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+BACKEND_DIR = Path(__file__).parent.parent
+
+# Optional subsystems that must not be imported when the API starts
+LAZY_MODULES = (
+    "pandas",
+    "sklearn",
+    "scipy",
+    "openai",
+    "google.generativeai",
+    "pyarrow",
+    "msgpack",
+)
+
+
+def measure_imports(module: str = "src.main") -> Dict[str, Tuple[int, int]]:
+    """Return {module: (self_us, cumulative_us)} for a fresh interpreter"""
+    env = dict(os.environ, PYTHONPATH=str(BACKEND_DIR))
+    # Per-feature settings must not be needed just to start the API
+    for key in ("OPENAI_API_KEY", "GEMINI_API_KEY"):
+        env.pop(key, None)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr}")
+
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        timings[name.strip()] = (int(self_us), int(cumulative_us))
+    return timings
+
+
+def check(budget_ms: float, module: str = "src.main") -> Tuple[bool, List[str], Dict[str, Tuple[int, int]]]:
+    """Return (passed, problems, timings)"""
+    timings = measure_imports(module)
+    problems = []
+
+    eager = sorted(
+        name for name in timings
+        if any(name == lazy or name.startswith(lazy + ".") for lazy in LAZY_MODULES)
+    )
+    if eager:
+        roots = sorted({name.split(".")[0] for name in eager})
+        problems.append(f"optional modules imported at startup: {', '.join(roots)}")
+
+    total_ms = timings.get(module, (0, 0))[1] / 1000
+    if total_ms > budget_ms:
+        problems.append(f"import of {module} took {total_ms:.0f} ms (budget {budget_ms:.0f} ms)")
+
+    return not problems, problems, timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--budget-ms", type=float, default=1500.0)
+    parser.add_argument("--module", default="src.main")
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    passed, problems, timings = check(args.budget_ms, args.module)
+    print(f"Total import time of {args.module}: {timings.get(args.module, (0, 0))[1] / 1000:.1f} ms")
+    print(f"\nSlowest imports by self time:")
+    for name, (self_us, cumulative_us) in sorted(timings.items(), key=lambda x: -x[1][0])[: args.top]:
+        print(f"  {self_us / 1000:8.1f} ms  {name}")
+
+    for problem in problems:
+        print(f"FAIL: {problem}")
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
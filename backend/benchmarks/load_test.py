@@ -0,0 +1,264 @@
+"""
+HTTP load test with per-endpoint latency percentiles
+
+Seeds synthetic teams (one tenant each) with members and a backlog,
+then runs a weighted mix of creates, lists, /sprints/plan and sprint
+reads from concurrent clients. By default the app runs in-process
+(httpx ASGI transport); pass --url to drive a running server instead.
+Reports p50/p95/p99 latency, throughput and error rate per endpoint and
+saves the run as JSON so runs can be compared across commits.
+
+Usage:
+    python benchmarks/load_test.py [--url http://localhost:8000] [--concurrency 16]
+        [--duration 10] [--teams 4] [--members 10] [--tasks 200]
+        [--mix create_task=2,list_tasks=3,plan_sprint=1,get_sprint=4]
+        [--output benchmarks/results] [--compare previous.json]
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import httpx
+import numpy as np
+
+SKILLS = [f"skill-{i}" for i in range(20)]
+DEFAULT_MIX = "create_task=2,create_member=1,list_tasks=2,list_members=2,plan_sprint=1,get_sprint=4"
+
+
+def member_body(rng: random.Random, i: int) -> dict:
+    return {
+        "name": f"Member {i}",
+        "email": f"member-{i}@example.com",
+        "skills": [{"name": s, "proficiency": round(rng.uniform(0.3, 1.0), 2)} for s in rng.sample(SKILLS, 5)],
+        "total_hours_available": 80
+    }
+
+
+def task_body(rng: random.Random, i: int) -> dict:
+    return {
+        "title": f"Task {i}",
+        "description": "Load test task",
+        "required_skills": rng.sample(SKILLS, 2),
+        "complexity": round(rng.random(), 2),
+        "estimated_hours": rng.randint(2, 16),
+        "priority": rng.choice(["low", "medium", "high", "critical"]),
+        "deadline": (datetime.utcnow() + timedelta(days=rng.randint(1, 30))).isoformat()
+    }
+
+
+class Team:
+    """Client-side view of one synthetic tenant"""
+
+    def __init__(self, tenant_id: str):
+        self.headers = {"X-Tenant-ID": tenant_id}
+        self.member_ids = []
+        self.sprint_ids = []
+        self.counter = 0
+
+    def next_id(self) -> int:
+        self.counter += 1
+        return self.counter
+
+
+async def seed(client: httpx.AsyncClient, teams, members: int, tasks: int, rng: random.Random):
+    for team in teams:
+        for i in range(members):
+            response = await client.post("/team-members", json=member_body(rng, i), headers=team.headers)
+            response.raise_for_status()
+            team.member_ids.append(response.json()["id"])
+        for i in range(tasks):
+            response = await client.post("/tasks", json=task_body(rng, i), headers=team.headers)
+            response.raise_for_status()
+        response = await client.post("/sprints/plan", headers=team.headers, json={
+            "name": "Seed sprint", "duration_days": 14, "team_member_ids": team.member_ids
+        })
+        response.raise_for_status()
+        team.sprint_ids.append(response.json()["sprint"]["id"])
+
+
+def operations():
+    """Endpoint name -> coroutine function(client, team, rng) returning a response"""
+
+    async def create_task(client, team, rng):
+        return await client.post("/tasks", json=task_body(rng, team.next_id()), headers=team.headers)
+
+    async def create_member(client, team, rng):
+        response = await client.post("/team-members", json=member_body(rng, team.next_id()), headers=team.headers)
+        if response.status_code == 200:
+            team.member_ids.append(response.json()["id"])
+        return response
+
+    async def list_tasks(client, team, rng):
+        return await client.get("/tasks", headers=team.headers)
+
+    async def list_members(client, team, rng):
+        return await client.get("/team-members", headers=team.headers)
+
+    async def plan_sprint(client, team, rng):
+        response = await client.post("/sprints/plan", headers=team.headers, json={
+            "name": f"Sprint {team.next_id()}",
+            "duration_days": 14,
+            "team_member_ids": rng.sample(team.member_ids, min(len(team.member_ids), 10))
+        })
+        if response.status_code == 200:
+            team.sprint_ids.append(response.json()["sprint"]["id"])
+        return response
+
+    async def get_sprint(client, team, rng):
+        return await client.get(f"/sprints/{rng.choice(team.sprint_ids)}", headers=team.headers)
+
+    return {fn.__name__: fn for fn in [create_task, create_member, list_tasks, list_members, plan_sprint, get_sprint]}
+
+
+def parse_mix(mix: str):
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        weights[name.strip()] = float(weight or 1)
+    unknown = set(weights) - set(operations())
+    if unknown:
+        raise SystemExit(f"Unknown operations in --mix: {', '.join(sorted(unknown))}")
+    return weights
+
+
+async def run_load(client, teams, weights, concurrency: int, duration: float, seed_value: int):
+    ops = operations()
+    names = list(weights)
+    samples = defaultdict(list)  # endpoint -> [(latency seconds, ok)]
+    deadline = time.perf_counter() + duration
+
+    async def worker(index: int):
+        rng = random.Random(seed_value * 1000 + index)
+        while time.perf_counter() < deadline:
+            name = rng.choices(names, weights=[weights[n] for n in names])[0]
+            team = rng.choice(teams)
+            start = time.perf_counter()
+            try:
+                response = await ops[name](client, team, rng)
+                ok = response.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            samples[name].append((time.perf_counter() - start, ok))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    return samples, time.perf_counter() - start
+
+
+def summarize(latencies, errors: int, elapsed: float) -> dict:
+    milliseconds = np.asarray(latencies) * 1000
+    count = len(latencies)
+    return {
+        "requests": count,
+        "errors": errors,
+        "error_rate": errors / count if count else 0.0,
+        "throughput_rps": count / elapsed if elapsed else 0.0,
+        "p50_ms": float(np.percentile(milliseconds, 50)) if count else 0.0,
+        "p95_ms": float(np.percentile(milliseconds, 95)) if count else 0.0,
+        "p99_ms": float(np.percentile(milliseconds, 99)) if count else 0.0,
+        "max_ms": float(milliseconds.max()) if count else 0.0
+    }
+
+
+def report(samples, elapsed: float) -> dict:
+    endpoints = {}
+    all_latencies, all_errors = [], 0
+    for name in sorted(samples):
+        latencies = [latency for latency, _ in samples[name]]
+        errors = sum(1 for _, ok in samples[name] if not ok)
+        endpoints[name] = summarize(latencies, errors, elapsed)
+        all_latencies.extend(latencies)
+        all_errors += errors
+    return {"total": summarize(all_latencies, all_errors, elapsed), "endpoints": endpoints}
+
+
+def print_report(results: dict, baseline: dict = None):
+    header = f"{'endpoint':<14}{'requests':>9}{'rps':>9}{'errors':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+    if baseline:
+        header += f"{'p95 vs base':>13}{'rps vs base':>13}"
+    print(header)
+    rows = list(results["endpoints"].items()) + [("TOTAL", results["total"])]
+    for name, stats in rows:
+        line = (f"{name:<14}{stats['requests']:>9}{stats['throughput_rps']:>9.1f}{stats['error_rate']:>8.1%}"
+                f"{stats['p50_ms']:>9.1f}{stats['p95_ms']:>9.1f}{stats['p99_ms']:>9.1f}")
+        if baseline:
+            base = baseline["total"] if name == "TOTAL" else baseline["endpoints"].get(name)
+            if base and base["p95_ms"] and base["throughput_rps"]:
+                line += (f"{stats['p95_ms'] / base['p95_ms'] - 1:>+13.1%}"
+                         f"{stats['throughput_rps'] / base['throughput_rps'] - 1:>+13.1%}")
+        print(line)
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def main_async(args) -> dict:
+    weights = parse_mix(args.mix)
+    rng = random.Random(args.seed)
+    teams = [Team(f"loadtest-{i}") for i in range(args.teams)]
+
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=args.timeout)
+    else:
+        from src.main import app
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://loadtest", timeout=args.timeout)
+
+    async with client:
+        await seed(client, teams, args.members, args.tasks, rng)
+        samples, elapsed = await run_load(client, teams, weights, args.concurrency, args.duration, args.seed)
+    return {**report(samples, elapsed), "elapsed_seconds": elapsed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Base URL of a running server (default: in-process app)")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds of load after seeding")
+    parser.add_argument("--teams", type=int, default=4, help="Synthetic tenants")
+    parser.add_argument("--members", type=int, default=10, help="Members seeded per team")
+    parser.add_argument("--tasks", type=int, default=200, help="Backlog tasks seeded per team")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Weighted operations, name=weight,...")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=str(Path(__file__).parent / "results"), help="Directory for result JSON")
+    parser.add_argument("--compare", help="Earlier result JSON to compare against")
+    args = parser.parse_args()
+
+    results = asyncio.run(main_async(args))
+    run = {
+        "commit": git_commit(),
+        "started_at": datetime.utcnow().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "target": args.url or "in-process",
+        "config": {k: v for k, v in vars(args).items() if k not in ("output", "compare")},
+        **results
+    }
+
+    baseline = json.loads(Path(args.compare).read_text()) if args.compare else None
+    print_report(run, baseline)
+
+    output = Path(args.output)
+    output.mkdir(parents=True, exist_ok=True)
+    path = output / f"load-{run['commit']}-{datetime.utcnow():%Y%m%dT%H%M%S}.json"
+    path.write_text(json.dumps(run, indent=2))
+    print(f"Saved {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""
+Replay recorded /sprints/plan runs against the current planner
+
+Reads records written with PLAN_RECORDING_ENABLED, plans each one again
+with the current SprintOptimizer in a pool of worker processes, and
+compares latency and plan quality (total score, workload spread,
+feasibility, risk level, assigned tasks) with the recorded results.
+Recorded latencies were measured under production load on other
+hardware, so for latency compare two replays on the same machine: save
+a replay of the old commit and pass it with --compare.
+
+Usage:
+    python benchmarks/replay_plans.py RECORDINGS [RECORDINGS ...] [--workers 8]
+        [--limit 1000] [--weights scoring_weights.json] [--repeat 1]
+        [--output benchmarks/results] [--compare previous-replay.json]
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from src.feature_engine.scoring_weights import WeightRegistry
+from src.sprint_planner.plan_recording import compare_results, load_records, replay_record
+from src.sprint_planner.sprint_optimizer import SprintOptimizer
+
+_optimizer = None
+_index_settings = None
+
+
+def init_worker(weights_path, index_settings):
+    global _optimizer, _index_settings
+    _optimizer = SprintOptimizer(weight_registry=WeightRegistry(weights_path))
+    _index_settings = index_settings
+
+
+def replay(job):
+    record, repeat = job
+    try:
+        runs = [replay_record(record, _optimizer, _index_settings) for _ in range(repeat)]
+    except Exception as e:  # A record the current planner rejects is a finding, not a crash
+        return record["id"], None, f"{type(e).__name__}: {e}"
+    result = runs[0]
+    result["latency_ms"] = min(run["latency_ms"] for run in runs)  # Least disturbed by other workers
+    return record["id"], result, None
+
+
+def index_settings():
+    """CandidateIndex arguments matching the API's, or None when the index is disabled"""
+    from config.settings import get_settings
+
+    settings = get_settings()
+    if not settings.candidate_index_enabled:
+        return None
+    return {
+        "top_k": settings.candidate_top_k,
+        "n_lists": settings.candidate_index_lists,
+        "n_probe": settings.candidate_index_probes,
+        "min_members": settings.candidate_index_min_members
+    }
+
+
+def summarize(comparisons, baselines, results) -> dict:
+    count = len(comparisons)
+    if not count:
+        return {"plans": 0}
+    base_latency = np.array([b["latency_ms"] for b in baselines])
+    new_latency = np.array([r["latency_ms"] for r in results])
+    score_deltas = np.array([c["total_score_delta"] for c in comparisons])
+    return {
+        "plans": count,
+        "baseline_p50_ms": float(np.percentile(base_latency, 50)),
+        "baseline_p95_ms": float(np.percentile(base_latency, 95)),
+        "p50_ms": float(np.percentile(new_latency, 50)),
+        "p95_ms": float(np.percentile(new_latency, 95)),
+        "mean_total_score_delta": float(score_deltas.mean()),
+        "score_regressions": int((score_deltas < -1e-6).sum()),
+        "score_improvements": int((score_deltas > 1e-6).sum()),
+        "mean_workload_std_delta": float(np.mean([c["workload_std_delta"] for c in comparisons])),
+        "assigned_tasks_delta": int(sum(c["assigned_tasks_delta"] for c in comparisons)),
+        "feasibility_changed": int(sum(c["feasibility_changed"] for c in comparisons)),
+        "risk_changed": int(sum(c["risk_changed"] for c in comparisons)),
+        "mean_assignment_agreement": float(np.mean([c["assignment_agreement"] for c in comparisons]))
+    }
+
+
+def print_report(summary: dict, worst):
+    if not summary["plans"]:
+        print("No plans replayed")
+        return
+    print(f"{'':<22}{'baseline':>12}{'replay':>12}{'change':>10}")
+    for label, key in (("p50 latency (ms)", "p50_ms"), ("p95 latency (ms)", "p95_ms")):
+        base, new = summary[f"baseline_{key}"], summary[key]
+        change = f"{new / base - 1:+.1%}" if base else "-"
+        print(f"{label:<22}{base:>12.2f}{new:>12.2f}{change:>10}")
+    print(f"total score: mean delta {summary['mean_total_score_delta']:+.4f}, "
+          f"{summary['score_regressions']} worse, {summary['score_improvements']} better")
+    print(f"workload std: mean delta {summary['mean_workload_std_delta']:+.4f}")
+    print(f"assigned tasks: {summary['assigned_tasks_delta']:+d} overall")
+    print(f"feasibility changed in {summary['feasibility_changed']} plans, risk level in {summary['risk_changed']}")
+    print(f"assignment agreement: {summary['mean_assignment_agreement']:.1%}")
+    if worst:
+        print("largest score regressions:")
+        for record_id, comparison in worst:
+            print(f"  {record_id}  {comparison['total_score_delta']:+.4f}")
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("recordings", nargs="+", help="Record files or PLAN_RECORDING_DIR directories")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes (default: all cores)")
+    parser.add_argument("--limit", type=int, help="Replay at most this many records")
+    parser.add_argument("--weights", help="Scoring weights JSON (default: built-in weights)")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per record; the fastest is reported")
+    parser.add_argument("--output", default=str(Path(__file__).parent / "results"), help="Directory for result JSON")
+    parser.add_argument("--compare", help="Earlier replay JSON used as the baseline instead of the recordings")
+    args = parser.parse_args()
+
+    records = list(islice(load_records(args.recordings), args.limit))
+    baseline = {r["id"]: r["result"] for r in records if "result" in r}
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())["results"]
+    jobs = [(r, args.repeat) for r in records if r["id"] in baseline]
+
+    start = time.perf_counter()
+    chunksize = max(1, len(jobs) // (args.workers * 8))
+    with ProcessPoolExecutor(args.workers, initializer=init_worker, initargs=(args.weights, index_settings())) as pool:
+        replayed = list(pool.map(replay, jobs, chunksize=chunksize))
+    elapsed = time.perf_counter() - start
+
+    results = {record_id: result for record_id, result, _ in replayed if result is not None}
+    errors = {record_id: error for record_id, _, error in replayed if error is not None}
+    comparisons = {record_id: compare_results(baseline[record_id], result) for record_id, result in results.items()}
+    summary = summarize(
+        list(comparisons.values()),
+        [baseline[i] for i in comparisons],
+        [results[i] for i in comparisons]
+    )
+    worst = sorted(comparisons.items(), key=lambda item: item[1]["total_score_delta"])[:5]
+    worst = [(record_id, c) for record_id, c in worst if c["total_score_delta"] < -1e-6]
+
+    print(f"Replayed {len(results)} of {len(records)} plans in {elapsed:.1f}s on {args.workers} workers")
+    print_report(summary, worst)
+    for record_id, error in list(errors.items())[:5]:
+        print(f"  failed {record_id}: {error}")
+
+    run = {
+        "commit": git_commit(),
+        "started_at": datetime.utcnow().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "baseline": args.compare or "recorded",
+        "config": {k: v for k, v in vars(args).items() if k not in ("output", "compare")},
+        "elapsed_seconds": elapsed,
+        "summary": summary,
+        "errors": errors,
+        "results": results
+    }
+    output = Path(args.output)
+    output.mkdir(parents=True, exist_ok=True)
+    path = output / f"replay-{run['commit']}-{datetime.utcnow():%Y%m%dT%H%M%S}.json"
+    path.write_text(json.dumps(run, indent=2))
+    print(f"Saved {path}")
+
+
+if __name__ == "__main__":
+    main()
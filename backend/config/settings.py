@@ -1,33 +1,129 @@
 from pydantic_settings import BaseSettings
 from typing import Optional
+from functools import lru_cache
 
 class Settings(BaseSettings):
-    # API Keys
-    openai_api_key: str
-    gemini_api_key: str
-    
+    # API Keys (only required by the features that use them, see require())
+    openai_api_key: Optional[str] = None
+    gemini_api_key: Optional[str] = None
+
     # Model Configuration
     openai_model: str = "gpt-4"
     gemini_model: str = "gemini-pro"
-    
+
     # LLM Selection
     primary_llm: str = "openai"
     secondary_llm: str = "gemini"
-    
+    openai_base_url: Optional[str] = None  # OpenAI-compatible endpoint (e.g. local stub)
+
+    # Assignment rationales (generated after the plan response is sent)
+    rationale_enabled: bool = False
+    rationale_batch_size: int = 20
+    rationale_max_concurrency: int = 4  # Concurrent requests per provider
+    rationale_timeout_seconds: float = 20.0
+
     # Application
     debug: bool = True
     log_level: str = "INFO"
     app_name: str = "Agile AI Sprint Planner"
-    
+
     # Server
     host: str = "0.0.0.0"
     port: int = 8000
-    
+
     # Database
     database_url: str = "sqlite:///./sprint_planner.db"
-    
+
+    # Plan result cache (identical /sprints/plan requests share one result)
+    plan_cache_ttl_seconds: float = 30.0  # 0 disables caching; coalescing still applies
+    plan_cache_size: int = 256
+
+    # Tenants (selected by the X-Tenant-ID header)
+    default_tenant_id: str = "default"  # Used when the header is absent
+    tenant_worker_count: int = 1  # >1 pins each tenant to one worker process
+    tenant_worker_index: int = 0  # This process's worker (0..tenant_worker_count-1)
+    max_tenants: int = 1000  # Tenants loaded per worker; 503 for new ones when none can be evicted
+    tenant_idle_seconds: float = 300.0  # Unused this long, a persistent tenant may be closed to make room
+
+    # Persistence (event log + snapshots); state is in-memory only when unset
+    state_dir: Optional[str] = None  # One subdirectory per tenant
+    state_snapshot_interval: int = 10_000  # Events between snapshots (bounds recovery time)
+    state_group_commit_ms: float = 2.0  # How long the log writer gathers appends per sync
+    state_fsync: bool = True
+
+    # Live event stream (GET /events)
+    event_queue_size: int = 256  # Frames buffered per subscriber before it must resync
+    event_replay_size: int = 1000  # Recent events kept for Last-Event-ID resumption
+    event_heartbeat_seconds: float = 15.0
+
+    # Analytics
+    analytics_velocity_window: int = 5  # Closed sprints averaged into a member's sprint_velocity
+
+    # Request profiling (off: no middleware is installed)
+    profiling_enabled: bool = False
+    profiling_admin_token: Optional[str] = None  # X-Profile trigger and /admin/profiles access
+    profiling_sample_rate: float = 0.0  # Fraction of requests profiled without the header
+    profiling_dir: str = "./profiles"
+    profiling_max_profiles: int = 50  # Oldest profiles are deleted beyond this
+
+    # Skill taxonomy (aliases, parents and related skills for partial matches)
+    skill_taxonomy_path: Optional[str] = None  # JSON {"skills": {...}}; exact matching when unset
+    skill_taxonomy_cache_dir: Optional[str] = None  # Precomputed similarity closures
+
+    # Candidate retrieval for very large teams (approximate top-k by skill match)
+    candidate_index_enabled: bool = True
+    candidate_top_k: int = 50  # Members scored exactly per task
+    candidate_index_lists: Optional[int] = None  # Clusters; default about sqrt(members)
+    candidate_index_probes: int = 8  # Clusters scanned per task: higher = better recall, slower
+    candidate_index_min_members: int = 2000  # Smaller teams are always scored exactly
+
+    # Assignment ledger (per tenant; evicted history is archived under STATE_DIR)
+    assignment_retention_entries: int = 10000
+    assignment_retention_days: Optional[int] = None  # No age limit when unset
+
+    # Admission control for /sprints/plan (keeps reads responsive under planning load)
+    planning_cost_budget: float = 1_000_000  # Sum of backlog tasks x members over plans running at once
+    planning_max_concurrency: int = 4  # Plans running at once, in threads apart from the request pool
+    planning_queue_size: int = 64  # Plans waiting for admission; 503 beyond this
+    planning_queue_timeout_seconds: float = 10.0  # Longest wait for admission before a 503
+    planning_max_queued_per_team: int = 4  # Waiting plans per tenant; 429 beyond this
+
+    # Plan recording (anonymized /sprints/plan runs for benchmarks/replay_plans.py)
+    plan_recording_enabled: bool = False
+    plan_recording_dir: str = "./plan_recordings"
+    plan_recording_sample_rate: float = 1.0  # Fraction of planning runs recorded
+    plan_recording_max_files: int = 168  # Hourly record files kept (one week)
+
+    # Learning
+    scoring_weights_path: Optional[str] = None  # Versioned scoring weights (JSON)
+
     class Config:
         env_file = ".env"
         case_sensitive = False
+        extra = "ignore"
+
+    def require(self, *fields: str, feature: str):
+        """
+        Validate that settings needed by an optional feature are configured
+
+        Raises:
+            RuntimeError: naming the feature and the missing settings
+        """
+        missing = [field for field in fields if not getattr(self, field)]
+        if missing:
+            names = ", ".join(field.upper() for field in missing)
+            raise RuntimeError(f"{feature} requires the following settings: {names}")
+
+
+@lru_cache(maxsize=None)
+def get_settings() -> Settings:
+    """Load settings on first use"""
+    return Settings()
+
 
-settings = Settings()
\ No newline at end of file
+def __getattr__(name: str):
+    # Keep `from config.settings import settings` working without
+    # reading the environment at import time
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
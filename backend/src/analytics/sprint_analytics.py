@@ -0,0 +1,305 @@
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime, timedelta
+import threading
+import numpy as np
+from pydantic import BaseModel
+from src.data_model.task import Task, TaskStatus
+from src.data_model.sprint import Sprint
+from src.learning.streaming_stats import KeyedRunningStats
+
+SECONDS_PER_DAY = 86400.0
+
+
+class StatusTransition(BaseModel):
+    """One point of the task status time series"""
+    at: datetime
+    task_id: str
+    sprint_id: Optional[str] = None
+    member_id: Optional[str] = None
+    hours: float = 0.0
+    from_status: Optional[TaskStatus] = None  # None: the task entered the sprint's scope
+    to_status: TaskStatus
+
+
+class VelocityPoint(BaseModel):
+    """Delivery of one closed sprint, for the team or a single member"""
+    sprint_id: str
+    closed_at: datetime
+    planned_tasks: int
+    completed_tasks: int
+    completed_hours: float
+    carried_over: int
+
+
+class SprintClosure(BaseModel):
+    """Outcome of closing a sprint"""
+    sprint_id: str
+    closed_at: datetime
+    completed_tasks: int
+    completed_hours: float
+    carried_over_task_ids: List[str]
+    carry_over_rate: float
+    member_velocity: Dict[str, float]  # Updated tasks-per-sprint velocity
+
+
+class BurndownChart(BaseModel):
+    """Remaining estimated hours at the end of each sprint day"""
+    sprint_id: str
+    dates: List[datetime]
+    remaining_hours: List[float]
+    ideal_hours: List[float]
+    scope_hours: float
+    completed_hours: float
+    closed: bool
+
+
+class VelocityChart(BaseModel):
+    """Velocity over the most recent closed sprints"""
+    member_id: Optional[str] = None
+    sprints: List[VelocityPoint]
+    average_tasks: float
+    average_hours: float
+    carry_over_rate: float
+
+
+class _SprintRollup:
+    """Per-day hour deltas of one sprint; a burndown is their running sum"""
+
+    def __init__(self, sprint_id: str, start: datetime, days: int, team: List[str]):
+        self.sprint_id = sprint_id
+        self.start = start
+        self.days = days
+        self.team = team
+        self.scope_by_day = np.zeros(days + 1)
+        self.done_by_day = np.zeros(days + 1)
+        self.scope: Dict[str, Tuple[Optional[str], float]] = {}  # task id -> (member, hours)
+        self.completed: Dict[str, Optional[str]] = {}  # task id -> member
+        self.closed_at: Optional[datetime] = None
+
+    def day(self, at: datetime) -> int:
+        offset = (at - self.start).total_seconds() // SECONDS_PER_DAY
+        return int(min(max(offset, 0), self.days))
+
+
+class SprintAnalytics:
+    """
+    Burndown and velocity analytics maintained incrementally
+
+    Every task status change is folded into per-sprint rollups (scope
+    and completed hours per day) as it arrives and is not kept, so
+    memory grows with sprints, not with status changes. Closing a sprint appends one velocity point for the team
+    and each member. Charts are read from the rollups, so a query costs
+    O(sprint days) or O(sprints requested) however much history exists.
+
+    Args:
+        velocity_window: Closed sprints averaged into TeamMember.sprint_velocity
+    """
+
+    def __init__(self, velocity_window: int = 5):
+        self.velocity_window = velocity_window
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._sprints: Dict[str, _SprintRollup] = {}
+        self._team_velocity: List[VelocityPoint] = []
+        self._member_velocity: Dict[str, List[VelocityPoint]] = {}
+        self._member_stats = KeyedRunningStats(window_size=self.velocity_window)
+
+    def open_sprint(self, sprint: Sprint, sprint_tasks: List[Task], at: Optional[datetime] = None):
+        """Start tracking a planned sprint and record its initial scope"""
+        at = at or sprint.start_date
+        with self._lock:
+            if sprint.id in self._sprints:
+                return
+            self._sprints[sprint.id] = _SprintRollup(
+                sprint.id, sprint.start_date, sprint.duration_days, list(sprint.team_members)
+            )
+            for task in sprint_tasks:
+                self._record(StatusTransition(
+                    at=at,
+                    task_id=task.id,
+                    sprint_id=sprint.id,
+                    member_id=task.assigned_to,
+                    hours=task.estimated_hours,
+                    to_status=task.status
+                ))
+
+    def record_transition(self, task: Task, previous: TaskStatus, at: Optional[datetime] = None):
+        """Record a status change of a task (already updated to its new status)"""
+        with self._lock:
+            self._record(StatusTransition(
+                at=at or datetime.utcnow(),
+                task_id=task.id,
+                sprint_id=task.sprint_id,
+                member_id=task.assigned_to,
+                hours=task.estimated_hours,
+                from_status=previous,
+                to_status=task.status
+            ))
+
+    def _record(self, transition: StatusTransition):
+        rollup = self._sprints.get(transition.sprint_id)
+        if rollup is None or rollup.closed_at is not None:
+            return
+
+        day = rollup.day(transition.at)
+        task_id = transition.task_id
+        if transition.from_status is None and task_id not in rollup.scope:
+            rollup.scope[task_id] = (transition.member_id, transition.hours)
+            rollup.scope_by_day[day] += transition.hours
+        if task_id not in rollup.scope:
+            return
+
+        member_id, hours = rollup.scope[task_id]
+        if transition.member_id is not None:
+            member_id = transition.member_id
+            rollup.scope[task_id] = (member_id, hours)
+        if transition.to_status == TaskStatus.COMPLETED and task_id not in rollup.completed:
+            rollup.completed[task_id] = member_id
+            rollup.done_by_day[day] += hours
+        elif transition.to_status != TaskStatus.COMPLETED and task_id in rollup.completed:
+            del rollup.completed[task_id]
+            rollup.done_by_day[day] -= hours
+
+    def close_sprint(self, sprint_id: str, at: Optional[datetime] = None) -> SprintClosure:
+        """
+        Freeze a sprint's rollup and append its velocity points
+
+        Raises:
+            KeyError: if the sprint is not tracked
+            ValueError: if it is already closed
+        """
+        at = at or datetime.utcnow()
+        with self._lock:
+            rollup = self._sprints[sprint_id]
+            if rollup.closed_at is not None:
+                raise ValueError(f"Sprint {sprint_id} is already closed")
+            rollup.closed_at = at
+
+            carried_over = [task_id for task_id in rollup.scope if task_id not in rollup.completed]
+            completed_hours = sum(rollup.scope[task_id][1] for task_id in rollup.completed)
+            self._team_velocity.append(VelocityPoint(
+                sprint_id=sprint_id,
+                closed_at=at,
+                planned_tasks=len(rollup.scope),
+                completed_tasks=len(rollup.completed),
+                completed_hours=completed_hours,
+                carried_over=len(carried_over)
+            ))
+
+            member_velocity = {}
+            for member_id in rollup.team:
+                planned = [task_id for task_id, (owner, _) in rollup.scope.items() if owner == member_id]
+                done = [task_id for task_id in planned if task_id in rollup.completed]
+                self._member_velocity.setdefault(member_id, []).append(VelocityPoint(
+                    sprint_id=sprint_id,
+                    closed_at=at,
+                    planned_tasks=len(planned),
+                    completed_tasks=len(done),
+                    completed_hours=sum(rollup.scope[task_id][1] for task_id in done),
+                    carried_over=len(planned) - len(done)
+                ))
+                self._member_stats.update(member_id, len(done))
+                member_velocity[member_id] = self._member_stats.get(member_id).window_mean
+
+            return SprintClosure(
+                sprint_id=sprint_id,
+                closed_at=at,
+                completed_tasks=len(rollup.completed),
+                completed_hours=completed_hours,
+                carried_over_task_ids=carried_over,
+                carry_over_rate=len(carried_over) / len(rollup.scope) if rollup.scope else 0.0,
+                member_velocity=member_velocity
+            )
+
+    def burndown(self, sprint_id: str, as_of: Optional[datetime] = None) -> BurndownChart:
+        """
+        Burndown of a sprint up to as_of (or its close)
+
+        Raises:
+            KeyError: if the sprint is not tracked
+        """
+        with self._lock:
+            rollup = self._sprints[sprint_id]
+            remaining = np.cumsum(rollup.scope_by_day - rollup.done_by_day)
+            scope_hours = float(rollup.scope_by_day.sum())
+            completed_hours = float(rollup.done_by_day.sum())
+            closed_at = rollup.closed_at
+
+        last_day = rollup.day(closed_at or as_of or datetime.utcnow())
+        return BurndownChart(
+            sprint_id=sprint_id,
+            dates=[rollup.start + timedelta(days=day) for day in range(last_day + 1)],
+            remaining_hours=remaining[:last_day + 1].round(2).tolist(),
+            ideal_hours=np.linspace(scope_hours, 0.0, rollup.days + 1).round(2).tolist(),
+            scope_hours=scope_hours,
+            completed_hours=completed_hours,
+            closed=closed_at is not None
+        )
+
+    def velocity(self, member_id: Optional[str] = None, last_n: int = 10) -> VelocityChart:
+        """Velocity of the team (or one member) over its last_n closed sprints"""
+        with self._lock:
+            history = self._team_velocity if member_id is None else self._member_velocity.get(member_id, [])
+            points = history[-last_n:] if last_n > 0 else []
+
+        planned = sum(point.planned_tasks for point in points)
+        count = len(points) or 1
+        return VelocityChart(
+            member_id=member_id,
+            sprints=points,
+            average_tasks=sum(point.completed_tasks for point in points) / count,
+            average_hours=sum(point.completed_hours for point in points) / count,
+            carry_over_rate=sum(point.carried_over for point in points) / planned if planned else 0.0
+        )
+
+    def export(self) -> Dict[str, Any]:
+        """
+        The rollups and velocity points (for snapshots)
+
+        The rollups hold everything charts need, so a snapshot's size
+        and restore time depend on the number of sprints, not on how many
+        status changes they saw.
+        """
+        with self._lock:
+            return {
+                "rollups": [
+                    {
+                        "sprint_id": r.sprint_id,
+                        "start": r.start,
+                        "days": r.days,
+                        "team": r.team,
+                        "scope_by_day": r.scope_by_day.tolist(),
+                        "done_by_day": r.done_by_day.tolist(),
+                        "scope": r.scope,
+                        "completed": r.completed,
+                        "closed_at": r.closed_at
+                    }
+                    for r in self._sprints.values()
+                ],
+                "team_velocity": list(self._team_velocity),
+                "member_velocity": {member_id: list(points) for member_id, points in self._member_velocity.items()}
+            }
+
+    def restore(self, data: Dict[str, Any]):
+        """Load an export()"""
+        self._reset()
+        for entry in data["rollups"]:
+            rollup = _SprintRollup(entry["sprint_id"], _as_datetime(entry["start"]), entry["days"], entry["team"])
+            rollup.scope_by_day = np.array(entry["scope_by_day"], dtype=float)
+            rollup.done_by_day = np.array(entry["done_by_day"], dtype=float)
+            rollup.scope = {task_id: (member_id, hours) for task_id, (member_id, hours) in entry["scope"].items()}
+            rollup.completed = dict(entry["completed"])
+            rollup.closed_at = _as_datetime(entry["closed_at"]) if entry["closed_at"] is not None else None
+            self._sprints[rollup.sprint_id] = rollup
+
+        self._team_velocity = [VelocityPoint.model_validate(point) for point in data["team_velocity"]]
+        for member_id, points in data["member_velocity"].items():
+            history = self._member_velocity[member_id] = [VelocityPoint.model_validate(point) for point in points]
+            for point in history[-self.velocity_window:]:  # Only the window feeds sprint_velocity
+                self._member_stats.update(member_id, point.completed_tasks)
+
+
+def _as_datetime(value) -> datetime:
+    return datetime.fromisoformat(value) if isinstance(value, str) else value
@@ -0,0 +1,189 @@
+from typing import Any, Callable, Deque, Dict, Set
+from collections import Counter, deque
+import asyncio
+import math
+import threading
+import weakref
+import anyio
+
+
+def plan_cost(backlog_size: int, team_size: int) -> float:
+    """Estimated cost of planning a backlog for a team (tasks x members scored)"""
+    return float(max(backlog_size, 1) * max(team_size, 1))
+
+
+class Overloaded(Exception):
+    """A request that admission control turned away"""
+
+    def __init__(self, status_code: int, detail: str, retry_after: int = 1):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+class _Waiter:
+    __slots__ = ("team", "cost", "loop", "future", "granted")
+
+    def __init__(self, team: str, cost: float, loop: asyncio.AbstractEventLoop):
+        self.team = team
+        self.cost = cost
+        self.loop = loop
+        self.future = loop.create_future()
+        self.granted = False
+
+
+def _resolve(future: asyncio.Future):
+    if not future.done():
+        future.set_result(None)
+
+
+class AdmissionController:
+    """
+    Cost-weighted admission for expensive requests (sprint planning)
+
+    Admitted requests share a budget of estimated cost (see plan_cost)
+    and at most max_concurrency run at once, each in a worker thread of
+    its own limiter so they never take the threads cheap sync endpoints
+    use. One request per team runs at a time; other teams proceed in
+    parallel. Requests that cannot start wait in a FIFO queue until
+    queue_timeout_seconds; a waiting team whose previous plan is still
+    running is passed over, but a request that does not fit the budget
+    holds back those behind it so large plans are not starved. A single
+    request costing more than the whole budget runs alone.
+
+    Turned away (Overloaded):
+        503 when the queue is full or the wait times out (server busy)
+        429 when the team already has max_queued_per_team requests waiting
+
+    Args:
+        budget: Total cost of requests running at once
+        max_concurrency: Requests running at once (worker threads)
+        queue_size: Requests allowed to wait
+        queue_timeout_seconds: Longest wait before a 503
+        max_queued_per_team: Waiting requests allowed per team
+    """
+
+    def __init__(
+        self,
+        budget: float = 1_000_000,
+        max_concurrency: int = 4,
+        queue_size: int = 64,
+        queue_timeout_seconds: float = 10.0,
+        max_queued_per_team: int = 4
+    ):
+        self.budget = budget
+        self.max_concurrency = max_concurrency
+        self.queue_size = queue_size
+        self.queue_timeout_seconds = queue_timeout_seconds
+        self.max_queued_per_team = max_queued_per_team
+        self._used = 0.0
+        self._running = 0
+        self._active_teams: Set[str] = set()
+        self._queue: Deque[_Waiter] = deque()
+        self._queued_by_team: "Counter[str]" = Counter()
+        self._lock = threading.Lock()  # Test clients may drive several event loops
+        self._limiters: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, anyio.CapacityLimiter]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {"running": self._running, "queued": len(self._queue), "cost_in_use": self._used}
+
+    async def run(self, team: str, cost: float, func: Callable[[], Any]) -> Any:
+        """
+        Run func in a planning thread once admitted
+
+        Raises:
+            Overloaded: if the request is turned away
+        """
+        cost = min(max(cost, 0.0), self.budget)
+        await self._acquire(team, cost)
+        try:
+            return await anyio.to_thread.run_sync(func, limiter=self._thread_limiter())
+        finally:
+            self._release(team, cost)
+
+    def _thread_limiter(self) -> anyio.CapacityLimiter:
+        loop = asyncio.get_running_loop()
+        limiter = self._limiters.get(loop)
+        if limiter is None:
+            limiter = self._limiters[loop] = anyio.CapacityLimiter(self.max_concurrency)
+        return limiter
+
+    def _fits(self, team: str, cost: float) -> bool:
+        return (
+            team not in self._active_teams
+            and self._running < self.max_concurrency
+            and (self._used + cost <= self.budget or self._running == 0)
+        )
+
+    def _start(self, team: str, cost: float):
+        self._active_teams.add(team)
+        self._running += 1
+        self._used += cost
+
+    async def _acquire(self, team: str, cost: float):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            # Waiters whose team is still planning do not hold back other
+            # teams; any other waiter is held by capacity, so queue behind it
+            if all(queued.team in self._active_teams for queued in self._queue) and self._fits(team, cost):
+                self._start(team, cost)
+                return
+            if len(self._queue) >= self.queue_size:
+                raise Overloaded(503, "Planning capacity exhausted, retry later")
+            if self._queued_by_team[team] >= self.max_queued_per_team:
+                raise Overloaded(
+                    429, "Too many planning requests queued for this team",
+                    retry_after=math.ceil(self.queue_timeout_seconds)
+                )
+            waiter = _Waiter(team, cost, loop)
+            self._queue.append(waiter)
+            self._queued_by_team[team] += 1
+
+        try:
+            await asyncio.wait_for(waiter.future, self.queue_timeout_seconds)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            with self._lock:
+                granted = waiter.granted
+                if not granted:
+                    self._queue.remove(waiter)
+                    self._forget(waiter)
+                    self._dispatch()  # The head of the queue may have been holding others back
+            if granted:
+                self._release(team, cost)
+            if isinstance(e, asyncio.TimeoutError):
+                raise Overloaded(503, "Timed out waiting for planning capacity") from None
+            raise
+
+    def _release(self, team: str, cost: float):
+        with self._lock:
+            self._active_teams.discard(team)
+            self._running -= 1
+            self._used = max(self._used - cost, 0.0)
+            self._dispatch()
+
+    def _forget(self, waiter: _Waiter):
+        self._queued_by_team[waiter.team] -= 1
+        if not self._queued_by_team[waiter.team]:
+            del self._queued_by_team[waiter.team]
+
+    def _dispatch(self):
+        """Start queued requests that can run now (called with the lock held)"""
+        blocked_teams: Set[str] = set()
+        for waiter in list(self._queue):
+            if waiter.team in self._active_teams or waiter.team in blocked_teams:
+                blocked_teams.add(waiter.team)  # Keep each team's requests in order
+                continue
+            if not self._fits(waiter.team, waiter.cost):
+                break
+            self._queue.remove(waiter)
+            self._forget(waiter)
+            try:
+                waiter.loop.call_soon_threadsafe(_resolve, waiter.future)
+            except RuntimeError:
+                continue  # Its event loop is gone, so nobody is waiting
+            self._start(waiter.team, waiter.cost)
+            waiter.granted = True
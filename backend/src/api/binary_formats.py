@@ -0,0 +1,141 @@
+from typing import Any, Dict, List, Optional, Type
+from datetime import datetime
+from enum import Enum
+from functools import lru_cache
+import importlib
+import json
+from fastapi import HTTPException, Response
+from pydantic import BaseModel
+
+JSON = "application/json"
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+ARROW_FILE = "application/vnd.apache.arrow.file"
+MSGPACK = "application/msgpack"
+
+_ALIASES = {"application/x-msgpack": MSGPACK, "application/vnd.apache.arrow": ARROW_STREAM}
+
+# Media type -> module that must be importable to produce it
+_REQUIRED_MODULE = {ARROW_STREAM: "pyarrow", ARROW_FILE: "pyarrow", MSGPACK: "msgpack"}
+
+
+@lru_cache(maxsize=None)
+def _optional_module(name: str):
+    """Import an optional dependency on first use; None when it is not installed"""
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+
+def is_available(media_type: str) -> bool:
+    module = _REQUIRED_MODULE.get(media_type)
+    return module is None or _optional_module(module) is not None
+
+
+def negotiate(accept: Optional[str]) -> str:
+    """
+    Pick the response media type for an Accept header
+
+    JSON is the default (no header, */* or only unknown types). A binary
+    type is used when preferred and its library is installed, otherwise
+    the next acceptable type is tried.
+
+    Raises:
+        HTTPException: 406 if only binary types are acceptable and none is available
+    """
+    if not accept:
+        return JSON
+    ranked = []
+    for position, part in enumerate(accept.split(",")):
+        media_type, *params = [piece.strip() for piece in part.split(";")]
+        quality = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    quality = float(param[2:])
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            ranked.append((-quality, position, _ALIASES.get(media_type.lower(), media_type.lower())))
+
+    missing = []
+    for _, _, media_type in sorted(ranked):
+        if media_type in _REQUIRED_MODULE:
+            if is_available(media_type):
+                return media_type
+            missing.append(_REQUIRED_MODULE[media_type])
+        elif media_type in (JSON, "application/*", "*/*"):
+            return JSON
+    if missing:
+        raise HTTPException(
+            status_code=406,
+            detail=f"Requested format needs {' or '.join(sorted(set(missing)))}, which is not installed"
+        )
+    return JSON
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, list):
+        return [_plain(item) for item in value]
+    return value
+
+
+def columns(items: List[BaseModel], model: Type[BaseModel]) -> Dict[str, List[Any]]:
+    """
+    Column-major view of a homogeneous list of models
+
+    One list per field (ids, hours, statuses, ...), the same layout the
+    planner's matrices use, so consumers get typed columns instead of
+    repeated keys.
+    """
+    return {name: [_plain(getattr(item, name)) for item in items] for name in model.model_fields}
+
+
+def _msgpack_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def encode_msgpack(payload: Any) -> bytes:
+    return _optional_module("msgpack").packb(payload, default=_msgpack_default)
+
+
+def encode_arrow(table_columns: Dict[str, List[Any]], metadata: Optional[Dict[str, Any]] = None, file: bool = False) -> bytes:
+    """Arrow IPC stream (or file) of one table; metadata is stored JSON-encoded in the schema"""
+    pa = _optional_module("pyarrow")
+    table = pa.table(table_columns)
+    if metadata:
+        table = table.replace_schema_metadata({key: json.dumps(value) for key, value in metadata.items()})
+    sink = pa.BufferOutputStream()
+    writer_class = pa.ipc.new_file if file else pa.ipc.new_stream
+    with writer_class(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def table_response(
+    items: List[BaseModel],
+    model: Type[BaseModel],
+    media_type: str,
+    metadata: Optional[Dict[str, Any]] = None,
+    headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """
+    Binary response for a list of models (negotiated media type, not JSON)
+
+    Arrow carries metadata in the schema; MessagePack returns
+    {**metadata, "columns": {...}}.
+    """
+    table_columns = columns(items, model)
+    if media_type == MSGPACK:
+        body = encode_msgpack({**(metadata or {}), "columns": table_columns})
+    else:
+        body = encode_arrow(table_columns, metadata, file=media_type == ARROW_FILE)
+    return Response(body, media_type=media_type, headers=headers)
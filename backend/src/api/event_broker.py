@@ -0,0 +1,143 @@
+from typing import Any, Dict, List, Optional, Set
+from collections import deque
+import asyncio
+import itertools
+import threading
+from pydantic_core import to_json
+
+# Sent to a subscriber whose queue overflowed or whose Last-Event-ID
+# cannot be replayed (too old, or from before a restart): the client
+# should refetch the state it displays
+RESYNC_EVENT = "resync"
+
+
+def format_event(event_id: int, event_type: str, data: Any) -> bytes:
+    """One server-sent event frame"""
+    return b"id: %d\nevent: %s\ndata: %s\n\n" % (event_id, event_type.encode(), to_json(data))
+
+
+class Subscription:
+    """One client's bounded queue of encoded event frames"""
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        max_queued: int,
+        sprint_id: Optional[str] = None,
+        event_types: Optional[Set[str]] = None
+    ):
+        self.loop = loop
+        self.queue: "asyncio.Queue[bytes]" = asyncio.Queue(maxsize=max_queued)
+        self.sprint_id = sprint_id
+        self.event_types = event_types
+        self.dropped = 0
+
+    def wants(self, event_type: str, sprint_id: Optional[str]) -> bool:
+        if self.event_types is not None and event_type not in self.event_types:
+            return False
+        return self.sprint_id is None or sprint_id is None or sprint_id == self.sprint_id
+
+    def offer(self, event_id: int, frame: bytes):
+        """Enqueue a frame (on the subscriber's loop); overflow turns into a resync"""
+        if self.queue.full():
+            self.dropped += self.queue.qsize()
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(format_event(event_id, RESYNC_EVENT, {"reason": "slow consumer"}))
+            return
+        self.queue.put_nowait(frame)
+
+    async def next_frame(self, timeout: Optional[float] = None) -> Optional[bytes]:
+        """Next frame, or None if nothing arrived within timeout"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class EventBroker:
+    """
+    Fan-out of live planner events to server-sent-event subscribers
+
+    Each event is serialized once and the same frame is handed to every
+    matching subscriber. Publishing never blocks: it may be called from
+    worker threads (sync routes) and hands frames to each subscriber's
+    event loop. Every subscriber has its own bounded queue, so a slow
+    client only loses its own backlog (and is told to resync) without
+    holding up the publisher or other clients. A ring buffer of recent
+    frames lets reconnecting clients resume from Last-Event-ID.
+    """
+
+    def __init__(self, max_queued: int = 256, replay_size: int = 1000):
+        self.max_queued = max_queued
+        self._ids = itertools.count(1)
+        self._last_id = 0
+        self._recent: "deque[tuple]" = deque(maxlen=replay_size)
+        self._subscriptions: List[Subscription] = []
+        self._lock = threading.Lock()
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscriptions)
+
+    def publish(self, event_type: str, data: Dict[str, Any], sprint_id: Optional[str] = None) -> int:
+        """Send an event to every matching subscriber; returns its id"""
+        with self._lock:
+            event_id = self._last_id = next(self._ids)
+            frame = format_event(event_id, event_type, data)
+            self._recent.append((event_id, event_type, sprint_id, frame))
+            subscriptions = list(self._subscriptions)
+
+        for subscription in subscriptions:
+            if not subscription.wants(event_type, sprint_id):
+                continue
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.offer, event_id, frame)
+            except RuntimeError:
+                # The subscriber's loop is closed; it will be removed on unsubscribe
+                continue
+        return event_id
+
+    def subscribe(
+        self,
+        sprint_id: Optional[str] = None,
+        event_types: Optional[List[str]] = None,
+        last_event_id: Optional[int] = None
+    ) -> Subscription:
+        """
+        Register a subscriber on the running event loop
+
+        With last_event_id, buffered events after it are queued first; if
+        they are no longer buffered, or the id was never issued by this
+        broker (ids restart with the process or when a tenant is
+        reloaded), the subscriber starts with a resync.
+        """
+        subscription = Subscription(
+            asyncio.get_running_loop(),
+            self.max_queued,
+            sprint_id,
+            set(event_types) if event_types else None
+        )
+        with self._lock:
+            if last_event_id is not None and last_event_id > self._last_id:
+                subscription.offer(self._last_id, format_event(self._last_id, RESYNC_EVENT, {"reason": "event ids restarted"}))
+            elif last_event_id is not None:
+                oldest = self._recent[0][0] if self._recent else None
+                if oldest is not None and last_event_id < oldest - 1:
+                    subscription.offer(oldest - 1, format_event(oldest - 1, RESYNC_EVENT, {"reason": "history expired"}))
+                for event_id, event_type, event_sprint, frame in self._recent:
+                    if event_id > last_event_id and subscription.wants(event_type, event_sprint):
+                        subscription.offer(event_id, frame)
+            self._subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+
+    def recent(self, limit: Optional[int] = None) -> List[bytes]:
+        """Most recent frames, oldest first"""
+        with self._lock:
+            frames = [frame for _, _, _, frame in self._recent]
+        return frames[-limit:] if limit else frames
@@ -1,8 +1,11 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Optional
+from datetime import datetime
 from src.data_model.team_member import TeamMember, Skill
-from src.data_model.task import Task, Priority
+from src.data_model.task import Task, Priority, TaskStatus
 from src.data_model.sprint import Sprint
+from src.sprint_planner.scenario_evaluator import ScenarioSpec
+from src.decision_engine.constraints import Constraint
 
 # Request/Response models for API
 
@@ -25,6 +28,10 @@ class CreateSprintRequest(BaseModel):
     name: str
     duration_days: int
     team_member_ids: List[str]
+    weight_profile: Optional[str] = None  # Team-specific scoring weights
+    as_of: Optional[datetime] = None  # Reference time for urgency (default: now)
+    job_id: Optional[str] = None  # Echoed in plan_progress events
+    constraints: List[Constraint] = []  # Pins, exclusions, same-assignee groups, caps
 
 class AssignmentResponse(BaseModel):
     task_id: str
@@ -38,4 +45,26 @@ class SprintPlanResponse(BaseModel):
     is_feasible: bool
     risk_level: str
     planned_tasks: int
-    assignments: List[AssignmentResponse]
\ No newline at end of file
+    assignments: List[AssignmentResponse]
+
+class SprintPlanResult(BaseModel):
+    sprint: Sprint
+    tasks: List[Task]
+
+class EvaluateScenariosRequest(BaseModel):
+    team_member_ids: List[str]
+    scenarios: List[ScenarioSpec]
+    weight_profile: Optional[str] = None
+    as_of: Optional[datetime] = None
+    constraints: List[Constraint] = []  # Applied to the baseline and every scenario
+
+class PlanRoadmapRequest(BaseModel):
+    team_member_ids: List[str]
+    num_sprints: int = Field(default=6, ge=1, le=52)
+    sprint_length_days: int = Field(default=14, ge=1)
+    weight_profile: Optional[str] = None
+    as_of: Optional[datetime] = None
+
+class UpdateTaskStatusRequest(BaseModel):
+    status: TaskStatus
+    actual_hours: Optional[float] = None
@@ -0,0 +1,146 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from collections import OrderedDict
+from concurrent.futures import Future
+import hashlib
+import threading
+import time
+from pydantic import BaseModel, TypeAdapter
+from src.data_model.team_member import TeamMember
+from src.data_model.task import Task
+
+_members_adapter = TypeAdapter(List[TeamMember])
+_tasks_adapter = TypeAdapter(List[Task])
+
+
+def plan_key(request: BaseModel, team: List[TeamMember], backlog: List[Task], *extra: str) -> str:
+    """
+    Content hash of a planning request and the state it would plan against
+
+    extra covers anything else the plan depends on (e.g. the scoring
+    weights version).
+    """
+    digest = hashlib.sha256()
+    digest.update(request.model_dump_json().encode())
+    for value in extra:
+        digest.update(b"\0")
+        digest.update(value.encode())
+    digest.update(b"\0")
+    digest.update(_members_adapter.dump_json(team))
+    digest.update(b"\0")
+    digest.update(_tasks_adapter.dump_json(backlog))
+    return digest.hexdigest()
+
+
+def etag_for(body: bytes) -> str:
+    """Strong ETag of a response body"""
+    return '"' + hashlib.sha1(body).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header matches the current ETag"""
+    if not if_none_match:
+        return False
+    candidates = [value.strip() for value in if_none_match.split(",")]
+    # Weak comparison, as required for If-None-Match
+    return "*" in candidates or any(value.removeprefix("W/") == etag for value in candidates)
+
+
+class PlanCache:
+    """
+    TTL + LRU cache of serialized plan responses with single-flight
+
+    get_or_compute() runs the computation at most once per key at a
+    time: concurrent callers with the same key wait for the first one
+    and receive its result. Failed computations are not cached.
+    """
+
+    def __init__(self, ttl_seconds: float = 30.0, max_entries: int = 256):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._in_flight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            return self._get(key)
+
+    def _get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: str, value: Any):
+        with self._lock:
+            self._put(key, value)
+
+    def _put(self, key: str, value: Any):
+        if self.ttl_seconds <= 0 or self.max_entries <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def begin(self, key: str) -> Tuple[Optional[Any], Optional[Future], bool]:
+        """
+        Look up key, joining or starting its computation on a miss
+
+        For callers that compute elsewhere (e.g. after admission control).
+        The leader must call complete() with the outcome.
+
+        Returns:
+            (value, None, False) on a hit, else (None, future, leader):
+            followers wait on the future, the leader computes
+        """
+        with self._lock:
+            value = self._get(key)
+            if value is not None:
+                return value, None, False
+            future = self._in_flight.get(key)
+            if future is not None:
+                return None, future, False
+            future = self._in_flight[key] = Future()
+            return None, future, True
+
+    def complete(self, key: str, future: Future, value: Any = None, error: Optional[BaseException] = None):
+        """Finish a computation started by begin(); failures are passed to followers, not cached"""
+        with self._lock:
+            if error is None:
+                self._put(key, value)
+            del self._in_flight[key]
+        if error is None:
+            future.set_result(value)
+        else:
+            future.set_exception(error)
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Tuple[Any, str]:
+        """
+        Cached value for key, computing it if needed
+
+        Returns:
+            (value, source) where source is "hit", "coalesced" or "miss"
+        """
+        value, future, leader = self.begin(key)
+        if future is None:
+            return value, "hit"
+        if not leader:
+            return future.result(), "coalesced"
+
+        try:
+            value = compute()
+        except BaseException as e:
+            self.complete(key, future, error=e)
+            raise
+        self.complete(key, future, value)
+        return value, "miss"
@@ -0,0 +1,280 @@
+from typing import Callable, Dict, List, Optional, Tuple
+from collections import Counter, defaultdict
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+import asyncio
+import cProfile
+import functools
+import json
+import pstats
+import random
+import re
+import secrets
+import threading
+import time
+import uuid
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import FileResponse, PlainTextResponse
+from fastapi.routing import APIRoute
+from config.settings import get_settings
+from src.utils.logger import logger
+
+PROFILE_ID_PATTERN = re.compile(r"^[0-9]{8}T[0-9]{6}-[0-9a-f]{8}$")
+
+
+class RequestProfile:
+    """Profilers collecting for one request: the event loop's plus any worker threads'"""
+
+    def __init__(self):
+        self.id = f"{datetime.utcnow():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+        self.loop_profile = cProfile.Profile()
+        self.thread_profiles: List[cProfile.Profile] = []
+
+    def stats(self) -> pstats.Stats:
+        stats = pstats.Stats(self.loop_profile)
+        for profile in self.thread_profiles:
+            stats.add(profile)
+        return stats
+
+
+# Set only while a request is being profiled
+_current_profile: ContextVar[Optional[RequestProfile]] = ContextVar("current_profile", default=None)
+
+
+def _label(func: Tuple[str, int, str]) -> str:
+    filename, line, name = func
+    if filename == "~":  # Built-in functions
+        return name.replace(";", ",")
+    return f"{name} ({Path(filename).name}:{line})".replace(";", ",")
+
+
+def collapsed_stacks(stats: pstats.Stats, min_microseconds: int = 1) -> str:
+    """
+    Render a profile as collapsed stacks ("a;b;c <microseconds>" lines)
+
+    cProfile records caller/callee pairs rather than full stacks, so a
+    function's time is split across its call paths in proportion to the
+    cumulative time of each incoming edge. The output loads into
+    flamegraph.pl, speedscope and similar viewers.
+    """
+    entries = stats.stats
+    callees: Dict[Tuple, Dict[Tuple, Tuple]] = defaultdict(dict)
+    for func, (_, _, _, _, callers) in entries.items():
+        for caller, edge in callers.items():
+            callees[caller][func] = edge
+
+    samples: Counter = Counter()
+
+    def walk(func, path: List[Tuple], labels: List[str], fraction: float):
+        total_time = entries[func][2]
+        labels = labels + [_label(func)]
+        self_microseconds = int(total_time * fraction * 1e6)
+        if self_microseconds >= min_microseconds:
+            samples[";".join(labels)] += self_microseconds
+        if len(path) >= 200:
+            return
+        for callee, edge in callees.get(func, {}).items():
+            callee_cumulative = entries[callee][3]
+            if callee in path or not callee_cumulative:
+                continue
+            share = fraction * min(edge[3] / callee_cumulative, 1.0)
+            if callee_cumulative * share * 1e6 >= min_microseconds:
+                walk(callee, path + [callee], labels, share)
+
+    for func, entry in entries.items():
+        if not entry[4]:  # No callers inside the profile: a root
+            walk(func, [func], [], 1.0)
+    return "".join(f"{stack} {value}\n" for stack, value in samples.most_common())
+
+
+class ProfileStore:
+    """
+    Bounded directory of request profiles
+
+    Each profile is <id>.prof (pstats, for snakeviz and friends) plus
+    <id>.json metadata. Ids start with a UTC timestamp, so the oldest
+    profiles are evicted first once max_profiles is exceeded.
+    """
+
+    def __init__(self, directory: str, max_profiles: int = 50):
+        self.directory = Path(directory)
+        self.max_profiles = max_profiles
+        self._lock = threading.Lock()
+
+    def save(self, profile: RequestProfile, metadata: Dict):
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            profile.stats().dump_stats(str(self.directory / f"{profile.id}.prof"))
+            (self.directory / f"{profile.id}.json").write_text(json.dumps({"id": profile.id, **metadata}))
+            for path in sorted(self.directory.glob("*.json"))[:-self.max_profiles or None]:
+                path.unlink()
+                path.with_suffix(".prof").unlink(missing_ok=True)
+
+    def list(self) -> List[Dict]:
+        """Metadata of stored profiles, newest first"""
+        if not self.directory.is_dir():
+            return []
+        profiles = []
+        for path in sorted(self.directory.glob("*.json"), reverse=True):
+            try:
+                profiles.append(json.loads(path.read_text()))
+            except (OSError, ValueError):
+                continue
+        return profiles
+
+    def path(self, profile_id: str) -> Optional[Path]:
+        if not PROFILE_ID_PATTERN.match(profile_id):
+            return None
+        path = self.directory / f"{profile_id}.prof"
+        return path if path.is_file() else None
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware profiling selected requests with cProfile
+
+    A request is profiled when its X-Profile header carries the admin
+    token, or at random with sample_rate. One request is profiled at a
+    time (cProfile is per thread and the event loop is shared); others
+    run unprofiled meanwhile. The event loop thread is profiled for the
+    whole request (body validation, serialization) and ProfiledRoute
+    adds the worker thread running a sync endpoint. Other coroutines
+    that run on the loop while the request waits also appear.
+
+    The middleware is only installed when profiling is enabled.
+    """
+
+    def __init__(
+        self,
+        app,
+        store: ProfileStore,
+        admin_token: Optional[str] = None,
+        sample_rate: float = 0.0,
+        exclude_prefixes: Tuple[str, ...] = ("/events", "/admin/")
+    ):
+        self.app = app
+        self.store = store
+        self.admin_token = admin_token
+        self.sample_rate = sample_rate
+        self.exclude_prefixes = exclude_prefixes
+        self._busy = threading.Lock()
+
+    def _trigger(self, scope) -> Optional[str]:
+        if scope["path"].startswith(self.exclude_prefixes):
+            return None
+        if self.admin_token:
+            for name, value in scope["headers"]:
+                if name == b"x-profile":
+                    if secrets.compare_digest(value, self.admin_token.encode()):
+                        return "header"
+                    break
+        if self.sample_rate and random.random() < self.sample_rate:
+            return "sampled"
+        return None
+
+    async def __call__(self, scope, receive, send):
+        trigger = self._trigger(scope) if scope["type"] == "http" else None
+        if trigger is None or not self._busy.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile()
+        status = 500
+
+        async def send_with_id(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [(b"x-profile-id", profile.id.encode())]
+            await send(message)
+
+        token = _current_profile.set(profile)
+        start = time.perf_counter()
+        profile.loop_profile.enable()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            profile.loop_profile.disable()
+            duration = time.perf_counter() - start
+            _current_profile.reset(token)
+            self._busy.release()
+            try:
+                # pstats dump, JSON write and pruning stay off the event loop
+                await asyncio.to_thread(self.store.save, profile, {
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "status": status,
+                    "duration_ms": round(duration * 1000, 3),
+                    "trigger": trigger,
+                    "created_at": datetime.utcnow().isoformat()
+                })
+            except OSError as e:
+                logger.warning(f"Could not store profile {profile.id}: {e}")
+
+
+def profile_worker_thread(call: Callable) -> Callable:
+    """Wrap work run in a worker thread so it joins the current request profile, if any"""
+    @functools.wraps(call)
+    def profiled(*args, **kwargs):
+        request_profile = _current_profile.get()
+        if request_profile is None:
+            return call(*args, **kwargs)
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            return call(*args, **kwargs)
+        finally:
+            profile.disable()
+            request_profile.thread_profiles.append(profile)
+    return profiled
+
+
+class ProfiledRoute(APIRoute):
+    """
+    APIRoute whose sync endpoints join the current request profile
+
+    Sync endpoints run in a worker thread the loop profiler cannot see.
+    Endpoints are only wrapped when profiling is enabled; outside a
+    profiled request the wrapper costs one context variable lookup.
+    """
+
+    def get_route_handler(self):
+        call = self.dependant.call
+        if get_settings().profiling_enabled and call is not None and not asyncio.iscoroutinefunction(call):
+            self.dependant.call = profile_worker_thread(call)
+        return super().get_route_handler()
+
+
+def build_admin_router(store: ProfileStore, admin_token: str) -> APIRouter:
+    """Endpoints listing and downloading stored profiles (X-Admin-Token required)"""
+    router = APIRouter(prefix="/admin/profiles")
+
+    def authorize(token: Optional[str]):
+        if not token or not secrets.compare_digest(token, admin_token):
+            raise HTTPException(status_code=403, detail="Invalid admin token")
+
+    @router.get("")
+    def list_profiles(x_admin_token: Optional[str] = Header(default=None)):
+        """List stored request profiles, newest first"""
+        authorize(x_admin_token)
+        return store.list()
+
+    @router.get("/{profile_id}")
+    def download_profile(
+        profile_id: str,
+        format: str = "collapsed",
+        x_admin_token: Optional[str] = Header(default=None)
+    ):
+        """Download a profile as collapsed stacks (flame graphs) or raw pstats"""
+        authorize(x_admin_token)
+        path = store.path(profile_id)
+        if path is None:
+            raise HTTPException(status_code=404, detail="Profile not found")
+        if format == "pstats":
+            return FileResponse(path, media_type="application/octet-stream", filename=path.name)
+        if format != "collapsed":
+            raise HTTPException(status_code=400, detail="format must be 'collapsed' or 'pstats'")
+        return PlainTextResponse(collapsed_stacks(pstats.Stats(str(path))))
+
+    return router
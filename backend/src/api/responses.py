@@ -0,0 +1,40 @@
+from typing import Any, Dict, List, Optional, Type
+from functools import lru_cache
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+
+
+class PydanticJSONResponse(Response):
+    """
+    JSON response serialized directly by pydantic-core
+
+    Routes that return this response bypass FastAPI's jsonable_encoder
+    pass and the second json.dumps, so models are encoded exactly once.
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        if isinstance(content, BaseModel):
+            return content.model_dump_json().encode()
+        return TypeAdapter(Any).dump_json(content)
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(List[model])
+
+
+def model_response(model: BaseModel, status_code: int = 200) -> PydanticJSONResponse:
+    """Serialize a single model"""
+    return PydanticJSONResponse(model.model_dump_json().encode(), status_code=status_code)
+
+
+def list_response(
+    items: List[BaseModel],
+    model: Type[BaseModel],
+    headers: Optional[Dict[str, str]] = None
+) -> PydanticJSONResponse:
+    """Serialize a homogeneous list of models in one pass"""
+    return PydanticJSONResponse(_list_adapter(model).dump_json(items), headers=headers)
@@ -1,28 +1,150 @@
-from fastapi import APIRouter, HTTPException
-from typing import List
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from typing import Iterator, List, Optional, Tuple
 from src.api.models import (
     CreateTeamMemberRequest,
     CreateTaskRequest,
     CreateSprintRequest,
-    SprintPlanResponse
+    SprintPlanResponse,
+    SprintPlanResult,
+    EvaluateScenariosRequest,
+    PlanRoadmapRequest,
+    UpdateTaskStatusRequest
 )
+from src.api.responses import PydanticJSONResponse, model_response, list_response
+from src.api.plan_cache import plan_key, etag_for, etag_matches
+from src.api.binary_formats import JSON, ARROW_FILE, MSGPACK, negotiate, is_available, table_response
+from src.api.profiling import ProfiledRoute, profile_worker_thread
+from src.api.admission import AdmissionController, Overloaded, plan_cost
+from src.api.tenants import TENANT_ID_PATTERN, TenantLimitReached, TenantRegistry, TenantState, tenant_worker
 from src.data_model.team_member import TeamMember
-from src.data_model.task import Task
+from src.data_model.task import Task, TaskStatus
 from src.data_model.sprint import Sprint
+from src.data_model.assignment import Assignment
 from src.sprint_planner.sprint_optimizer import SprintOptimizer
+from src.decision_engine.assignment_ledger import AssignmentLedger
+from src.decision_engine.constraints import validate_constraints
+from src.sprint_planner.scenario_evaluator import ScenarioEvaluator, ScenarioResult
+from src.sprint_planner.horizon_planner import HorizonPlanner, RoadmapPlan
+from src.sprint_planner.plan_recording import PlanCapture, PlanRecorder
+from src.feature_engine.scoring_weights import WeightRegistry
+from src.llm.rationale_generator import RationaleGenerator, RationaleStore, rationale_features
+from src.analytics.sprint_analytics import SprintClosure, BurndownChart, VelocityChart
+from config.settings import get_settings
 from datetime import datetime, timedelta
+from functools import lru_cache
+import asyncio
+import time
 import uuid
 
-router = APIRouter()
-sprint_optimizer = SprintOptimizer()
+router = APIRouter(route_class=ProfiledRoute)
 
-# In-memory storage (replace with database in production)
-team_members: List[TeamMember] = []
-tasks: List[Task] = []
-sprints: List[Sprint] = []
+PLAN_COMMIT_ATTEMPTS = 3  # Plans made outside the tenant lock; the last attempt holds it
 
-@router.post("/team-members")
-def create_team_member(request: CreateTeamMemberRequest):
+@lru_cache(maxsize=None)
+def get_weight_registry() -> WeightRegistry:
+    """Scoring weight registry, created on first use"""
+    return WeightRegistry(get_settings().scoring_weights_path)
+
+@lru_cache(maxsize=None)
+def get_sprint_optimizer() -> SprintOptimizer:
+    """Shared sprint optimizer, created on first planning request"""
+    return SprintOptimizer(weight_registry=get_weight_registry())
+
+@lru_cache(maxsize=None)
+def get_tenant_registry() -> TenantRegistry:
+    """Per-tenant state (lists, indexes, caches, event log), created on first use"""
+    settings = get_settings()
+    return TenantRegistry(settings, settings.tenant_worker_count, settings.tenant_worker_index)
+
+def _served_tenant_id(x_tenant_id: Optional[str]) -> str:
+    """The tenant named by X-Tenant-ID (or the default tenant), if this worker serves it"""
+    tenant_id = x_tenant_id or get_settings().default_tenant_id
+    if not TENANT_ID_PATTERN.match(tenant_id):
+        raise HTTPException(status_code=400, detail="Invalid X-Tenant-ID")
+    registry = get_tenant_registry()
+    if not registry.owns(tenant_id):
+        raise HTTPException(
+            status_code=421,
+            detail="Tenant is served by another worker",
+            headers={"X-Tenant-Worker": str(tenant_worker(tenant_id, registry.worker_count))}
+        )
+    return tenant_id
+
+def get_tenant(x_tenant_id: Optional[str] = Header(default=None)) -> Iterator[TenantState]:
+    """The state of the tenant named by X-Tenant-ID, created on first write (held for the request)"""
+    registry = get_tenant_registry()
+    try:
+        tenant = registry.get(_served_tenant_id(x_tenant_id), hold=True)
+    except TenantLimitReached:
+        raise HTTPException(status_code=503, detail="Too many tenants loaded, retry later", headers={"Retry-After": "60"})
+    try:
+        yield tenant
+    finally:
+        registry.release(tenant)
+
+def get_tenant_view(x_tenant_id: Optional[str] = Header(default=None)) -> Iterator[TenantState]:
+    """The state of the tenant named by X-Tenant-ID for reads (empty, and not created, if it does not exist)"""
+    registry = get_tenant_registry()
+    try:
+        tenant = registry.find(_served_tenant_id(x_tenant_id), hold=True)
+    except TenantLimitReached:
+        raise HTTPException(status_code=503, detail="Too many tenants loaded, retry later", headers={"Retry-After": "60"})
+    if tenant is None:
+        yield registry.empty_view
+        return
+    try:
+        yield tenant
+    finally:
+        registry.release(tenant)
+
+@lru_cache(maxsize=None)
+def get_admission_controller() -> AdmissionController:
+    """Admission control shared by this process's planning requests"""
+    settings = get_settings()
+    return AdmissionController(
+        budget=settings.planning_cost_budget,
+        max_concurrency=settings.planning_max_concurrency,
+        queue_size=settings.planning_queue_size,
+        queue_timeout_seconds=settings.planning_queue_timeout_seconds,
+        max_queued_per_team=settings.planning_max_queued_per_team
+    )
+
+@lru_cache(maxsize=None)
+def get_plan_recorder() -> Optional[PlanRecorder]:
+    """Recorder of planning runs for offline replay (None unless PLAN_RECORDING_ENABLED)"""
+    settings = get_settings()
+    if not settings.plan_recording_enabled:
+        return None
+    return PlanRecorder(
+        settings.plan_recording_dir,
+        sample_rate=settings.plan_recording_sample_rate,
+        max_files=settings.plan_recording_max_files
+    )
+
+@lru_cache(maxsize=None)
+def get_rationale_generator() -> RationaleGenerator:
+    """LLM rationale generator, created (and its SDKs imported) on first use"""
+    from src.llm.providers import build_providers
+    
+    settings = get_settings()
+    return RationaleGenerator(
+        build_providers(settings),
+        batch_size=settings.rationale_batch_size,
+        max_concurrency=settings.rationale_max_concurrency,
+        timeout_seconds=settings.rationale_timeout_seconds
+    )
+
+async def generate_sprint_rationales(rationale_store: RationaleStore, sprint_id: str, items: List[dict]):
+    """Background job filling in rationales for a planned sprint"""
+    try:
+        results = await get_rationale_generator().generate(items)
+        rationale_store.complete(sprint_id, results)
+    except Exception as e:
+        rationale_store.fail(sprint_id, str(e))
+
+@router.post("/team-members", response_model=TeamMember)
+def create_team_member(request: CreateTeamMemberRequest, tenant: TenantState = Depends(get_tenant)):
     """Create a new team member"""
     member = TeamMember(
         id=str(uuid.uuid4()),
@@ -31,11 +153,13 @@ def create_team_member(request: CreateTeamMemberRequest):
         skills=request.skills,
         total_hours_available=request.total_hours_available
     )
-    team_members.append(member)
-    return member
+    with tenant.mutation():
+        tenant.add_member(member)
+        tenant.record("member_created", member=member)
+    return model_response(member)
 
-@router.post("/tasks")
-def create_task(request: CreateTaskRequest):
+@router.post("/tasks", response_model=Task)
+def create_task(request: CreateTaskRequest, tenant: TenantState = Depends(get_tenant)):
     """Create a new task"""
     task = Task(
         id=str(uuid.uuid4()),
@@ -47,58 +171,532 @@ def create_task(request: CreateTaskRequest):
         priority=request.priority,
         deadline=datetime.fromisoformat(request.deadline)
     )
-    tasks.append(task)
-    return task
+    with tenant.mutation():
+        tenant.add_task(task)
+        tenant.record("task_created", task=task)
+    return model_response(task)
 
-@router.post("/sprints/plan")
-def plan_sprint(request: CreateSprintRequest):
-    """Plan a new sprint"""
+@router.post("/sprints/plan", response_model=SprintPlanResult)
+async def plan_sprint(
+    request: CreateSprintRequest,
+    background_tasks: BackgroundTasks,
+    accept: Optional[str] = Header(default=None),
+    tenant: TenantState = Depends(get_tenant)
+):
+    """
+    Plan a new sprint
+    
+    Identical requests against the same team and backlog (including a
+    retry of a plan that was already committed) return the cached plan
+    for a short TTL, and concurrent duplicates share one computation.
+    Accept selects JSON, Arrow (planned tasks as a table, the sprint in
+    the schema metadata) or MessagePack.
+    
+    Cache hits and duplicates of a plan in flight are answered without
+    admission control. Other plans go through it: they run one at a time
+    per tenant, in planning threads bounded by a cost budget, and
+    requests that cannot be admitted in time get 429 or 503 with
+    Retry-After.
+    """
+    media_type = negotiate(accept)
+    
+    # Get team members
+    sprint_team = tenant.members_by_ids(request.team_member_ids)
+    if not sprint_team:
+        raise HTTPException(status_code=400, detail="No valid team members provided")
     try:
-        # Get team members
-        sprint_team = [m for m in team_members if m.id in request.team_member_ids]
-        if not sprint_team:
-            raise HTTPException(status_code=400, detail="No valid team members provided")
-        
-        # Create sprint
-        sprint = Sprint(
-            id=str(uuid.uuid4()),
-            name=request.name,
-            start_date=datetime.utcnow(),
-            end_date=datetime.utcnow() + timedelta(days=request.duration_days),
-            duration_days=request.duration_days,
-            team_members=request.team_member_ids
-        )
-        
-        # Plan sprint
-        planned_sprint, selected_tasks = sprint_optimizer.plan_sprint(
-            sprint,
-            [t for t in tasks if not t.assigned_to],
-            sprint_team
+        validate_constraints(request.constraints, [m.id for m in sprint_team])
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    backlog = [t for t in tenant.tasks if not t.assigned_to]
+    weights_version = get_weight_registry().get(request.weight_profile).version
+    key = plan_key(request, sprint_team, backlog, weights_version)
+    plan, future, leader = tenant.plan_cache.begin(key)
+    try:
+        if future is None:
+            source = "hit"
+        elif not leader:
+            # Shielded: a follower that disconnects must not cancel the leader's future
+            plan, source = await asyncio.shield(asyncio.wrap_future(future)), "coalesced"
+        else:
+            try:
+                plan = await get_admission_controller().run(
+                    tenant.tenant_id,
+                    plan_cost(len(backlog), len(sprint_team)),
+                    profile_worker_thread(
+                        lambda: _plan_sprint(request, background_tasks, tenant, sprint_team, weights_version)
+                    )
+                )
+            except BaseException as e:
+                tenant.plan_cache.complete(key, future, error=e)
+                raise
+            tenant.plan_cache.complete(key, future, plan)
+            source = "miss"
+    except Overloaded as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail, headers={"Retry-After": str(e.retry_after)})
+    
+    result, body = plan
+    if media_type != JSON:
+        response = table_response(
+            result.tasks, Task, media_type, metadata={"sprint": result.sprint.model_dump(mode="json")}
         )
+        response.headers.update({"ETag": etag_for(response.body), "X-Plan-Cache": source, "Vary": "Accept"})
+        return response
+    return PydanticJSONResponse(body, headers={"ETag": etag_for(body), "X-Plan-Cache": source, "Vary": "Accept"})
+
+def _plan_sprint(
+    request: CreateSprintRequest,
+    background_tasks: BackgroundTasks,
+    tenant: TenantState,
+    sprint_team: List[TeamMember],
+    weights_version: str
+) -> Tuple[SprintPlanResult, bytes]:
+    """Plan, commit and serialize a sprint (runs in a planning thread)"""
+    try:
+        def cache_key() -> str:
+            backlog = [t for t in tenant.tasks if not t.assigned_to]
+            team = tenant.members_by_ids(m.id for m in sprint_team)  # Committed plans replace members
+            return plan_key(request, team, backlog, weights_version)
         
-        sprints.append(planned_sprint)
+        def compute_plan() -> Tuple[SprintPlanResult, bytes]:
+            # Create sprint
+            now = datetime.utcnow()
+            sprint = Sprint(
+                id=str(uuid.uuid4()),
+                name=request.name,
+                start_date=now,
+                end_date=now + timedelta(days=request.duration_days),
+                duration_days=request.duration_days,
+                team_members=request.team_member_ids
+            )
+            
+            event_broker = tenant.event_broker
+            job = {"job_id": request.job_id, "sprint_id": sprint.id, "name": sprint.name}
+            
+            def report_progress(stage: str, done: int, total: int):
+                event_broker.publish(
+                    "plan_progress", {**job, "stage": stage, "done": done, "total": total}, sprint.id
+                )
+            
+            # Plan on copies without the tenant lock, so member and task
+            # writes are not held behind a long plan; the plan commits only
+            # if no write landed meanwhile, else it is planned again
+            report_progress("started", 0, 0)
+            recorder = get_plan_recorder()
+            record_run = recorder is not None and recorder.sampled()
+            
+            def snapshot() -> Tuple[int, List[Task], List[TeamMember]]:
+                backlog = [t.model_copy() for t in tenant.tasks if not t.assigned_to]
+                team = [m.model_copy() for m in tenant.members_by_ids(m.id for m in sprint_team)]
+                return tenant.generation, backlog, team
+            
+            def plan(backlog: List[Task], team: List[TeamMember]):
+                capture = None
+                if record_run:
+                    capture = PlanCapture(
+                        team,
+                        backlog,
+                        request.constraints,
+                        request.duration_days,
+                        request.as_of or now,
+                        request.weight_profile,
+                        weights_version
+                    )
+                
+                started = time.perf_counter()
+                planned_sprint, selected_tasks, assignments = get_sprint_optimizer().plan_sprint_with_assignments(
+                    sprint.model_copy(),
+                    backlog,
+                    team,
+                    weight_profile=request.weight_profile,
+                    as_of=request.as_of or now,
+                    progress=report_progress,
+                    constraints=request.constraints,
+                    candidate_index=tenant.candidate_index,
+                    ledger=AssignmentLedger()
+                )
+                latency_ms = (time.perf_counter() - started) * 1000
+                return planned_sprint, selected_tasks, assignments, latency_ms, capture
+            
+            def commit(planned_sprint: Sprint, selected_tasks: List[Task], team: List[TeamMember], assignments):
+                for task in selected_tasks:
+                    tenant.put_task(task)
+                for member in team:
+                    tenant.put_member(member)
+                tenant.assignments.record(assignments)
+                tenant.add_sprint(planned_sprint)
+                tenant.analytics.open_sprint(planned_sprint, selected_tasks)
+                tenant.record(
+                    "plan_committed",
+                    sprint=planned_sprint,
+                    tasks=selected_tasks,
+                    members=team,
+                    assignments=assignments
+                )
+            
+            committed = False
+            for _ in range(PLAN_COMMIT_ATTEMPTS - 1):
+                with tenant.mutation():
+                    generation, backlog, team = snapshot()
+                planned_sprint, selected_tasks, assignments, latency_ms, capture = plan(backlog, team)
+                with tenant.mutation():
+                    if tenant.generation == generation:
+                        commit(planned_sprint, selected_tasks, team, assignments)
+                        committed = True
+                if committed:
+                    break
+            if not committed:
+                # Writes kept landing while planning: plan under the lock
+                with tenant.mutation():
+                    _, backlog, team = snapshot()
+                    planned_sprint, selected_tasks, assignments, latency_ms, capture = plan(backlog, team)
+                    commit(planned_sprint, selected_tasks, team, assignments)
+            
+            event_broker.publish("assignments_changed", {
+                "sprint_id": planned_sprint.id,
+                "assignments": [{"task_id": a.task_id, "member_id": a.member_id} for a in assignments]
+            }, planned_sprint.id)
+            report_progress("completed", len(assignments), len(selected_tasks))
+            
+            if capture is not None:
+                record = capture.finish(planned_sprint, assignments, team, latency_ms)
+                background_tasks.add_task(recorder.save, record)
+            
+            # Rationales never delay the plan: they are generated after the
+            # response is sent and fetched from /sprints/{id}/rationales
+            if get_settings().rationale_enabled and assignments:
+                task_map = {t.id: t for t in selected_tasks}
+                member_map = {m.id: m for m in team}
+                items = [
+                    rationale_features(a, task_map[a.task_id], member_map[a.member_id])
+                    for a in assignments
+                ]
+                tenant.rationales.start(planned_sprint.id, assignments)
+                background_tasks.add_task(generate_sprint_rationales, tenant.rationales, planned_sprint.id, items)
+            
+            result = SprintPlanResult.model_construct(sprint=planned_sprint, tasks=selected_tasks)
+            plan = (result, result.model_dump_json().encode())
+            
+            # A retry sent after this plan was committed sees the new state;
+            # map that state to the same plan instead of planning another sprint
+            tenant.plan_cache.put(cache_key(), plan)
+            return plan
         
-        return {
-            "sprint": planned_sprint.dict(),
-            "tasks": [t.dict() for t in selected_tasks]
-        }
+        return compute_plan()
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error planning sprint: {str(e)}")
 
-@router.get("/sprints/{sprint_id}")
-def get_sprint(sprint_id: str):
-    """Get sprint details"""
-    sprint = next((s for s in sprints if s.id == sprint_id), None)
+@router.post("/sprints/scenarios", response_model=List[ScenarioResult])
+def evaluate_scenarios(request: EvaluateScenariosRequest, tenant: TenantState = Depends(get_tenant)):
+    """Evaluate what-if scenarios against the current backlog without changing any state"""
+    sprint_team = tenant.members_by_ids(request.team_member_ids)
+    if not sprint_team:
+        raise HTTPException(status_code=400, detail="No valid team members provided")
+    
+    evaluator = ScenarioEvaluator(weight_registry=get_weight_registry())
+    try:
+        results = evaluator.evaluate(
+            tenant.tasks,
+            sprint_team,
+            request.scenarios,
+            weight_profile=request.weight_profile,
+            as_of=request.as_of,
+            constraints=request.constraints
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return list_response(results, ScenarioResult)
+
+@router.post("/sprints/roadmap", response_model=RoadmapPlan)
+def plan_roadmap(request: PlanRoadmapRequest, tenant: TenantState = Depends(get_tenant)):
+    """Forecast the open backlog across several future sprints without assigning anything"""
+    sprint_team = tenant.members_by_ids(request.team_member_ids)
+    if not sprint_team:
+        raise HTTPException(status_code=400, detail="No valid team members provided")
+    
+    planner = HorizonPlanner(
+        weight_registry=get_weight_registry(),
+        sprint_length_days=request.sprint_length_days
+    )
+    try:
+        roadmap = planner.plan(
+            tenant.tasks,
+            sprint_team,
+            request.num_sprints,
+            weight_profile=request.weight_profile,
+            as_of=request.as_of
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return model_response(roadmap)
+
+@router.patch("/tasks/{task_id}/status", response_model=Task)
+def update_task_status(
+    task_id: str,
+    request: UpdateTaskStatusRequest,
+    tenant: TenantState = Depends(get_tenant)
+):
+    """
+    Move a task to a new status
+    
+    Completing a task counts towards its sprint's completed_tasks and
+    delaying it towards failed_tasks (moving it back undoes the count).
+    Every change is recorded for the burndown and velocity analytics.
+    """
+    with tenant.mutation():
+        # Looked up under the lock: a plan commit replaces the task objects it assigns
+        task = tenant.get_task(task_id)
+        if not task:
+            raise HTTPException(status_code=404, detail="Task not found")
+        now = datetime.utcnow()
+        previous = task.status
+        task.status = request.status
+        if request.actual_hours is not None:
+            task.actual_hours = request.actual_hours
+        
+        sprint = tenant.get_sprint(task.sprint_id) if task.sprint_id else None
+        if sprint is not None and previous != task.status:
+            counters = {TaskStatus.COMPLETED: "completed_tasks", TaskStatus.DELAYED: "failed_tasks"}
+            if previous in counters:
+                setattr(sprint, counters[previous], getattr(sprint, counters[previous]) - 1)
+            if task.status in counters:
+                setattr(sprint, counters[task.status], getattr(sprint, counters[task.status]) + 1)
+        if previous != task.status:
+            tenant.analytics.record_transition(task, previous, now)
+        if task.status == TaskStatus.COMPLETED:
+            tenant.assignments.release(task.id)
+        tenant.record("task_status_changed", task=task, sprint=sprint, previous=previous, at=now)
+    
+    event_broker = tenant.event_broker
+    event_broker.publish("task_status_changed", {
+        "task_id": task.id,
+        "sprint_id": task.sprint_id,
+        "assigned_to": task.assigned_to,
+        "from": previous,
+        "to": task.status
+    }, task.sprint_id)
+    if sprint is not None and previous != task.status:
+        event_broker.publish("sprint_progress", {
+            "sprint_id": sprint.id,
+            "planned_tasks": sprint.planned_tasks,
+            "completed_tasks": sprint.completed_tasks,
+            "failed_tasks": sprint.failed_tasks,
+            "progress": sprint.sprint_progress()
+        }, sprint.id)
+    return model_response(task)
+
+@router.get("/events")
+async def stream_events(
+    request: Request,
+    sprint_id: Optional[str] = None,
+    types: Optional[str] = None,
+    last_event_id: Optional[int] = Header(default=None),
+    tenant: TenantState = Depends(get_tenant_view)
+):
+    """
+    Server-sent events with live planner changes
+    
+    Optionally filtered to one sprint and/or a comma-separated list of
+    event types; reconnecting clients resume after Last-Event-ID.
+    """
+    if tenant is get_tenant_registry().empty_view:
+        raise HTTPException(status_code=404, detail="Unknown tenant")
+    event_broker = tenant.event_broker
+    heartbeat = get_settings().event_heartbeat_seconds
+    subscription = event_broker.subscribe(
+        sprint_id,
+        types.split(",") if types else None,
+        last_event_id
+    )
+    
+    async def frames():
+        try:
+            while not await request.is_disconnected():
+                frame = await subscription.next_frame(heartbeat)
+                yield frame if frame is not None else b": keep-alive\n\n"
+        finally:
+            event_broker.unsubscribe(subscription)
+    
+    return StreamingResponse(
+        frames(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/sprints/{sprint_id}", response_model=Sprint)
+def get_sprint(
+    sprint_id: str,
+    if_none_match: Optional[str] = Header(default=None),
+    tenant: TenantState = Depends(get_tenant_view)
+):
+    """Get sprint details (supports conditional requests via If-None-Match)"""
+    sprint = tenant.get_sprint(sprint_id)
     if not sprint:
         raise HTTPException(status_code=404, detail="Sprint not found")
-    return sprint
+    body = sprint.model_dump_json().encode()
+    headers = {"ETag": etag_for(body), "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    return PydanticJSONResponse(body, headers=headers)
+
+@router.post("/sprints/{sprint_id}/close", response_model=SprintClosure)
+def close_sprint(sprint_id: str, tenant: TenantState = Depends(get_tenant)):
+    """
+    Close a sprint
+    
+    Unfinished tasks are carried over (unassigned and returned to the
+    backlog), the sprint's hours are released from its members'
+    workload and each member's sprint_velocity is updated from their
+    recent closed sprints.
+    """
+    with tenant.mutation():
+        sprint = tenant.get_sprint(sprint_id)
+        if not sprint:
+            raise HTTPException(status_code=404, detail="Sprint not found")
+        if sprint.status == "completed":
+            raise HTTPException(status_code=409, detail="Sprint is already closed")
+        now = datetime.utcnow()
+        try:
+            closure = tenant.analytics.close_sprint(sprint.id, now)
+        except KeyError:
+            raise HTTPException(status_code=409, detail="Sprint has no analytics history")
+        
+        sprint.status = "completed"
+        sprint_tasks = tenant.tasks_by_ids(sprint.task_ids)
+        sprint_team = tenant.members_by_ids(sprint.team_members)
+        member_map = {m.id: m for m in sprint_team}
+        # Release what planning booked (corrected hours when a model was active)
+        booked = {a.task_id: a.planned_hours for a in tenant.assignments.for_sprint(sprint.id) if a.planned_hours is not None}
+        for task in sprint_tasks:
+            member = member_map.get(task.assigned_to)
+            if member is not None:
+                hours = booked.get(task.id, task.estimated_hours)
+                member.current_workload = max(0.0, member.current_workload - hours)
+            if task.status != TaskStatus.COMPLETED:
+                task.assigned_to = None
+                task.sprint_id = None
+                task.status = TaskStatus.PENDING
+                tenant.assignments.release(task.id)
+        for member in sprint_team:
+            member.sprint_velocity = closure.member_velocity.get(member.id, member.sprint_velocity)
+        tenant.record("sprint_closed", sprint=sprint, tasks=sprint_tasks, members=sprint_team, at=now)
+    
+    tenant.event_broker.publish("sprint_closed", {
+        "sprint_id": sprint.id,
+        "completed_tasks": closure.completed_tasks,
+        "carried_over_task_ids": closure.carried_over_task_ids
+    }, sprint.id)
+    return model_response(closure)
+
+@router.get("/team-members/{member_id}/assignments", response_model=List[Assignment])
+def get_member_assignments(member_id: str, tenant: TenantState = Depends(get_tenant_view)):
+    """The member's current assignments (tasks not yet completed or carried over)"""
+    return list_response(tenant.assignments.current_for_member(member_id), Assignment)
 
-@router.get("/team-members")
-def list_team_members():
-    """List all team members"""
-    return team_members
+@router.get("/tasks/{task_id}/assignments", response_model=List[Assignment])
+def get_task_assignments(
+    task_id: str,
+    include_archived: bool = False,
+    tenant: TenantState = Depends(get_tenant_view)
+):
+    """Every assignment of a task, oldest first (include_archived reads evicted history back)"""
+    if tenant.get_task(task_id) is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return list_response(tenant.assignments.task_history(task_id, include_archived), Assignment)
 
-@router.get("/tasks")
-def list_tasks():
-    """List all tasks"""
-    return tasks
\ No newline at end of file
+@router.get("/sprints/{sprint_id}/assignments", response_model=List[Assignment])
+def get_sprint_assignments(sprint_id: str, tenant: TenantState = Depends(get_tenant_view)):
+    """Assignments made when the sprint was planned"""
+    if tenant.get_sprint(sprint_id) is None:
+        raise HTTPException(status_code=404, detail="Sprint not found")
+    return list_response(tenant.assignments.for_sprint(sprint_id), Assignment)
+
+@router.get("/sprints/{sprint_id}/burndown", response_model=BurndownChart)
+def get_sprint_burndown(sprint_id: str, tenant: TenantState = Depends(get_tenant_view)):
+    """Remaining hours per day of a sprint, read from the analytics rollups"""
+    try:
+        return model_response(tenant.analytics.burndown(sprint_id))
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Sprint not found")
+
+@router.get("/analytics/velocity", response_model=VelocityChart)
+def get_velocity(
+    member_id: Optional[str] = None,
+    last_n: int = Query(default=10, ge=1, le=500),
+    tenant: TenantState = Depends(get_tenant_view)
+):
+    """Team (or member) velocity and carry-over rate over recent closed sprints"""
+    return model_response(tenant.analytics.velocity(member_id, last_n))
+
+@router.get("/sprints/{sprint_id}/rationales")
+def get_sprint_rationales(sprint_id: str, tenant: TenantState = Depends(get_tenant_view)):
+    """Get natural-language assignment rationales for a planned sprint"""
+    if not get_settings().rationale_enabled:
+        raise HTTPException(status_code=404, detail="Rationale generation is not enabled")
+    entry = tenant.rationales.get(sprint_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="No rationales for this sprint")
+    return entry
+
+@router.get("/team-members", response_model=List[TeamMember])
+def list_team_members(accept: Optional[str] = Header(default=None), tenant: TenantState = Depends(get_tenant_view)):
+    """List all team members (JSON, or an Arrow / MessagePack table by Accept)"""
+    media_type = negotiate(accept)
+    if media_type != JSON:
+        return table_response(tenant.team_members, TeamMember, media_type, headers={"Vary": "Accept"})
+    return list_response(tenant.team_members, TeamMember, headers={"Vary": "Accept"})
+
+@router.get("/tasks", response_model=List[Task])
+def list_tasks(accept: Optional[str] = Header(default=None), tenant: TenantState = Depends(get_tenant_view)):
+    """List all tasks (JSON, or an Arrow / MessagePack table by Accept)"""
+    media_type = negotiate(accept)
+    if media_type != JSON:
+        return table_response(tenant.tasks, Task, media_type, headers={"Vary": "Accept"})
+    return list_response(tenant.tasks, Task, headers={"Vary": "Accept"})
+
+EXPORT_DATASETS = {"tasks": Task, "team-members": TeamMember, "sprints": Sprint}
+EXPORT_FORMATS = {"arrow": ARROW_FILE, "msgpack": MSGPACK}
+
+@router.get("/export/{dataset}")
+def export_dataset(dataset: str, format: str = "arrow", tenant: TenantState = Depends(get_tenant_view)):
+    """
+    Download tasks, team-members or sprints as a file for offline analysis
+    
+    format=arrow is an Arrow IPC file (pandas.read_feather), msgpack a
+    MessagePack map of columns.
+    """
+    model = EXPORT_DATASETS.get(dataset)
+    if model is None:
+        raise HTTPException(status_code=404, detail=f"Unknown dataset; use one of {', '.join(EXPORT_DATASETS)}")
+    media_type = EXPORT_FORMATS.get(format)
+    if media_type is None:
+        raise HTTPException(status_code=400, detail="format must be 'arrow' or 'msgpack'")
+    if not is_available(media_type):
+        raise HTTPException(status_code=406, detail=f"The {format} export needs an optional dependency that is not installed")
+    
+    items = {"tasks": tenant.tasks, "team-members": tenant.team_members, "sprints": tenant.sprints}[dataset]
+    return table_response(items, model, media_type, headers={
+        "Content-Disposition": f'attachment; filename="{dataset}.{format}"'
+    })
+
+@router.get("/scoring-weights")
+def list_scoring_weights():
+    """List registered scoring weight versions and the active version per profile"""
+    weight_registry = get_weight_registry()
+    return {
+        "active": weight_registry.active_versions(),
+        "versions": weight_registry.versions()
+    }
+
+@router.post("/scoring-weights/{version}/activate")
+def activate_scoring_weights(version: str, profile: Optional[str] = None):
+    """Activate a registered scoring weight version for a team profile"""
+    weight_registry = get_weight_registry()
+    try:
+        weight_registry.activate(version, profile)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Scoring weight version not found")
+    return {"active": weight_registry.active_versions()}
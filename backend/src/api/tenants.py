@@ -0,0 +1,285 @@
+from typing import Dict, Iterable, List, Optional
+from pathlib import Path
+import re
+import threading
+import time
+import zlib
+from src.api.plan_cache import PlanCache
+from src.api.event_broker import EventBroker
+from src.analytics.sprint_analytics import SprintAnalytics
+from src.decision_engine.candidate_index import CandidateIndex
+from src.decision_engine.assignment_ledger import AssignmentLedger
+from src.data_model.team_member import TeamMember
+from src.data_model.task import Task
+from src.data_model.sprint import Sprint
+from src.llm.rationale_generator import RationaleStore
+from src.persistence.state_store import PlannerState, StateStore
+from src.utils.logger import logger
+
+TENANT_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+
+def tenant_worker(tenant_id: str, worker_count: int) -> int:
+    """Worker process a tenant is pinned to (stable across restarts and hosts)"""
+    return zlib.crc32(tenant_id.encode()) % worker_count
+
+
+class TenantLimitReached(Exception):
+    """max_tenants are loaded and none of them can be closed to make room"""
+
+
+class TenantState:
+    """
+    Everything the API keeps for one tenant
+
+    Lists, id indexes, caches, the event stream, analytics, the
+    assignment ledger and the event log are all per tenant, so one tenant's size never affects
+    another's requests and their caches cannot evict each other.
+    Lookups go through the id indexes (id -> list position); the lists
+    only grow or replace items in place, so positions stay valid.
+    generation counts recorded changes, so work done on a copy of the
+    state outside mutation() can check nothing changed before committing.
+
+    Args:
+        tenant_id: Tenant identifier (X-Tenant-ID)
+        settings: Application settings used to size caches and queues
+        state_dir: Event log directory; state is in-memory only when None
+    """
+
+    def __init__(self, tenant_id: str, settings, state_dir: Optional[Path] = None):
+        self.tenant_id = tenant_id
+        self.generation = 0
+        self.active_requests = 0  # Requests holding this state (see TenantRegistry.get(hold=True))
+        self._lock = threading.RLock()
+        self.last_used = time.monotonic()  # Kept current by TenantRegistry, which evicts idle tenants
+        self.team_members: List[TeamMember] = []
+        self.tasks: List[Task] = []
+        self.sprints: List[Sprint] = []
+        self.plan_cache = PlanCache(settings.plan_cache_ttl_seconds, settings.plan_cache_size)
+        self.event_broker = EventBroker(settings.event_queue_size, settings.event_replay_size)
+        self.analytics = SprintAnalytics(settings.analytics_velocity_window)
+        self.rationales = RationaleStore()
+        self.assignments = AssignmentLedger(
+            max_entries=settings.assignment_retention_entries,
+            max_age_days=settings.assignment_retention_days,
+            archive_dir=str(state_dir / "assignments") if state_dir is not None else None
+        )
+
+        self.state_store: Optional[StateStore] = None
+        if state_dir is not None:
+            self.state_store = StateStore(
+                str(state_dir),
+                PlannerState(
+                    self.team_members, self.tasks, self.sprints, analytics=self.analytics, ledger=self.assignments
+                ),
+                snapshot_interval=settings.state_snapshot_interval,
+                group_commit_ms=settings.state_group_commit_ms,
+                fsync=settings.state_fsync
+            )
+            self.state_store.recover()
+
+        self._member_positions = {m.id: i for i, m in enumerate(self.team_members)}
+        self._task_positions = {t.id: i for i, t in enumerate(self.tasks)}
+        self._sprint_positions = {s.id: i for i, s in enumerate(self.sprints)}
+
+        # Members' skill vectors for top-k retrieval on very large teams
+        self.candidate_index: Optional[CandidateIndex] = None
+        if settings.candidate_index_enabled:
+            self.candidate_index = CandidateIndex(
+                top_k=settings.candidate_top_k,
+                n_lists=settings.candidate_index_lists,
+                n_probe=settings.candidate_index_probes,
+                min_members=settings.candidate_index_min_members
+            )
+            for member in self.team_members:
+                self.candidate_index.upsert(member)
+
+    def mutation(self):
+        """Scope a state change: holds the tenant's state lock, and logs the change when persistent"""
+        return self.state_store.mutation() if self.state_store is not None else self._lock
+
+    def record(self, event_type: str, **data):
+        """Log a state change made inside mutation()"""
+        self.generation += 1
+        if self.state_store is not None:
+            self.state_store.record(event_type, data)
+
+    def add_member(self, member: TeamMember):
+        self._member_positions[member.id] = len(self.team_members)
+        self.team_members.append(member)
+        if self.candidate_index is not None:
+            self.candidate_index.upsert(member)
+
+    def add_task(self, task: Task):
+        self._task_positions[task.id] = len(self.tasks)
+        self.tasks.append(task)
+
+    def add_sprint(self, sprint: Sprint):
+        self._sprint_positions[sprint.id] = len(self.sprints)
+        self.sprints.append(sprint)
+
+    def put_member(self, member: TeamMember):
+        """Replace the member with the same id"""
+        self.team_members[self._member_positions[member.id]] = member
+
+    def put_task(self, task: Task):
+        """Replace the task with the same id"""
+        self.tasks[self._task_positions[task.id]] = task
+
+    def get_task(self, task_id: str) -> Optional[Task]:
+        position = self._task_positions.get(task_id)
+        return self.tasks[position] if position is not None else None
+
+    def get_sprint(self, sprint_id: str) -> Optional[Sprint]:
+        position = self._sprint_positions.get(sprint_id)
+        return self.sprints[position] if position is not None else None
+
+    def members_by_ids(self, member_ids: Iterable[str]) -> List[TeamMember]:
+        """Members with the given ids, in registration order (unknown ids are skipped)"""
+        positions = sorted({self._member_positions[i] for i in member_ids if i in self._member_positions})
+        return [self.team_members[position] for position in positions]
+
+    def tasks_by_ids(self, task_ids: Iterable[str]) -> List[Task]:
+        """Tasks with the given ids, in creation order (unknown ids are skipped)"""
+        positions = sorted({self._task_positions[i] for i in task_ids if i in self._task_positions})
+        return [self.tasks[position] for position in positions]
+
+    def close(self):
+        if self.state_store is not None:
+            self.state_store.close()
+
+
+class TenantRegistry:
+    """
+    Lazily created TenantState per tenant id
+
+    With worker_count > 1 each worker process only serves the tenants
+    pinned to its worker_index (see tenant_worker()); a front proxy
+    routes on the same hash. Persistent tenants live in
+    <state_dir>/<tenant id>.
+
+    Only writes create tenants (get()); reads use find(), which never
+    does. At most settings.max_tenants are loaded: to load another, the
+    least recently used persistent tenant idle for tenant_idle_seconds
+    (with no request holding it and no event stream open) is closed, to
+    be recovered from its log on next use; lookups of a tenant that is
+    still closing wait for it, so one directory never has two writers.
+    In-memory tenants are never evicted, as that would lose their state.
+    """
+
+    def __init__(self, settings, worker_count: int = 1, worker_index: int = 0):
+        self.settings = settings
+        self.worker_count = max(worker_count, 1)
+        self.worker_index = worker_index
+        self.state_dir = Path(settings.state_dir) if settings.state_dir else None
+        self.empty_view = TenantState("", settings)  # Read-only stand-in for tenants that do not exist yet
+        self._tenants: Dict[str, TenantState] = {}
+        self._closing: Dict[str, threading.Event] = {}  # Evicted tenants whose log is being closed
+        self._lock = threading.Lock()
+
+    def owns(self, tenant_id: str) -> bool:
+        """Whether this worker serves the tenant"""
+        return tenant_worker(tenant_id, self.worker_count) == self.worker_index
+
+    def get(self, tenant_id: str, hold: bool = False) -> TenantState:
+        """
+        The tenant's state, recovering it from disk or creating it on first use
+
+        With hold, the tenant is not evicted until release() is called.
+
+        Raises:
+            ValueError: if the tenant id is malformed
+            TenantLimitReached: if max_tenants are loaded and none can be evicted
+        """
+        if not TENANT_ID_PATTERN.match(tenant_id):
+            raise ValueError("Tenant ids are 1-64 letters, digits, '-' or '_'")
+        return self._load(tenant_id, create=True, hold=hold)
+
+    def find(self, tenant_id: str, hold: bool = False) -> Optional[TenantState]:
+        """
+        The tenant's state if it exists (loaded or persisted), else None
+
+        Raises:
+            TenantLimitReached: if a persisted tenant cannot be loaded
+        """
+        if not TENANT_ID_PATTERN.match(tenant_id):
+            return None
+        return self._load(tenant_id, create=False, hold=hold)
+
+    def release(self, tenant: TenantState):
+        """Let a tenant returned with hold=True be evicted again"""
+        with self._lock:
+            tenant.active_requests -= 1
+
+    def _load(self, tenant_id: str, create: bool, hold: bool) -> Optional[TenantState]:
+        evicted = None
+        try:
+            while True:
+                with self._lock:
+                    closing = self._closing.get(tenant_id)
+                    if closing is None:
+                        tenant = self._tenants.get(tenant_id)
+                        if tenant is None and (create or self._persisted(tenant_id)):
+                            if len(self._tenants) >= self.settings.max_tenants:
+                                evicted = self._evict_idle()
+                            state_dir = self.state_dir / tenant_id if self.state_dir is not None else None
+                            tenant = TenantState(tenant_id, self.settings, state_dir)
+                            self._tenants[tenant_id] = tenant
+                        if tenant is not None:
+                            tenant.last_used = time.monotonic()
+                            tenant.active_requests += hold
+                        return tenant
+                closing.wait()  # Recover only once the evicted state has written its final snapshot
+        finally:
+            if evicted is not None:
+                # Closed outside the lock: the final snapshot may take a while
+                try:
+                    evicted.close()
+                finally:
+                    with self._lock:
+                        self._closing.pop(evicted.tenant_id).set()
+
+    def _persisted(self, tenant_id: str) -> bool:
+        return self.state_dir is not None and (self.state_dir / tenant_id).is_dir()
+
+    def _evict_idle(self) -> TenantState:
+        """Unregister the least recently used evictable tenant (called with the lock held)"""
+        idle_before = time.monotonic() - self.settings.tenant_idle_seconds
+        candidates = [
+            tenant for tenant in self._tenants.values()
+            if tenant.state_store is not None
+            and not tenant.active_requests
+            and tenant.last_used <= idle_before
+            and not tenant.event_broker.subscriber_count
+        ]
+        if not candidates:
+            raise TenantLimitReached(f"{len(self._tenants)} tenants are loaded and none is idle")
+        evicted = min(candidates, key=lambda tenant: tenant.last_used)
+        del self._tenants[evicted.tenant_id]
+        self._closing[evicted.tenant_id] = threading.Event()
+        logger.info(f"Closing idle tenant {evicted.tenant_id} to make room")
+        return evicted
+
+    def load_persisted(self) -> List[str]:
+        """Recover persisted tenants this worker owns, up to max_tenants; returns their ids"""
+        if self.state_dir is None or not self.state_dir.is_dir():
+            return []
+        loaded = []
+        for path in sorted(self.state_dir.iterdir()):
+            if path.is_dir() and TENANT_ID_PATTERN.match(path.name) and self.owns(path.name):
+                if len(self._tenants) >= self.settings.max_tenants:
+                    logger.warning("max_tenants reached; remaining tenants are recovered on first use")
+                    break
+                self.get(path.name).last_used = float("-inf")  # Not used by a request yet
+                loaded.append(path.name)
+        return loaded
+
+    def tenant_ids(self) -> List[str]:
+        return list(self._tenants)
+
+    def close(self):
+        """Close every tenant's event log (writing final snapshots)"""
+        with self._lock:
+            for tenant in self._tenants.values():
+                tenant.close()
+            self._tenants.clear()
@@ -1,16 +1,18 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 class Assignment(BaseModel):
     """Represents a task assignment"""
     id: str
     task_id: str
     member_id: str
+    sprint_id: Optional[str] = None
     
     # Assignment details
-    assigned_at: datetime = datetime.utcnow()
-    estimated_hours: float
+    assigned_at: datetime = Field(default_factory=datetime.utcnow)
+    estimated_hours: float  # The task's own estimate
+    planned_hours: Optional[float] = None  # Hours booked on the member (corrected when a model is active)
     
     # Scoring
     skill_compatibility_score: float  # 0.0 to 1.0
@@ -1,6 +1,6 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from typing import List, Optional
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
 
 class Priority(str, Enum):
@@ -16,8 +16,17 @@ class TaskStatus(str, Enum):
     COMPLETED = "completed"
     DELAYED = "delayed"
 
+PRIORITY_WEIGHTS = {
+    Priority.LOW: 0.3,
+    Priority.MEDIUM: 0.6,
+    Priority.HIGH: 0.85,
+    Priority.CRITICAL: 1.0
+}
+
 class Task(BaseModel):
     """Represents a task in the sprint"""
+    model_config = ConfigDict(validate_assignment=True)  # Deadlines set later are normalized too
+    
     id: str
     title: str
     description: str
@@ -44,18 +53,24 @@ class Task(BaseModel):
     created_at: datetime = Field(default_factory=datetime.utcnow)
     sprint_id: Optional[str] = None
     
-    def urgency_score(self) -> float:
-        """Calculate task urgency (0.0 to 1.0)"""
-        from datetime import datetime, timedelta
-        # Make sure we're comparing compatible datetimes
-        now = datetime.utcnow()
-        deadline = self.deadline
-        
-        # If deadline has timezone info, remove it for comparison
+    @field_validator("deadline")
+    @classmethod
+    def normalize_deadline(cls, deadline: datetime) -> datetime:
+        """Store deadlines as naive UTC so comparisons never need tz handling"""
         if deadline.tzinfo is not None:
-            deadline = deadline.replace(tzinfo=None)
+            deadline = deadline.astimezone(timezone.utc).replace(tzinfo=None)
+        return deadline
+    
+    def urgency_score(self, now: Optional[datetime] = None) -> float:
+        """
+        Calculate task urgency (0.0 to 1.0)
+        
+        now is the naive UTC reference time; defaults to the current time.
+        """
+        if now is None:
+            now = datetime.utcnow()
         
-        days_until_deadline = (deadline - now).days
+        days_until_deadline = (self.deadline - now).days
         
         if days_until_deadline <= 0:
             return 1.0
@@ -72,10 +87,4 @@ class Task(BaseModel):
     
     def priority_weight(self) -> float:
         """Return numeric weight for priority"""
-        weights = {
-            Priority.LOW: 0.3,
-            Priority.MEDIUM: 0.6,
-            Priority.HIGH: 0.85,
-            Priority.CRITICAL: 1.0
-        }
-        return weights[self.priority]
\ No newline at end of file
+        return PRIORITY_WEIGHTS[self.priority]
\ No newline at end of file
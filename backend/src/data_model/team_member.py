@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Dict, List
+from typing import Dict, List, Optional
 from datetime import datetime
 
 class Skill(BaseModel):
@@ -27,8 +27,8 @@ class TeamMember(BaseModel):
     # Metadata
     availability: bool = True
     on_leave: bool = False
-    leave_start: datetime = None
-    leave_end: datetime = None
+    leave_start: Optional[datetime] = None
+    leave_end: Optional[datetime] = None
     
     def available_hours(self) -> float:
         """Calculate remaining available hours"""
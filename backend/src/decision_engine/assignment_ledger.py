@@ -0,0 +1,175 @@
+from typing import Any, Dict, Iterable, List, Optional
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from pathlib import Path
+import threading
+from src.data_model.assignment import Assignment
+from src.utils.logger import logger
+
+
+class AssignmentLedger:
+    """
+    Bounded, indexed record of assignments
+
+    History is kept in assignment order with indexes by id, sprint, task
+    and member, so "current assignments of a member", "history of a
+    task" and "assignments of a sprint" are dictionary lookups. An
+    assignment is current from when it is recorded until its task is
+    released (completed, carried over or reassigned).
+
+    Retention keeps at most max_entries assignments, none older than
+    max_age_days; the oldest are evicted first and appended to monthly
+    JSONL files in archive_dir (dropped when there is none). Current
+    assignments stay queryable after their history entry is evicted.
+
+    Args:
+        max_entries: History entries kept in memory
+        max_age_days: Evict history older than this (no age limit when None)
+        archive_dir: Directory for evicted assignments
+    """
+
+    def __init__(self, max_entries: int = 10_000, max_age_days: Optional[int] = None, archive_dir: Optional[str] = None):
+        self.max_entries = max_entries
+        self.max_age_days = max_age_days
+        self.archive_dir = Path(archive_dir) if archive_dir else None
+        self._history: "OrderedDict[str, Assignment]" = OrderedDict()
+        self._by_sprint: Dict[str, Dict[str, None]] = {}  # Ordered sets of assignment ids
+        self._by_task: Dict[str, Dict[str, None]] = {}
+        self._current_by_task: Dict[str, Assignment] = {}
+        self._current_by_member: Dict[str, Dict[str, Assignment]] = {}  # member -> task -> assignment
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._history)
+
+    def record(self, assignments: Iterable[Assignment], now: Optional[datetime] = None):
+        """Add assignments (already known ids are ignored, so replays are harmless)"""
+        with self._lock:
+            for assignment in assignments:
+                if assignment.id in self._history:
+                    continue
+                self._history[assignment.id] = assignment
+                if assignment.sprint_id is not None:
+                    self._by_sprint.setdefault(assignment.sprint_id, {})[assignment.id] = None
+                self._by_task.setdefault(assignment.task_id, {})[assignment.id] = None
+                self._release(assignment.task_id)
+                self._current_by_task[assignment.task_id] = assignment
+                self._current_by_member.setdefault(assignment.member_id, {})[assignment.task_id] = assignment
+            self._enforce_retention(now or datetime.utcnow())
+
+    def release(self, task_id: str):
+        """End the task's current assignment (no-op if it has none)"""
+        with self._lock:
+            self._release(task_id)
+
+    def get(self, assignment_id: str) -> Optional[Assignment]:
+        return self._history.get(assignment_id)
+
+    def current_for_member(self, member_id: str) -> List[Assignment]:
+        with self._lock:
+            return list(self._current_by_member.get(member_id, {}).values())
+
+    def current_for_task(self, task_id: str) -> Optional[Assignment]:
+        return self._current_by_task.get(task_id)
+
+    def for_sprint(self, sprint_id: str) -> List[Assignment]:
+        with self._lock:
+            return [self._history[i] for i in self._by_sprint.get(sprint_id, ())]
+
+    def task_history(self, task_id: str, include_archived: bool = False) -> List[Assignment]:
+        """
+        Every assignment of the task, oldest first
+
+        include_archived also reads evicted entries back from archive_dir
+        (a scan of the archive files, unlike the in-memory lookup).
+        """
+        with self._lock:
+            history = [self._history[i] for i in self._by_task.get(task_id, ())]
+        if include_archived:
+            archived = [a for a in self._read_archive() if a.task_id == task_id and a.id not in self._history]
+            history = sorted({a.id: a for a in archived}.values(), key=lambda a: a.assigned_at) + history
+        return history
+
+    def export(self) -> Dict[str, Any]:
+        """Plain-data image for snapshots"""
+        with self._lock:
+            history = list(self._history.values())
+            current = [a for a in self._current_by_task.values() if a.id not in self._history]
+            return {
+                "history": [a.model_dump(mode="json", exclude_none=True) for a in history],
+                "current": [a.model_dump(mode="json", exclude_none=True) for a in current],
+                "current_ids": [a.id for a in self._current_by_task.values()]
+            }
+
+    def restore(self, data: Dict[str, Any]):
+        """Replace the ledger with an export() image (nothing is archived)"""
+        history = [Assignment.model_validate(a) for a in data.get("history", [])]
+        evicted_current = {a["id"]: Assignment.model_validate(a) for a in data.get("current", [])}
+        current_ids = set(data.get("current_ids", []))
+        with self._lock:
+            self._history.clear()
+            self._by_sprint.clear()
+            self._by_task.clear()
+            self._current_by_task.clear()
+            self._current_by_member.clear()
+            for assignment in history:
+                self._history[assignment.id] = assignment
+                if assignment.sprint_id is not None:
+                    self._by_sprint.setdefault(assignment.sprint_id, {})[assignment.id] = None
+                self._by_task.setdefault(assignment.task_id, {})[assignment.id] = None
+            for assignment in list(evicted_current.values()) + history:
+                if assignment.id in current_ids:
+                    self._current_by_task[assignment.task_id] = assignment
+                    self._current_by_member.setdefault(assignment.member_id, {})[assignment.task_id] = assignment
+
+    def _release(self, task_id: str):
+        assignment = self._current_by_task.pop(task_id, None)
+        if assignment is not None:
+            member_tasks = self._current_by_member.get(assignment.member_id, {})
+            member_tasks.pop(task_id, None)
+            if not member_tasks:
+                self._current_by_member.pop(assignment.member_id, None)
+
+    def _enforce_retention(self, now: datetime):
+        cutoff = now - timedelta(days=self.max_age_days) if self.max_age_days is not None else None
+        evicted = []
+        while self._history:
+            oldest = next(iter(self._history.values()))
+            if len(self._history) <= self.max_entries and (cutoff is None or oldest.assigned_at >= cutoff):
+                break
+            self._history.popitem(last=False)
+            for index, key in ((self._by_sprint, oldest.sprint_id), (self._by_task, oldest.task_id)):
+                ids = index.get(key)
+                if ids is not None:
+                    ids.pop(oldest.id, None)
+                    if not ids:
+                        del index[key]
+            evicted.append(oldest)
+        if evicted:
+            self._archive(evicted)
+
+    def _archive(self, assignments: List[Assignment]):
+        if self.archive_dir is None:
+            return
+        try:
+            self.archive_dir.mkdir(parents=True, exist_ok=True)
+            by_month: Dict[str, List[str]] = {}
+            for assignment in assignments:
+                by_month.setdefault(f"{assignment.assigned_at:%Y-%m}", []).append(assignment.model_dump_json(exclude_none=True))
+            for month, lines in by_month.items():
+                with (self.archive_dir / f"assignments-{month}.jsonl").open("a") as archive:
+                    archive.write("\n".join(lines) + "\n")
+        except OSError as e:
+            logger.warning(f"Could not archive {len(assignments)} assignments: {e}")
+
+    def _read_archive(self) -> List[Assignment]:
+        if self.archive_dir is None or not self.archive_dir.is_dir():
+            return []
+        archived = []
+        for path in sorted(self.archive_dir.glob("assignments-*.jsonl")):
+            for line in path.read_text().splitlines():
+                try:
+                    archived.append(Assignment.model_validate_json(line))
+                except ValueError:
+                    continue  # Torn final line after a crash
+        return archived
@@ -0,0 +1,273 @@
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import threading
+import numpy as np
+from src.data_model.team_member import TeamMember
+from src.data_model.task import Task
+from src.feature_engine.skill_taxonomy import SkillTaxonomy, get_default_taxonomy, normalize_skill
+
+
+class CandidateIndex:
+    """
+    Approximate top-k member retrieval by skill match (inverted file index)
+
+    Each member is a vector over the skill vocabulary holding their best
+    coverage of every skill (proficiency x taxonomy similarity), and a
+    task is its required skills weighted 1/len(required), so the inner
+    product is exactly FeatureExtractor.skill_task_compatibility.
+    Members are clustered with spherical k-means into n_lists lists; a
+    query scans only the n_probe lists whose centroids match it best and
+    returns the top_k members found. Raising n_probe trades latency for
+    recall; n_probe >= n_lists is exact.
+
+    Members are added, updated and removed in place (assigned to their
+    nearest list); the lists are retrained once the index has doubled
+    or halved since the last training. Below min_members the index is
+    not used and callers score every member.
+
+    Args:
+        top_k: Candidates returned per task
+        n_lists: Number of clusters (default: about sqrt(members), at training)
+        n_probe: Clusters scanned per query
+        min_members: Smallest candidate pool for which retrieval is used
+        taxonomy: Skill taxonomy used to expand vectors (default: the scoring taxonomy)
+        seed: Seed for k-means initialization
+    """
+
+    def __init__(
+        self,
+        top_k: int = 50,
+        n_lists: Optional[int] = None,
+        n_probe: int = 8,
+        min_members: int = 2000,
+        taxonomy: Optional[SkillTaxonomy] = None,
+        seed: int = 0
+    ):
+        self.top_k = top_k
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.min_members = min_members
+        self._taxonomy = taxonomy
+        self._seed = seed
+        self._lock = threading.Lock()
+
+        self._ids: List[Optional[str]] = []
+        self._rows: Dict[str, int] = {}
+        self._alive = np.zeros(0, dtype=bool)
+        self._skills: List[List] = []  # Row -> [(skill name, proficiency)]
+        self._free: List[int] = []
+        self._columns: Dict[str, int] = {}  # Canonical skill key -> column
+        self._vectors = np.zeros((0, 0), dtype=np.float32)  # Rows and columns grow by doubling
+        self._fingerprint: Optional[str] = None
+        self._taxonomy_names: List[str] = []
+        self._expansions: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+
+        self._centroids: Optional[np.ndarray] = None
+        self._list_of = np.zeros(0, dtype=int)
+        self._lists: List[Set[int]] = []
+        self._trained_size = 0
+
+    @property
+    def taxonomy(self) -> SkillTaxonomy:
+        return self._taxonomy or get_default_taxonomy()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def upsert(self, member: TeamMember):
+        """Add a member or refresh their skills"""
+        skills = [(skill.name, skill.proficiency) for skill in member.skills]
+        with self._lock:
+            self._sync_taxonomy()
+            row = self._rows.get(member.id)
+            if row is None:
+                row = self._free.pop() if self._free else self._allocate_row()
+                self._rows[member.id] = row
+                self._ids[row] = member.id
+                self._alive[row] = True
+            self._skills[row] = skills
+            self._vectors[row] = self._vectorize(skills)
+            if self._centroids is not None:
+                self._assign(row)
+
+    def remove(self, member_id: str):
+        with self._lock:
+            row = self._rows.pop(member_id, None)
+            if row is None:
+                return
+            self._unassign(row)
+            self._ids[row] = None
+            self._alive[row] = False
+            self._skills[row] = []
+            self._vectors[row] = 0.0
+            self._free.append(row)
+
+    def allowed_rows(self, member_ids: Iterable[str]) -> np.ndarray:
+        """Boolean row mask of the given members (computed once per planning run)"""
+        mask = np.zeros(len(self._ids), dtype=bool)
+        rows = [self._rows[i] for i in member_ids if i in self._rows]
+        mask[rows] = True
+        return mask
+
+    def search(self, task: Task, allowed: Optional[np.ndarray] = None) -> Optional[List[str]]:
+        """
+        Ids of up to top_k members with the best skill match, best first
+
+        Returns None when retrieval does not apply (the task has no
+        required skills, or fewer than min_members are eligible); the
+        caller should then consider every member.
+        """
+        if not task.required_skills:
+            return None
+        with self._lock:
+            eligible = len(self._rows) if allowed is None else int(allowed.sum())
+            if eligible < self.min_members:
+                return None
+            self._sync_taxonomy()
+            self._maybe_train()
+            query = self._query(task)
+            probe = np.argsort(-(self._centroids @ query))[:self.n_probe]
+            rows = np.fromiter((row for lst in probe for row in self._lists[lst]), dtype=int)
+            return self._top(rows, query, allowed, self.top_k)
+
+    def exact_search(self, task: Task, k: Optional[int] = None, allowed: Optional[np.ndarray] = None) -> List[str]:
+        """Exact top-k by scanning every member (the recall baseline)"""
+        with self._lock:
+            self._sync_taxonomy()
+            query = self._query(task)
+            return self._top(np.flatnonzero(self._alive), query, allowed, k or self.top_k)
+
+    def train(self):
+        """Recluster every member (normally done automatically)"""
+        with self._lock:
+            self._train()
+
+    def _top(self, rows: np.ndarray, query: np.ndarray, allowed: Optional[np.ndarray], k: int) -> List[str]:
+        if allowed is not None and rows.size:
+            rows = rows[allowed[rows]]
+        if not rows.size:
+            return []
+        scores = self._vectors[rows] @ query
+        if rows.size > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+            rows, scores = rows[top], scores[top]
+        order = np.argsort(-scores, kind="stable")
+        return [self._ids[row] for row in rows[order]]
+
+    def _query(self, task: Task) -> np.ndarray:
+        query = np.zeros(self._vectors.shape[1], dtype=np.float32)
+        for skill in task.required_skills:
+            column = self._columns.get(self._column_key(skill))
+            if column is not None:  # Skills no member holds or relates to add nothing
+                query[column] += 1.0 / len(task.required_skills)
+        return query
+
+    def _allocate_row(self) -> int:
+        row = len(self._ids)
+        self._ids.append(None)
+        self._skills.append([])
+        if row >= self._vectors.shape[0]:
+            grown = max(16, 2 * self._vectors.shape[0]) - self._vectors.shape[0]
+            self._vectors = np.pad(self._vectors, ((0, grown), (0, 0)))
+            self._alive = np.pad(self._alive, (0, grown))
+            self._list_of = np.pad(self._list_of, (0, grown), constant_values=-1)
+        return row
+
+    def _column(self, key: str) -> int:
+        """Column of a canonical skill key, widening the matrix when it is new"""
+        column = self._columns.get(key)
+        if column is None:
+            column = self._columns[key] = len(self._columns)
+            if column >= self._vectors.shape[1]:
+                grown = max(64, 2 * self._vectors.shape[1]) - self._vectors.shape[1]
+                self._vectors = np.pad(self._vectors, ((0, 0), (0, grown)))
+                if self._centroids is not None:
+                    self._centroids = np.pad(self._centroids, ((0, 0), (0, grown)))
+        return column
+
+    def _column_key(self, name: str) -> str:
+        """Aliases share their skill's column; skills outside the taxonomy key by name"""
+        position = self.taxonomy.index_of(name)
+        if position is not None and position < len(self._taxonomy_names):
+            return normalize_skill(self._taxonomy_names[position])
+        return normalize_skill(name)
+
+    def _expansion(self, name: str) -> Tuple[np.ndarray, np.ndarray]:
+        """(columns, similarities) a skill covers: itself and its taxonomy neighbours"""
+        key = self._column_key(name)
+        cached = self._expansions.get(key)
+        if cached is None:
+            columns, values = [self._column(key)], [1.0]
+            if self.taxonomy.index_of(key) is not None:
+                row = self.taxonomy.similarity([key], self._taxonomy_names)[0]
+                for position in np.flatnonzero(row):
+                    columns.append(self._column(normalize_skill(self._taxonomy_names[position])))
+                    values.append(float(row[position]))
+            cached = self._expansions[key] = (np.array(columns), np.array(values, dtype=np.float32))
+        return cached
+
+    def _vectorize(self, skills: List) -> np.ndarray:
+        expansions = [(self._expansion(name), proficiency) for name, proficiency in skills]
+        vector = np.zeros(self._vectors.shape[1], dtype=np.float32)
+        for (columns, values), proficiency in expansions:
+            np.maximum.at(vector, columns, proficiency * values)
+        return vector
+
+    def _sync_taxonomy(self):
+        """Re-expand every vector when the taxonomy changed since they were built"""
+        taxonomy = self.taxonomy
+        if taxonomy.fingerprint == self._fingerprint:
+            return
+        self._fingerprint = taxonomy.fingerprint
+        self._taxonomy_names = taxonomy.skills
+        self._expansions.clear()
+        for row, skills in enumerate(self._skills):
+            if self._ids[row] is not None:
+                self._vectors[row] = self._vectorize(skills)
+        if self._centroids is not None:
+            self._train()
+
+    def _maybe_train(self):
+        size = len(self._rows)
+        if self._centroids is None or size >= 2 * self._trained_size or 2 * size < self._trained_size:
+            self._train()
+
+    def _train(self):
+        rows = np.flatnonzero(self._alive)
+        self._trained_size = rows.size
+        self._list_of[:] = -1
+        if not rows.size:
+            self._centroids, self._lists = None, []
+            return
+        data = _normalized(self._vectors[rows])
+        n_lists = min(self.n_lists or max(int(np.sqrt(rows.size)), 1), rows.size)
+        rng = np.random.default_rng(self._seed)
+        centroids = data[rng.choice(rows.size, n_lists, replace=False)]
+        for _ in range(10):
+            labels = np.argmax(data @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, data)
+            empty = ~sums.any(axis=1)
+            sums[empty] = centroids[empty]  # Keep empty clusters where they were
+            centroids = _normalized(sums)
+        self._centroids = centroids
+        self._lists = [set() for _ in range(n_lists)]
+        for row, label in zip(rows, np.argmax(data @ centroids.T, axis=1)):
+            self._list_of[row] = label
+            self._lists[label].add(int(row))
+
+    def _assign(self, row: int):
+        self._unassign(row)
+        label = int(np.argmax(self._centroids @ _normalized(self._vectors[row])))
+        self._list_of[row] = label
+        self._lists[label].add(row)
+
+    def _unassign(self, row: int):
+        label = self._list_of[row] if row < self._list_of.size else -1
+        if label >= 0:
+            self._lists[label].discard(row)
+            self._list_of[row] = -1
+
+
+def _normalized(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms > 0, norms, 1.0)
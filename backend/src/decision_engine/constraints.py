@@ -0,0 +1,239 @@
+from typing import Annotated, Dict, List, Literal, Optional, Sequence, Union
+import numpy as np
+from pydantic import BaseModel, Field
+from src.data_model.task import Task
+from src.feature_engine.skill_taxonomy import normalize_skill
+
+
+class PinConstraint(BaseModel):
+    """Task must go to this member (skill threshold waived)"""
+    type: Literal["pin"] = "pin"
+    task_id: str
+    member_id: str
+
+
+class ExcludeConstraint(BaseModel):
+    """Task must not go to any of these members"""
+    type: Literal["exclude"] = "exclude"
+    task_id: str
+    member_ids: List[str] = Field(min_length=1)
+
+
+class SameAssigneeConstraint(BaseModel):
+    """All of these tasks go to one member (whoever takes the first one)"""
+    type: Literal["same_assignee"] = "same_assignee"
+    task_ids: List[str] = Field(min_length=2)
+
+
+class MaxTasksConstraint(BaseModel):
+    """At most max_tasks tasks for the member (every member when member_id is None)"""
+    type: Literal["max_tasks"] = "max_tasks"
+    member_id: Optional[str] = None
+    max_tasks: int = Field(ge=0)
+
+
+class SkillCapacityConstraint(BaseModel):
+    """
+    At most max_hours of work requiring a skill, for one member or
+    (member_id None) the whole team
+    """
+    type: Literal["skill_capacity"] = "skill_capacity"
+    skill: str
+    max_hours: float = Field(ge=0.0)
+    member_id: Optional[str] = None
+
+
+Constraint = Annotated[
+    Union[PinConstraint, ExcludeConstraint, SameAssigneeConstraint, MaxTasksConstraint, SkillCapacityConstraint],
+    Field(discriminator="type")
+]
+
+
+def validate_constraints(constraints: Sequence[Constraint], member_ids: Sequence[str]):
+    """
+    Check constraints against the planning team
+
+    Raises:
+        ValueError: if a constraint names a member outside the team
+    """
+    known = set(member_ids)
+    for constraint in constraints:
+        referenced = set(getattr(constraint, "member_ids", []))
+        if getattr(constraint, "member_id", None) is not None:
+            referenced.add(constraint.member_id)
+        unknown = referenced - known
+        if unknown:
+            raise ValueError(f"{constraint.type} constraint references members outside the team: {sorted(unknown)}")
+
+
+class CompiledConstraints:
+    """
+    Constraints of one planning run as arrays over (tasks, members)
+
+    eligibility and pinned are boolean (tasks, members) masks. Same-
+    assignee groups are a group id per task (-1 = none). Count and hours
+    caps become resources: applies (resources, tasks) marks the tasks a
+    cap counts, scope (resources, members) the members it covers,
+    per_hours whether it counts hours or tasks, and limits the caps.
+    Instances are read-only; assignment state lives in a ConstraintTracker,
+    so one compilation can back concurrent runs.
+    """
+
+    def __init__(
+        self,
+        eligibility: np.ndarray,
+        pinned: np.ndarray,
+        group: np.ndarray,
+        applies: np.ndarray,
+        scope: np.ndarray,
+        per_hours: np.ndarray,
+        limits: np.ndarray
+    ):
+        self.eligibility = eligibility
+        self.pinned = pinned
+        self.group = group
+        self.applies = applies
+        self.scope = scope
+        self.per_hours = per_hours
+        self.limits = limits
+
+    def tracker(self) -> "ConstraintTracker":
+        return ConstraintTracker(self)
+
+
+class ConstraintTracker:
+    """Per-run state of compiled constraints: group assignees and capacity used"""
+
+    def __init__(self, compiled: CompiledConstraints):
+        self.compiled = compiled
+        self.group_member = np.full(int(compiled.group.max(initial=-1)) + 1, -1, dtype=int)
+        self.used = np.zeros(len(compiled.limits))
+
+    def allowed(self, task_index: int, hours) -> np.ndarray:
+        """
+        Members that may take the task given what is already assigned
+
+        hours is the task's hours, a scalar or one value per member.
+        """
+        compiled = self.compiled
+        allowed = compiled.eligibility[task_index].copy()
+        group = compiled.group[task_index]
+        if group >= 0 and self.group_member[group] >= 0:
+            allowed &= np.arange(allowed.size) == self.group_member[group]
+
+        capped = compiled.applies[:, task_index]
+        if capped.any():
+            need = np.where(compiled.per_hours[capped, None], np.broadcast_to(hours, allowed.shape), 1.0)
+            over = compiled.scope[capped] & (self.used[capped, None] + need > compiled.limits[capped, None] + 1e-9)
+            allowed &= ~over.any(axis=0)
+        return allowed
+
+    def fixed_member(self, task_index: int) -> Optional[int]:
+        """Member the task is pinned or grouped to, if already decided"""
+        pinned = np.flatnonzero(self.compiled.pinned[task_index])
+        if pinned.size:
+            return int(pinned[0])
+        group = self.compiled.group[task_index]
+        if group >= 0 and self.group_member[group] >= 0:
+            return int(self.group_member[group])
+        return None
+
+    def commit(self, task_index: int, member_index: int, hours: float):
+        compiled = self.compiled
+        group = compiled.group[task_index]
+        if group >= 0 and self.group_member[group] < 0:
+            self.group_member[group] = member_index
+        counted = compiled.applies[:, task_index] & compiled.scope[:, member_index]
+        self.used[counted] += np.where(compiled.per_hours[counted], hours, 1.0)
+
+
+def compile_constraints(
+    constraints: Sequence[Constraint],
+    tasks: Sequence[Task],
+    member_ids: Sequence[str]
+) -> CompiledConstraints:
+    """
+    Compile constraints against one run's tasks and members (in their order)
+
+    Constraints on tasks outside the run are ignored. A pin inside a
+    same-assignee group pins the whole group.
+
+    Args:
+        constraints: Constraints to compile
+        tasks: Tasks of the run, indexed as the planner indexes them
+        member_ids: Member ids, indexed as the planner indexes them
+
+    Raises:
+        ValueError: if a constraint names an unknown member or pins conflict
+    """
+    validate_constraints(constraints, member_ids)
+    num_tasks, num_members = len(tasks), len(member_ids)
+    task_position = {task.id: i for i, task in enumerate(tasks)}
+    member_position = {member_id: j for j, member_id in enumerate(member_ids)}
+
+    eligibility = np.ones((num_tasks, num_members), dtype=bool)
+    pinned = np.zeros((num_tasks, num_members), dtype=bool)
+    group = np.full(num_tasks, -1, dtype=int)
+    pins: Dict[int, int] = {}
+    resources = []  # (applies, scope, per_hours, limit)
+
+    for constraint in constraints:
+        if isinstance(constraint, PinConstraint):
+            t = task_position.get(constraint.task_id)
+            if t is None:
+                continue
+            member = member_position[constraint.member_id]
+            if pins.setdefault(t, member) != member:
+                raise ValueError(f"Task '{constraint.task_id}' is pinned to more than one member")
+        elif isinstance(constraint, ExcludeConstraint):
+            t = task_position.get(constraint.task_id)
+            if t is not None:
+                eligibility[t, [member_position[m] for m in constraint.member_ids]] = False
+        elif isinstance(constraint, SameAssigneeConstraint):
+            positions = [task_position[i] for i in constraint.task_ids if i in task_position]
+            if len(positions) < 2:
+                continue
+            # Overlapping groups merge into one
+            merged = set(group[positions][group[positions] >= 0].tolist())
+            new_group = min(merged) if merged else int(group.max(initial=-1)) + 1
+            group[np.isin(group, list(merged))] = new_group
+            group[positions] = new_group
+        elif isinstance(constraint, MaxTasksConstraint):
+            targets = [constraint.member_id] if constraint.member_id else list(member_ids)
+            for member_id in targets:
+                scope = np.zeros(num_members, dtype=bool)
+                scope[member_position[member_id]] = True
+                resources.append((np.ones(num_tasks, dtype=bool), scope, False, float(constraint.max_tasks)))
+        elif isinstance(constraint, SkillCapacityConstraint):
+            skill = normalize_skill(constraint.skill)
+            applies = np.array([skill in {normalize_skill(s) for s in task.required_skills} for task in tasks], dtype=bool)
+            scope = np.zeros(num_members, dtype=bool)
+            if constraint.member_id:
+                scope[member_position[constraint.member_id]] = True
+            else:
+                scope[:] = True
+            resources.append((applies, scope, True, constraint.max_hours))
+
+    # Pins extend to every task sharing the pinned task's group
+    for t, member in list(pins.items()):
+        if group[t] >= 0:
+            for other in np.flatnonzero(group == group[t]):
+                if pins.setdefault(int(other), member) != member:
+                    raise ValueError(f"Task '{tasks[other].id}' is pinned to more than one member")
+    for t, member in pins.items():
+        only = np.zeros(num_members, dtype=bool)
+        only[member] = True
+        eligibility[t] &= only
+        pinned[t] = only
+
+    if resources:
+        applies = np.array([r[0] for r in resources], dtype=bool)
+        scope = np.array([r[1] for r in resources], dtype=bool)
+        per_hours = np.array([r[2] for r in resources], dtype=bool)
+        limits = np.array([r[3] for r in resources], dtype=float)
+    else:
+        applies = np.zeros((0, num_tasks), dtype=bool)
+        scope = np.zeros((0, num_members), dtype=bool)
+        per_hours = np.zeros(0, dtype=bool)
+        limits = np.zeros(0)
+    return CompiledConstraints(eligibility, pinned, group, applies, scope, per_hours, limits)
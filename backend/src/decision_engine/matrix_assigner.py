@@ -0,0 +1,174 @@
+from typing import List, Dict, Optional
+import numpy as np
+from src.data_model.team_member import TeamMember
+from src.data_model.task import Task
+from src.feature_engine.feature_extractor import FeatureExtractor
+from src.feature_engine.planning_context import PlanningContext
+from src.feature_engine.scoring_weights import ScoringWeights
+from src.decision_engine.constraints import CompiledConstraints
+
+# Same hard constraints as TaskAssigner._find_best_candidate
+MIN_SKILL_SCORE = 0.3
+
+
+class PlanningMatrices:
+    """
+    Dense task x member arrays for one planning snapshot
+
+    Holds everything the greedy assignment needs as NumPy arrays so the
+    same snapshot can be re-planned many times (e.g. for what-if
+    scenarios) without touching or copying the pydantic models.
+    """
+
+    def __init__(
+        self,
+        tasks: List[Task],
+        team_members: List[TeamMember],
+        context: Optional[PlanningContext] = None
+    ):
+        if context is None:
+            context = PlanningContext(tasks)
+        self.tasks = tasks
+        self.task_ids = [task.id for task in tasks]
+        self.hours = np.array([task.estimated_hours for task in tasks], dtype=float)
+        self.urgency = np.array([context.urgency_factor(task) for task in tasks], dtype=float)
+        self.skill = FeatureExtractor.skill_compatibility_matrix(tasks, team_members)
+        self._set_members(team_members)
+
+    def _set_members(self, team_members: List[TeamMember]):
+        self.team_members = team_members
+        self.member_ids = [member.id for member in team_members]
+        self.capacity = np.array([m.total_hours_available for m in team_members], dtype=float)
+        self.workload = np.array([m.current_workload for m in team_members], dtype=float)
+        self.max_utilization = np.array([m.max_workload_percent for m in team_members], dtype=float)
+        self.reliability = np.array([m.reliability_score for m in team_members], dtype=float)
+        self.available = np.array([m.availability and not m.on_leave for m in team_members], dtype=bool)
+        self._static_scores = {}
+
+    def static_scores(self, weights: ScoringWeights):
+        """
+        Workload-independent part of the composite score and the skill
+        threshold mask, computed once per weight set
+        """
+        key = (weights.weight_skill, weights.weight_reliability, weights.weight_urgency)
+        cached = self._static_scores.get(key)
+        if cached is None:
+            scores = (
+                weights.weight_skill * self.skill
+                + weights.weight_reliability * self.reliability
+                + weights.weight_urgency * self.urgency[:, None]
+            )
+            cached = (scores, self.skill >= MIN_SKILL_SCORE)
+            self._static_scores[key] = cached
+        return cached
+
+    def with_members(self, extra_members: List[TeamMember]) -> "PlanningMatrices":
+        """
+        Copy of the snapshot with additional members
+
+        Only the new members' skill columns are computed.
+        """
+        extended = object.__new__(PlanningMatrices)
+        extended.tasks = self.tasks
+        extended.task_ids = self.task_ids
+        extended.hours = self.hours
+        extended.urgency = self.urgency
+        extended.skill = np.hstack([
+            self.skill,
+            FeatureExtractor.skill_compatibility_matrix(self.tasks, extra_members).reshape(len(self.tasks), -1)
+        ])
+        extended._set_members(self.team_members + extra_members)
+        return extended
+
+
+def urgency_order(matrices: PlanningMatrices) -> np.ndarray:
+    """Task indices by descending urgency, ties kept in input order (like sorted())"""
+    return np.argsort(-matrices.urgency, kind="stable")
+
+
+def select_within_capacity(
+    matrices: PlanningMatrices,
+    candidate_mask: np.ndarray,
+    capacity: float,
+    target_utilization: float = 0.85
+) -> np.ndarray:
+    """Greedy urgency-ordered selection, mirroring SprintOptimizer._select_tasks_for_sprint"""
+    selected = np.zeros(len(matrices.task_ids), dtype=bool)
+    budget = capacity * target_utilization
+    total = 0.0
+    for index in urgency_order(matrices):
+        if not candidate_mask[index]:
+            continue
+        hours = matrices.hours[index]
+        if total + hours <= budget:
+            selected[index] = True
+            total += hours
+    return selected
+
+
+def greedy_assign(
+    matrices: PlanningMatrices,
+    task_mask: np.ndarray,
+    weights: ScoringWeights,
+    member_mask: Optional[np.ndarray] = None,
+    capacity: Optional[np.ndarray] = None,
+    eligibility: Optional[np.ndarray] = None,
+    constraints: Optional[CompiledConstraints] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Vectorized equivalent of TaskAssigner.assign_tasks on a snapshot
+
+    Each task (most urgent first) is scored against all members with one
+    array expression; nothing in the snapshot is mutated.
+
+    Args:
+        matrices: Planning snapshot
+        task_mask: Tasks to assign
+        weights: Composite-score weights
+        member_mask: Members that may receive tasks (default: all)
+        capacity: Per-member hours overriding the snapshot's capacity
+        eligibility: Optional boolean (tasks, members) mask of allowed pairs
+        constraints: Planning constraints compiled against matrices.tasks
+            and matrices.member_ids
+
+    Returns:
+        {"member": member index per task (-1 = unassigned),
+         "score": composite score per task, "workload": final workloads}
+    """
+    num_tasks = len(matrices.task_ids)
+    capacity = matrices.capacity if capacity is None else capacity
+    workload = matrices.workload.copy()
+    allowed = matrices.available & (capacity > 0)
+    if member_mask is not None:
+        allowed = allowed & member_mask
+    safe_capacity = np.where(capacity > 0, capacity, 1.0)
+    static_scores, skill_ok = matrices.static_scores(weights)
+
+    member = np.full(num_tasks, -1, dtype=int)
+    score = np.zeros(num_tasks)
+    tracker = constraints.tracker() if constraints is not None else None
+
+    for t in urgency_order(matrices):
+        if not task_mask[t]:
+            continue
+        hours = matrices.hours[t]
+        skill_allowed = skill_ok[t] if tracker is None else skill_ok[t] | constraints.pinned[t]
+        ok = allowed & skill_allowed & ((workload + hours) / safe_capacity <= matrices.max_utilization)
+        if eligibility is not None:
+            ok &= eligibility[t]
+        if tracker is not None:
+            ok &= tracker.allowed(t, hours)
+        if not ok.any():
+            continue
+
+        workload_penalty = 1.0 - np.minimum(workload / safe_capacity, 1.0)
+        scores = np.clip(static_scores[t] + weights.weight_workload * workload_penalty, 0.0, 1.0)
+        scores[~ok] = -np.inf
+        best = int(np.argmax(scores))
+        member[t] = best
+        score[t] = scores[best]
+        workload[best] += hours
+        if tracker is not None:
+            tracker.commit(t, best, hours)
+
+    return {"member": member, "score": score, "workload": workload}
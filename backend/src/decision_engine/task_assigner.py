@@ -1,94 +1,220 @@
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Tuple, Optional, Sequence, Callable
+import numpy as np
 from src.data_model.team_member import TeamMember
 from src.data_model.task import Task
 from src.data_model.assignment import Assignment
-from src.feature_engine.feature_extractor import FeatureExtractor
+from src.feature_engine.feature_extractor import FeatureExtractor, SkillCoverage
+from src.feature_engine.scoring_weights import WeightRegistry
+from src.feature_engine.planning_context import PlanningContext
+from src.decision_engine.constraints import Constraint, ConstraintTracker, compile_constraints
+from src.decision_engine.candidate_index import CandidateIndex
+from src.decision_engine.assignment_ledger import AssignmentLedger
 from datetime import datetime
 import uuid
 
 class TaskAssigner:
     """Decision engine for intelligent task assignment"""
     
-    def __init__(self):
+    def __init__(
+        self,
+        estimate_model=None,
+        weight_registry: Optional[WeightRegistry] = None,
+        ledger: Optional[AssignmentLedger] = None
+    ):
+        """
+        Args:
+            estimate_model: Optional EstimateCorrectionModel; when set, capacity
+                checks and workloads use corrected rather than raw hours
+            weight_registry: Source of the active scoring weights; defaults to
+                the built-in 0.4/0.3/0.2/0.1 weights
+            ledger: Where assignments are recorded unless a run passes its
+                own; defaults to a bounded in-memory ledger
+        """
         self.feature_extractor = FeatureExtractor()
-        self.assignments: List[Assignment] = []
+        self.estimate_model = estimate_model
+        self.weight_registry = weight_registry or WeightRegistry()
+        self.ledger = ledger if ledger is not None else AssignmentLedger()
     
     def assign_tasks(
         self,
         tasks: List[Task],
         team_members: List[TeamMember],
-        constraints: Dict = None
+        constraints: Optional[List[Constraint]] = None,
+        weight_profile: Optional[str] = None,
+        context: Optional[PlanningContext] = None,
+        sprint_id: Optional[str] = None,
+        progress: Optional[Callable[[int, int], None]] = None,
+        candidate_index: Optional[CandidateIndex] = None,
+        ledger: Optional[AssignmentLedger] = None
     ) -> List[Assignment]:
         """
         Main assignment algorithm
         Assigns tasks to optimal team members respecting constraints
+        
+        constraints (pins, exclusions, same-assignee groups, task-count
+        and skill-hour caps) are compiled once into masks for the run.
+        weight_profile selects a team-specific scoring weight set and
+        context supplies the run's reference time (defaults to now).
+        Assignments are tagged with sprint_id when given. progress, if
+        given, is called with (tasks processed, total) about every 5%.
+        With a candidate_index covering the team, each task is scored
+        exactly against the index's top-k skill matches only.
+        Assignments are recorded in ledger (default: self.ledger).
         """
-        if constraints is None:
-            constraints = {}
+        if context is None:
+            context = PlanningContext(tasks)
+        
+        # Resolve the active weights once for the whole run
+        weights = self.weight_registry.get(weight_profile)
+        weight_kwargs = weights.as_kwargs()
         
         # Sort tasks by urgency (high-priority tasks first)
         sorted_tasks = sorted(
             tasks,
-            key=lambda t: self.feature_extractor.task_urgency_factor(t),
+            key=lambda t: self.feature_extractor.task_urgency_factor(t, context),
             reverse=True
         )
         
+        # Corrected hours for every task-member pair, predicted in one batch
+        hours_matrix = None
+        if self.estimate_model is not None:
+            hours_matrix = self.estimate_model.predict_matrix(sorted_tasks, team_members)
+        
+        tracker = None
+        if constraints:
+            tracker = compile_constraints(constraints, sorted_tasks, [m.id for m in team_members]).tracker()
+        
+        # Members' skill coverage, normalized and looked up once for the run
+        skill_coverage = SkillCoverage(sorted_tasks, team_members)
+        
+        member_positions = {member.id: position for position, member in enumerate(team_members)}
+        allowed_rows = candidate_index.allowed_rows(member_positions) if candidate_index is not None else None
+        
         assignments = []
+        progress_step = max(len(sorted_tasks) // 20, 1)
         
-        for task in sorted_tasks:
+        for index, task in enumerate(sorted_tasks):
+            if progress is not None and index % progress_step == 0:
+                progress(index, len(sorted_tasks))
             if task.is_assigned():
                 continue
             
+            member_hours = hours_matrix[index] if hours_matrix is not None else None
+            
+            # Narrow very large teams to the best skill matches first
+            positions = None
+            fixed = tracker.fixed_member(index) if tracker is not None else None
+            if fixed is not None:
+                positions = [fixed]
+            elif candidate_index is not None:
+                candidate_ids = candidate_index.search(task, allowed_rows)
+                if candidate_ids is not None:
+                    positions = sorted(member_positions[member_id] for member_id in candidate_ids)
+            
             # Find best candidate for this task
             best_assignment = self._find_best_candidate(
                 task,
                 team_members,
-                constraints
+                member_hours,
+                weight_kwargs,
+                context,
+                tracker,
+                index,
+                positions,
+                skill_coverage
             )
             
             if best_assignment:
+                best_assignment.reasoning["weights_version"] = weights.version
+                best_assignment.sprint_id = sprint_id
                 assignments.append(best_assignment)
                 # Update member workload
-                member = next(m for m in team_members if m.id == best_assignment.member_id)
-                member.current_workload += task.estimated_hours
+                position = member_positions[best_assignment.member_id]
+                team_members[position].current_workload += best_assignment.planned_hours
                 task.assigned_to = best_assignment.member_id
+                if tracker is not None:
+                    tracker.commit(index, position, best_assignment.planned_hours)
         
-        self.assignments.extend(assignments)
+        if progress is not None:
+            progress(len(sorted_tasks), len(sorted_tasks))
+        (ledger if ledger is not None else self.ledger).record(assignments)
         return assignments
     
     def _find_best_candidate(
         self,
         task: Task,
         team_members: List[TeamMember],
-        constraints: Dict
+        member_hours: Optional[Sequence[float]] = None,
+        weight_kwargs: Optional[Dict[str, float]] = None,
+        context: Optional[PlanningContext] = None,
+        tracker: Optional[ConstraintTracker] = None,
+        task_index: int = 0,
+        positions: Optional[Sequence[int]] = None,
+        skill_coverage: Optional[SkillCoverage] = None
     ) -> Optional[Assignment]:
         """
         Finds the best team member for a task
+        
+        member_hours optionally gives the expected hours of the task for
+        each member (same order as team_members); defaults to the raw estimate.
+        weight_kwargs overrides the default composite-score weights.
+        tracker holds the run's compiled constraints, task_index the
+        task's row in them. positions limits the search to those members.
+        skill_coverage, built for the run's tasks in the same order as
+        tracker's, supplies the skill scores (task_index is its row).
         """
+        if weight_kwargs is None:
+            weight_kwargs = {}
+        if context is None:
+            context = PlanningContext([task])
+        
+        # Planning constraints as one mask over the team
+        allowed = pinned = None
+        if tracker is not None:
+            hours = task.estimated_hours if member_hours is None else np.asarray(member_hours, dtype=float)
+            allowed = tracker.allowed(task_index, hours)
+            pinned = tracker.compiled.pinned[task_index]
+        
         candidates = []
         
-        for member in team_members:
+        search = range(len(team_members)) if positions is None else positions
+        skill_scores = None
+        if skill_coverage is not None:
+            skill_scores = skill_coverage.scores(task_index, None if positions is None else positions)
+        
+        for k, position in enumerate(search):
+            member = team_members[position]
             # Hard constraints
             if not member.availability or member.on_leave:
                 continue
+            if allowed is not None and not allowed[position]:
+                continue
+            
+            hours = float(member_hours[position]) if member_hours is not None else task.estimated_hours
             
             # Check workload capacity
-            new_utilization = (member.current_workload + task.estimated_hours) / member.total_hours_available
+            new_utilization = (member.current_workload + hours) / member.total_hours_available
             if new_utilization > member.max_workload_percent:
                 continue
             
             # Check skill requirements
-            skill_score = self.feature_extractor.skill_task_compatibility(member, task)
-            if skill_score < 0.3:  # Minimum skill threshold
+            if skill_scores is not None:
+                skill_score = float(skill_scores[k])
+            else:
+                skill_score = self.feature_extractor.skill_task_compatibility(member, task)
+            if skill_score < 0.3 and not (pinned is not None and pinned[position]):  # Minimum skill threshold
                 continue
             
             # Calculate composite score
-            score = self.feature_extractor.compute_assignment_score(member, task)
+            score = self.feature_extractor.compute_assignment_score(
+                member, task, context=context, skill_score=skill_score, **weight_kwargs
+            )
             
             candidates.append({
                 "member": member,
                 "score": score,
-                "skill_score": skill_score
+                "skill_score": skill_score,
+                "hours": hours
             })
         
         if not candidates:
@@ -97,21 +223,24 @@ class TaskAssigner:
         # Select best candidate
         best = max(candidates, key=lambda x: x["score"])
         
+        urgency = self.feature_extractor.task_urgency_factor(task, context)
+        
         # Create assignment object
         assignment = Assignment(
             id=str(uuid.uuid4()),
             task_id=task.id,
             member_id=best["member"].id,
             estimated_hours=task.estimated_hours,
+            planned_hours=best["hours"],
             skill_compatibility_score=best["skill_score"],
             workload_penalty=1.0 - self.feature_extractor.workload_utilization_ratio(best["member"]),
-            urgency_boost=self.feature_extractor.task_urgency_factor(task),
+            urgency_boost=urgency,
             final_score=best["score"],
             reasoning={
                 "skill_match": best["skill_score"],
                 "workload": best["member"].workload_utilization(),
                 "reliability": best["member"].reliability_score,
-                "urgency": self.feature_extractor.task_urgency_factor(task)
+                "urgency": urgency
             }
         )
         
@@ -1,35 +1,48 @@
 import math
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional, Sequence
+import numpy as np
 from src.data_model.team_member import TeamMember
 from src.data_model.task import Task
+from src.feature_engine.planning_context import PlanningContext, DEADLINE_WEIGHT, PRIORITY_WEIGHT
+from src.feature_engine.skill_taxonomy import SkillTaxonomy, get_default_taxonomy, normalize_skill
 
 class FeatureExtractor:
     """Extracts meaningful features from raw Agile data"""
     
     @staticmethod
-    def skill_task_compatibility(member: TeamMember, task: Task) -> float:
+    def skill_task_compatibility(member: TeamMember, task: Task, taxonomy: Optional[SkillTaxonomy] = None) -> float:
         """
         Calculate skill-task compatibility score (0.0 to 1.0)
         Higher = better match
+        
+        Each required skill is covered by the member's best matching skill
+        (proficiency x taxonomy similarity), so a FastAPI developer partly
+        covers a Python requirement. Names match case-insensitively.
         """
         if not task.required_skills:
             return 1.0
         
-        member_skill_map = {skill.name: skill.proficiency for skill in member.skills}
-        
-        compatibility_scores = []
-        for required_skill in task.required_skills:
-            if required_skill in member_skill_map:
-                compatibility_scores.append(member_skill_map[required_skill])
-            else:
-                compatibility_scores.append(0.0)
-        
-        if not compatibility_scores:
-            return 0.0
+        taxonomy = taxonomy or get_default_taxonomy()
+        held = [(skill.name, skill.proficiency) for skill in member.skills]
+        compatibility_scores = taxonomy.coverage(held, task.required_skills)
         
         # Average compatibility across all required skills
         return sum(compatibility_scores) / len(compatibility_scores)
     
+    @staticmethod
+    def skill_compatibility_matrix(
+        tasks: List[Task],
+        team_members: List[TeamMember],
+        taxonomy: Optional[SkillTaxonomy] = None
+    ) -> np.ndarray:
+        """
+        skill_task_compatibility for every task-member pair at once
+        
+        Returns:
+            Array of shape (len(tasks), len(team_members))
+        """
+        return SkillCoverage(tasks, team_members, taxonomy).matrix()
+    
     @staticmethod
     def workload_utilization_ratio(member: TeamMember) -> float:
         """
@@ -49,16 +62,22 @@ class FeatureExtractor:
         return member.reliability_score
     
     @staticmethod
-    def task_urgency_factor(task: Task) -> float:
+    def task_urgency_factor(task: Task, context: Optional[PlanningContext] = None) -> float:
         """
         Calculate task urgency (0.0 to 1.0)
         Combines deadline proximity and priority
+        
+        With a planning context, the precomputed value for the run's
+        reference time is returned instead of reading the clock.
         """
+        if context is not None:
+            return context.urgency_factor(task)
+        
         deadline_urgency = task.urgency_score()
         priority_weight = task.priority_weight()
         
         # Weighted average: 60% deadline, 40% priority
-        return 0.6 * deadline_urgency + 0.4 * priority_weight
+        return DEADLINE_WEIGHT * deadline_urgency + PRIORITY_WEIGHT * priority_weight
     
     @staticmethod
     def sprint_capacity_score(sprint, team_members: List[TeamMember]) -> Dict[str, float]:
@@ -81,7 +100,9 @@ class FeatureExtractor:
         weight_skill: float = 0.4,
         weight_workload: float = 0.3,
         weight_reliability: float = 0.2,
-        weight_urgency: float = 0.1
+        weight_urgency: float = 0.1,
+        context: Optional[PlanningContext] = None,
+        skill_score: Optional[float] = None
     ) -> float:
         """
         Compute composite assignment score using weighted features
@@ -90,15 +111,18 @@ class FeatureExtractor:
             member: Team member candidate
             task: Task to assign
             weight_*: Feature weights (must sum to 1.0)
+            context: Planning context supplying the run's urgency values
+            skill_score: Precomputed skill_task_compatibility (e.g. from SkillCoverage)
         
         Returns:
             Composite score (0.0 to 1.0)
         """
         # Extract features
-        skill_score = FeatureExtractor.skill_task_compatibility(member, task)
+        if skill_score is None:
+            skill_score = FeatureExtractor.skill_task_compatibility(member, task)
         workload_ratio = FeatureExtractor.workload_utilization_ratio(member)
         reliability = FeatureExtractor.performance_reliability_index(member)
-        urgency = FeatureExtractor.task_urgency_factor(task)
+        urgency = FeatureExtractor.task_urgency_factor(task, context)
         
         # Workload penalty (lower utilization is better)
         workload_penalty = 1.0 - min(workload_ratio, 1.0)
@@ -111,4 +135,62 @@ class FeatureExtractor:
             weight_urgency * urgency
         )
         
-        return max(0.0, min(composite_score, 1.0))
\ No newline at end of file
+        return max(0.0, min(composite_score, 1.0))
+
+
+class SkillCoverage:
+    """
+    Members' coverage of every skill a planning run requires
+
+    Skill names are normalized and looked up in the taxonomy once per
+    run (every held skill against every required skill), giving each
+    member's best proficiency x similarity per required skill. A task's
+    skill score for any set of members is then a slice of that matrix,
+    equal to FeatureExtractor.skill_task_compatibility.
+
+    Args:
+        tasks: Tasks of the run (scores are looked up by position)
+        team_members: Members of the run (scores are per position)
+        taxonomy: Skill taxonomy (default: the scoring taxonomy)
+    """
+
+    def __init__(self, tasks: List[Task], team_members: List[TeamMember], taxonomy: Optional[SkillTaxonomy] = None):
+        taxonomy = taxonomy or get_default_taxonomy()
+        vocabulary: Dict[str, int] = {}
+        self.task_columns = [
+            np.array([vocabulary.setdefault(normalize_skill(skill), len(vocabulary)) for skill in task.required_skills], dtype=int)
+            for task in tasks
+        ]
+        
+        held: Dict[str, int] = {}
+        for member in team_members:
+            for skill in member.skills:
+                held.setdefault(normalize_skill(skill.name), len(held))
+        # One similarity lookup for every held skill against every required skill
+        similarity = taxonomy.similarity(list(held), list(vocabulary))
+        
+        # Coverage of each required skill by the member's best matching skill
+        self.coverage = np.zeros((len(team_members), len(vocabulary)))
+        for j, member in enumerate(team_members):
+            if member.skills:
+                rows = [held[normalize_skill(skill.name)] for skill in member.skills]
+                proficiencies = np.array([skill.proficiency for skill in member.skills])
+                self.coverage[j] = (proficiencies[:, None] * similarity[rows]).max(axis=0)
+    
+    def scores(self, task_index: int, positions: Optional[Sequence[int]] = None) -> np.ndarray:
+        """Skill scores of a task for the members at positions (default: all)"""
+        columns = self.task_columns[task_index]
+        coverage = self.coverage if positions is None else self.coverage[list(positions)]
+        if not columns.size:
+            return np.ones(coverage.shape[0])
+        return coverage[:, columns].sum(axis=1) / columns.size
+    
+    def matrix(self) -> np.ndarray:
+        """Skill scores of every task (rows) for every member (columns)"""
+        requirements = np.zeros((len(self.task_columns), self.coverage.shape[1]))
+        for i, columns in enumerate(self.task_columns):
+            # Each required skill contributes 1/len(required)
+            np.add.at(requirements[i], columns, 1.0 / max(columns.size, 1))
+        matrix = requirements @ self.coverage.T
+        matrix[[not columns.size for columns in self.task_columns]] = 1.0
+        return matrix
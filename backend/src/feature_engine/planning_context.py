@@ -0,0 +1,69 @@
+from typing import List, Dict, Optional
+from datetime import datetime, timezone
+import numpy as np
+from src.data_model.task import Task, PRIORITY_WEIGHTS
+
+# Deadline urgency buckets: (max days until deadline, urgency)
+DEADLINE_BUCKETS = ((0, 1.0), (3, 0.9), (7, 0.7))
+DEFAULT_DEADLINE_URGENCY = 0.3
+
+# Weighted average of deadline urgency and priority in the urgency factor
+DEADLINE_WEIGHT = 0.6
+PRIORITY_WEIGHT = 0.4
+
+_MICROSECONDS_PER_DAY = 86_400_000_000
+
+
+class PlanningContext:
+    """
+    Per-run planning snapshot with a single reference time
+
+    Captures one "now" for the whole planning run and computes deadline
+    urgency and the combined urgency factor for every task at once, so
+    all tasks are scored against the same clock and a plan can be
+    reproduced for a given as-of time.
+    """
+
+    def __init__(self, tasks: List[Task], as_of: Optional[datetime] = None):
+        """
+        Args:
+            tasks: Tasks that will be scored during the run
+            as_of: Reference time (naive UTC or timezone-aware); defaults to now
+        """
+        if as_of is None:
+            as_of = datetime.utcnow()
+        elif as_of.tzinfo is not None:
+            as_of = as_of.astimezone(timezone.utc).replace(tzinfo=None)
+        self.as_of = as_of
+        self.deadline_urgency: Dict[str, float] = {}
+        self.urgency_factors: Dict[str, float] = {}
+        self.add_tasks(tasks)
+
+    def add_tasks(self, tasks: List[Task]):
+        """Compute urgency for additional tasks against the same reference time"""
+        if not tasks:
+            return
+        deadlines = np.array([task.deadline for task in tasks], dtype="datetime64[us]")
+        delta_us = (deadlines - np.datetime64(self.as_of, "us")).astype(np.int64)
+        # Floor division matches timedelta.days for negative deltas
+        days = np.floor_divide(delta_us, _MICROSECONDS_PER_DAY)
+
+        deadline_urgency = np.select(
+            [days <= limit for limit, _ in DEADLINE_BUCKETS],
+            [urgency for _, urgency in DEADLINE_BUCKETS],
+            default=DEFAULT_DEADLINE_URGENCY
+        )
+        priority = np.array([PRIORITY_WEIGHTS[task.priority] for task in tasks])
+        factors = DEADLINE_WEIGHT * deadline_urgency + PRIORITY_WEIGHT * priority
+
+        for task, urgency, factor in zip(tasks, deadline_urgency.tolist(), factors.tolist()):
+            self.deadline_urgency[task.id] = urgency
+            self.urgency_factors[task.id] = factor
+
+    def urgency_factor(self, task: Task) -> float:
+        """Urgency factor (0.0 to 1.0) of a task as of the reference time"""
+        factor = self.urgency_factors.get(task.id)
+        if factor is None:
+            self.add_tasks([task])
+            factor = self.urgency_factors[task.id]
+        return factor
@@ -0,0 +1,119 @@
+from typing import Dict, Optional
+from pathlib import Path
+from datetime import datetime
+import json
+import os
+import threading
+from pydantic import BaseModel, Field
+
+DEFAULT_PROFILE = "default"
+
+
+class ScoringWeights(BaseModel):
+    """Versioned weight set for the composite assignment score"""
+    version: str = "builtin"
+    weight_skill: float = 0.4
+    weight_workload: float = 0.3
+    weight_reliability: float = 0.2
+    weight_urgency: float = 0.1
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    metrics: Dict[str, float] = {}  # Fit diagnostics from the tuner
+
+    def as_kwargs(self) -> Dict[str, float]:
+        """Keyword arguments for FeatureExtractor.compute_assignment_score"""
+        return {
+            "weight_skill": self.weight_skill,
+            "weight_workload": self.weight_workload,
+            "weight_reliability": self.weight_reliability,
+            "weight_urgency": self.weight_urgency
+        }
+
+
+class WeightRegistry:
+    """
+    Stores versioned weight sets and the active version per team profile
+
+    The registry is backed by a JSON file that is re-read whenever its
+    modification time changes, so tuned weights can be activated on a
+    running service by rewriting the file or calling activate().
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path) if path else None
+        self._lock = threading.Lock()
+        self._mtime: Optional[int] = None
+        self._versions: Dict[str, ScoringWeights] = {"builtin": ScoringWeights()}
+        self._active: Dict[str, str] = {DEFAULT_PROFILE: "builtin"}
+        self._reload_if_changed()
+
+    def _reload_if_changed(self):
+        if self.path is None or not self.path.exists():
+            return
+        mtime = self.path.stat().st_mtime_ns
+        if mtime == self._mtime:
+            return
+        with self._lock:
+            data = json.loads(self.path.read_text())
+            versions = {"builtin": ScoringWeights()}
+            versions.update({
+                version: ScoringWeights(**weights)
+                for version, weights in data.get("versions", {}).items()
+            })
+            self._versions = versions
+            self._active = {DEFAULT_PROFILE: "builtin", **data.get("active", {})}
+            self._mtime = mtime
+
+    def _save(self):
+        if self.path is None:
+            return
+        data = {
+            "active": self._active,
+            "versions": {
+                version: json.loads(weights.model_dump_json())
+                for version, weights in self._versions.items()
+                if version != "builtin"
+            }
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(data, indent=2))
+        os.replace(tmp_path, self.path)
+        self._mtime = self.path.stat().st_mtime_ns
+
+    def get(self, profile: Optional[str] = None) -> ScoringWeights:
+        """
+        Active weights for a team profile, falling back to the default profile
+
+        Called once per planning run; the result is resolved into plain
+        keyword arguments before any task-member pair is scored.
+        """
+        self._reload_if_changed()
+        version = self._active.get(profile or DEFAULT_PROFILE) or self._active[DEFAULT_PROFILE]
+        return self._versions[version]
+
+    def register(self, weights: ScoringWeights, activate: bool = False, profile: Optional[str] = None):
+        """Add a weight set, optionally activating it for a profile"""
+        with self._lock:
+            self._versions[weights.version] = weights
+            if activate:
+                self._active[profile or DEFAULT_PROFILE] = weights.version
+            self._save()
+
+    def activate(self, version: str, profile: Optional[str] = None):
+        """Make a registered version the active weight set for a profile"""
+        self._reload_if_changed()
+        with self._lock:
+            if version not in self._versions:
+                raise KeyError(f"Unknown weight version: {version}")
+            self._active[profile or DEFAULT_PROFILE] = version
+            self._save()
+
+    def versions(self) -> Dict[str, ScoringWeights]:
+        """All registered weight sets by version"""
+        self._reload_if_changed()
+        return dict(self._versions)
+
+    def active_versions(self) -> Dict[str, str]:
+        """Active version per profile"""
+        self._reload_if_changed()
+        return dict(self._active)
@@ -0,0 +1,261 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+from functools import lru_cache
+from pathlib import Path
+import hashlib
+import json
+import os
+import threading
+import numpy as np
+from src.utils.logger import logger
+
+CACHE_PREFIX = "skill-closure-"
+
+
+@lru_cache(maxsize=65536)
+def normalize_skill(name: str) -> str:
+    """Case- and whitespace-insensitive skill key ("  react " == "React")"""
+    return " ".join(name.casefold().split())
+
+
+class SkillTaxonomy:
+    """
+    Skills with aliases, parents and related skills, and the transitive
+    similarity closure between them
+
+    similarity[h, r] is how well holding skill h covers a requirement
+    for skill r: 1.0 for the same skill (or an alias), child_weight from
+    a child to its parent (FastAPI covers Python), parent_weight from a
+    parent to a child, an explicit weight for related skills, and the
+    best product along any chain of those; products below min_similarity
+    are dropped. The closure is kept up to date as definitions are added
+    (each new edge only touches the skills that reach it and the skills
+    it reaches), so scoring is a plain matrix lookup. With a
+    cache_dir the closure is stored on disk, keyed by a fingerprint of
+    every definition loaded so far.
+
+    Definitions map a skill name to
+        {"aliases": [...], "parent": "...", "related": {"name": weight}}
+    with optional "child_weight" / "parent_weight" overrides.
+
+    Args:
+        child_weight: Default coverage of a parent by its child
+        parent_weight: Default coverage of a child by its parent
+        min_similarity: Smallest similarity kept in the closure
+        cache_dir: Directory for cached closures (no disk cache when None)
+    """
+
+    def __init__(
+        self,
+        child_weight: float = 0.7,
+        parent_weight: float = 0.4,
+        min_similarity: float = 0.05,
+        cache_dir: Optional[str] = None
+    ):
+        self.child_weight = child_weight
+        self.parent_weight = parent_weight
+        self.min_similarity = min_similarity
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.fingerprint = ""
+        self._names: List[str] = []
+        self._edges: Dict[Tuple[int, int], float] = {}
+        # (normalized name or alias -> row, similarity closure), swapped as one
+        # so readers never see an index that is ahead of the matrix
+        self._lookup: Tuple[Dict[str, int], np.ndarray] = ({}, np.zeros((0, 0), dtype=np.float32))
+        self._lock = threading.Lock()
+
+    @property
+    def skills(self) -> List[str]:
+        return list(self._names)
+
+    def index_of(self, name: str) -> Optional[int]:
+        return self._lookup[0].get(normalize_skill(name))
+
+    def load_file(self, path: str):
+        """Add the definitions in a JSON file ({"skills": {...}})"""
+        data = json.loads(Path(path).read_text())
+        self.add_skills(data.get("skills", data))
+
+    def add_skills(self, definitions: Dict[str, Dict]):
+        """
+        Merge skill definitions into the taxonomy, updating the closure incrementally
+
+        Raises:
+            ValueError: if an alias already names a different skill
+        """
+        payload = json.dumps(definitions, sort_keys=True)
+        fingerprint = hashlib.sha256((self.fingerprint + payload).encode()).hexdigest()
+
+        with self._lock:
+            previous_index, previous_similarity = self._lookup
+            names, index, edges = list(self._names), dict(previous_index), dict(self._edges)
+
+            def node(name: str) -> int:
+                key = normalize_skill(name)
+                if key not in index:
+                    index[key] = len(names)
+                    names.append(name)
+                return index[key]
+
+            new_edges: Dict[Tuple[int, int], float] = {}
+
+            def edge(source: int, target: int, weight: float):
+                if source != target and weight > max(edges.get((source, target), 0.0), new_edges.get((source, target), 0.0)):
+                    new_edges[(source, target)] = min(weight, 1.0)
+
+            for name, definition in definitions.items():
+                row = node(name)
+                for alias in definition.get("aliases", []):
+                    key = normalize_skill(alias)
+                    if index.setdefault(key, row) != row:
+                        raise ValueError(f"Alias '{alias}' of '{name}' already names '{names[index[key]]}'")
+                parent = definition.get("parent")
+                if parent:
+                    parent_row = node(parent)
+                    edge(row, parent_row, definition.get("child_weight", self.child_weight))
+                    edge(parent_row, row, definition.get("parent_weight", self.parent_weight))
+                for related, weight in definition.get("related", {}).items():
+                    related_row = node(related)
+                    edge(row, related_row, weight)
+                    edge(related_row, row, weight)
+
+            edges.update(new_edges)
+            similarity = self._load_cached(fingerprint, len(names))
+            if similarity is None:
+                similarity = np.eye(len(names), dtype=np.float32)
+                similarity[:len(self._names), :len(self._names)] = previous_similarity
+                for (source, target), weight in new_edges.items():
+                    self._add_edge(similarity, source, target, weight)
+                self._store_cached(fingerprint, similarity)
+
+            self._names, self._edges = names, edges
+            self._lookup = (index, similarity)
+            self.fingerprint = fingerprint
+
+    def _add_edge(self, similarity: np.ndarray, source: int, target: int, weight: float):
+        """
+        Fold one edge into the closure in place
+
+        Weights are <= 1, so a best path uses the new edge at most once:
+        every skill reaching source now reaches everything target reaches.
+        A path's product never exceeds its prefixes', so pruning below
+        min_similarity loses nothing that would survive the threshold.
+        """
+        rows = np.flatnonzero(similarity[:, source])
+        columns = np.flatnonzero(similarity[target, :])
+        through = np.outer(similarity[rows, source], similarity[target, columns]) * weight
+        through[through < self.min_similarity] = 0.0
+        block = np.ix_(rows, columns)
+        similarity[block] = np.maximum(similarity[block], through)
+
+    def _cache_path(self, fingerprint: str) -> Optional[Path]:
+        if self.cache_dir is None:
+            return None
+        return self.cache_dir / f"{CACHE_PREFIX}{fingerprint[:24]}.npy"
+
+    def _load_cached(self, fingerprint: str, size: int) -> Optional[np.ndarray]:
+        path = self._cache_path(fingerprint)
+        if path is None or not path.is_file():
+            return None
+        try:
+            similarity = np.load(path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable skill closure cache {path.name}: {e}")
+            return None
+        return similarity if similarity.shape == (size, size) else None
+
+    def _store_cached(self, fingerprint: str, similarity: np.ndarray):
+        path = self._cache_path(fingerprint)
+        if path is None:
+            return
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            temporary = path.with_suffix(".tmp")
+            with temporary.open("wb") as cache_file:
+                np.save(cache_file, similarity)
+            os.replace(temporary, path)
+            for older in self.cache_dir.glob(f"{CACHE_PREFIX}*.npy"):
+                if older != path:
+                    older.unlink()
+        except OSError as e:
+            logger.warning(f"Could not cache skill closure: {e}")
+
+    def similarity(self, held: Iterable[str], required: Iterable[str]) -> np.ndarray:
+        """
+        Coverage of each required skill by each held skill
+
+        Returns:
+            Array of shape (len(held), len(required)); skills outside the
+            taxonomy only match themselves (after normalization)
+        """
+        held_keys = [normalize_skill(name) for name in held]
+        required_keys = [normalize_skill(name) for name in required]
+        index, similarity = self._lookup
+
+        block = (np.array(held_keys, dtype=object)[:, None] == np.array(required_keys, dtype=object)[None, :])
+        block = block.astype(np.float32).reshape(len(held_keys), len(required_keys))
+        held_rows = [(i, index[key]) for i, key in enumerate(held_keys) if key in index]
+        required_rows = [(j, index[key]) for j, key in enumerate(required_keys) if key in index]
+        if held_rows and required_rows:
+            held_positions, held_indices = zip(*held_rows)
+            required_positions, required_indices = zip(*required_rows)
+            block[np.ix_(held_positions, required_positions)] = similarity[np.ix_(held_indices, required_indices)]
+        return block
+
+    def coverage(self, held: List[Tuple[str, float]], required: List[str]) -> List[float]:
+        """
+        Best proficiency-weighted coverage of each required skill
+
+        held is (skill name, proficiency) pairs; this is the per-pair path,
+        kept to dictionary and scalar lookups. Planning runs score through
+        FeatureExtractor's SkillCoverage instead.
+        """
+        index, similarity = self._lookup
+        if not index:  # Empty taxonomy: plain name match
+            best_held: Dict[str, float] = {}
+            for name, proficiency in held:
+                key = normalize_skill(name)
+                best_held[key] = max(best_held.get(key, 0.0), proficiency)
+            return [best_held.get(normalize_skill(name), 0.0) for name in required]
+        held_rows = [(index.get(normalize_skill(name)), normalize_skill(name), proficiency) for name, proficiency in held]
+        scores = []
+        for name in required:
+            key = normalize_skill(name)
+            row = index.get(key)
+            best = 0.0
+            for held_row, held_key, proficiency in held_rows:
+                if held_key == key:
+                    weight = 1.0
+                elif held_row is not None and row is not None:
+                    weight = float(similarity[held_row, row])
+                else:
+                    continue
+                best = max(best, proficiency * weight)
+            scores.append(best)
+        return scores
+
+
+_default_taxonomy: Optional[SkillTaxonomy] = None
+_default_lock = threading.Lock()
+
+
+def get_default_taxonomy() -> SkillTaxonomy:
+    """Taxonomy used for skill scoring, loaded from SKILL_TAXONOMY_PATH on first use"""
+    global _default_taxonomy
+    if _default_taxonomy is None:
+        with _default_lock:
+            if _default_taxonomy is None:
+                from config.settings import get_settings
+
+                settings = get_settings()
+                taxonomy = SkillTaxonomy(cache_dir=settings.skill_taxonomy_cache_dir)
+                if settings.skill_taxonomy_path:
+                    taxonomy.load_file(settings.skill_taxonomy_path)
+                _default_taxonomy = taxonomy
+    return _default_taxonomy
+
+
+def set_default_taxonomy(taxonomy: Optional[SkillTaxonomy]):
+    """Replace the scoring taxonomy (None reloads it from settings on next use)"""
+    global _default_taxonomy
+    with _default_lock:
+        _default_taxonomy = taxonomy
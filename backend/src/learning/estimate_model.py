@@ -0,0 +1,179 @@
+from typing import List, Dict, Optional, Tuple
+from collections import OrderedDict
+import math
+import zlib
+import numpy as np
+from src.data_model.task import Task, Priority, PRIORITY_WEIGHTS
+from src.data_model.team_member import TeamMember
+from src.learning.history_store import AssignmentOutcome
+
+
+class EstimateCorrectionModel:
+    """
+    Learns how actual hours drift from estimated hours
+
+    Predicts log(actual / estimated) from task complexity, priority,
+    required skills (hashed into a fixed number of buckets) and the
+    assignee's historical drift, then rescales the raw estimate. The
+    model is linear, so predictions for every task-member pair are one
+    cached per-task prediction plus a per-member bias term.
+    """
+
+    # Column layout of the feature matrix
+    NUM_BASE_FEATURES = 3  # complexity, log estimated hours, priority weight
+
+    def __init__(
+        self,
+        skill_buckets: int = 16,
+        min_samples: int = 20,
+        member_prior_weight: float = 5.0,
+        max_correction: float = 4.0,
+        cache_size: int = 50_000
+    ):
+        """
+        Args:
+            skill_buckets: Number of hashed skill features
+            min_samples: Outcomes required before corrections are applied
+            member_prior_weight: Pseudo-count shrinking member drift to zero
+            max_correction: Largest multiplicative correction in either direction
+            cache_size: Maximum number of cached per-task predictions
+        """
+        self.skill_buckets = skill_buckets
+        self.min_samples = min_samples
+        self.member_prior_weight = member_prior_weight
+        self.max_log_correction = math.log(max_correction)
+        self.cache_size = cache_size
+
+        # scikit-learn is only needed once a model is actually built
+        from sklearn.linear_model import SGDRegressor
+
+        self.regressor = SGDRegressor(
+            learning_rate="invscaling",
+            eta0=0.01,
+            alpha=1e-4,
+            random_state=0
+        )
+        self.samples_seen = 0
+        self.version = 0
+
+        # Per-member running mean of log(actual / estimated)
+        self._member_drift: Dict[str, Tuple[int, float]] = {}
+        self._cache: "OrderedDict[tuple, float]" = OrderedDict()
+        self._coef: Optional[np.ndarray] = None
+        self._intercept = 0.0
+
+    @property
+    def is_ready(self) -> bool:
+        """Whether enough outcomes have been seen to apply corrections"""
+        return self._coef is not None and self.samples_seen >= self.min_samples
+
+    def _member_bias(self, member_id: Optional[str]) -> float:
+        if member_id is None or member_id not in self._member_drift:
+            return 0.0
+        count, mean = self._member_drift[member_id]
+        return mean * count / (count + self.member_prior_weight)
+
+    def _skill_bucket(self, skill: str) -> int:
+        return zlib.crc32(skill.encode()) % self.skill_buckets
+
+    def _base_row(
+        self,
+        complexity: float,
+        estimated_hours: float,
+        priority: Priority,
+        required_skills: List[str]
+    ) -> np.ndarray:
+        row = np.zeros(self.NUM_BASE_FEATURES + self.skill_buckets + 1)
+        row[0] = complexity
+        row[1] = math.log1p(estimated_hours)
+        row[2] = PRIORITY_WEIGHTS[priority]
+        if required_skills:
+            share = 1.0 / len(required_skills)
+            for skill in required_skills:
+                row[self.NUM_BASE_FEATURES + self._skill_bucket(skill)] += share
+        return row
+
+    def partial_fit(self, outcomes: List[AssignmentOutcome]):
+        """Incrementally train on a batch of completed assignment outcomes"""
+        outcomes = [o for o in outcomes if o.estimated_hours > 0 and o.actual_hours > 0]
+        if not outcomes:
+            return
+
+        features = np.empty((len(outcomes), self.NUM_BASE_FEATURES + self.skill_buckets + 1))
+        targets = np.empty(len(outcomes))
+        for i, outcome in enumerate(outcomes):
+            features[i] = self._base_row(
+                outcome.complexity,
+                outcome.estimated_hours,
+                outcome.priority,
+                outcome.required_skills
+            )
+            # Member drift as known before this outcome, to avoid target leakage
+            features[i, -1] = self._member_bias(outcome.member_id)
+            targets[i] = math.log(outcome.actual_hours / outcome.estimated_hours)
+
+        for outcome, target in zip(outcomes, targets):
+            count, mean = self._member_drift.get(outcome.member_id, (0, 0.0))
+            self._member_drift[outcome.member_id] = (count + 1, mean + (target - mean) / (count + 1))
+
+        self.regressor.partial_fit(features, targets)
+        self.samples_seen += len(outcomes)
+        self._coef = self.regressor.coef_.copy()
+        self._intercept = float(self.regressor.intercept_[0])
+        self.version += 1
+        self._cache.clear()
+
+    def _base_predictions(self, tasks: List[Task]) -> np.ndarray:
+        """Member-independent log corrections for tasks, served from cache when possible"""
+        predictions = np.empty(len(tasks))
+        missing = []
+        for i, task in enumerate(tasks):
+            key = (task.id, task.estimated_hours, task.complexity, task.priority.value, tuple(task.required_skills))
+            cached = self._cache.get(key)
+            if cached is None:
+                missing.append((i, key))
+            else:
+                self._cache.move_to_end(key)
+                predictions[i] = cached
+
+        if missing:
+            rows = np.stack([
+                self._base_row(t.complexity, t.estimated_hours, t.priority, t.required_skills)
+                for t in (tasks[i] for i, _ in missing)
+            ])
+            computed = rows @ self._coef + self._intercept
+            for (i, key), value in zip(missing, computed):
+                predictions[i] = value
+                self._cache[key] = float(value)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+        return predictions
+
+    def predict_hours(self, tasks: List[Task]) -> Dict[str, float]:
+        """
+        Corrected hours for each task, independent of assignee
+
+        Returns raw estimates until the model has seen min_samples outcomes.
+        """
+        if not self.is_ready or not tasks:
+            return {task.id: task.estimated_hours for task in tasks}
+        log_correction = np.clip(self._base_predictions(tasks), -self.max_log_correction, self.max_log_correction)
+        estimated = np.array([task.estimated_hours for task in tasks])
+        corrected = estimated * np.exp(log_correction)
+        return {task.id: float(hours) for task, hours in zip(tasks, corrected)}
+
+    def predict_matrix(self, tasks: List[Task], team_members: List[TeamMember]) -> np.ndarray:
+        """
+        Corrected hours for every task-member pair
+
+        Returns:
+            Array of shape (len(tasks), len(team_members))
+        """
+        estimated = np.array([task.estimated_hours for task in tasks], dtype=float)
+        if not self.is_ready or not tasks:
+            return np.repeat(estimated[:, None], len(team_members), axis=1)
+        member_bias = np.array([self._member_bias(m.id) for m in team_members])
+        log_correction = self._base_predictions(tasks)[:, None] + self._coef[-1] * member_bias[None, :]
+        log_correction = np.clip(log_correction, -self.max_log_correction, self.max_log_correction)
+        return estimated[:, None] * np.exp(log_correction)
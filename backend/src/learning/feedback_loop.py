@@ -1,14 +1,60 @@
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
+from collections import deque
 from datetime import datetime
+from pathlib import Path
+import json
+import numpy as np
 from src.data_model.assignment import Assignment
 from src.data_model.team_member import TeamMember
 from src.data_model.task import Task
+from src.learning.streaming_stats import RunningStats, KeyedRunningStats, complexity_bucket
+from src.learning.history_store import OutcomeStore, AssignmentOutcome
 
 class FeedbackLoop:
     """Collects post-sprint feedback and updates models"""
     
-    def __init__(self):
-        self.historical_data: List[Dict] = []
+    # Member profile update rules
+    COMPLETION_TIME_ALPHA = 0.3  # EWMA smoothing for average completion time
+    ON_TIME_RELIABILITY_STEP = 0.05
+    LATE_RELIABILITY_PENALTY = 0.1
+    
+    def __init__(
+        self,
+        max_history: Optional[int] = None,
+        spill_path: Optional[str] = None,
+        ewma_alpha: float = 0.3,
+        window_size: int = 10,
+        outcome_store: Optional[OutcomeStore] = None,
+        estimate_model=None,
+        state_store=None
+    ):
+        """
+        Args:
+            max_history: Number of raw feedback records kept in memory
+                (None keeps everything)
+            spill_path: JSON-lines file that evicted records are appended to;
+                evicted records are dropped when not set
+            ewma_alpha: Smoothing factor for the streaming EWMA aggregates
+            window_size: Number of recent observations in windowed aggregates
+            outcome_store: Persistent columnar store that per-assignment
+                outcomes are appended to
+            estimate_model: EstimateCorrectionModel retrained incrementally
+                on each sprint's outcomes
+            state_store: StateStore that feedback records are logged to, so
+                historical_data survives restarts
+        """
+        self.historical_data = deque(maxlen=max_history)
+        self.spill_path = Path(spill_path) if spill_path else None
+        
+        # Streaming aggregates, updated once per sprint so insights are O(1)
+        self.completion_rate_stats = RunningStats(ewma_alpha, window_size)
+        self.prediction_error_stats = RunningStats(ewma_alpha, window_size)
+        self.member_error_stats = KeyedRunningStats(ewma_alpha, window_size)
+        self.skill_error_stats = KeyedRunningStats(ewma_alpha, window_size)
+        self.complexity_error_stats = KeyedRunningStats(ewma_alpha, window_size)
+        self.outcome_store = outcome_store
+        self.estimate_model = estimate_model
+        self.state_store = state_store
     
     def collect_sprint_feedback(
         self,
@@ -28,9 +74,86 @@ class FeedbackLoop:
             "task_feedback": self._collect_task_metrics(tasks)
         }
         
-        self.historical_data.append(feedback)
+        self._update_aggregates(feedback, assignments, tasks)
+        if self.state_store is not None:
+            with self.state_store.mutation():
+                self._append_history(feedback)
+                self.state_store.record("feedback_recorded", {"feedback": feedback})
+        else:
+            self._append_history(feedback)
+        if self.outcome_store is not None or self.estimate_model is not None:
+            self._record_outcomes(assignments, tasks)
         return feedback
     
+    def _record_outcomes(self, assignments: List[Assignment], tasks: List[Task]):
+        """Persist finished assignments and retrain the estimate model"""
+        task_map = {task.id: task for task in tasks}
+        outcomes = [
+            AssignmentOutcome.from_assignment(assignment, task_map[assignment.task_id])
+            for assignment in assignments
+            if assignment.actual_hours is not None and assignment.task_id in task_map
+        ]
+        if self.outcome_store is not None:
+            self.outcome_store.record_sprint(outcomes)
+        if self.estimate_model is not None:
+            self.estimate_model.partial_fit(outcomes)
+    
+    def _update_aggregates(
+        self,
+        feedback: Dict,
+        assignments: List[Assignment],
+        tasks: List[Task]
+    ):
+        """Fold one sprint's feedback into the streaming aggregates"""
+        self.completion_rate_stats.update(feedback["task_feedback"]["completion_rate"])
+        self.prediction_error_stats.update(feedback["accuracy_metrics"]["prediction_error"])
+        
+        task_map = {task.id: task for task in tasks}
+        for assignment in assignments:
+            if assignment.actual_hours is None:
+                continue
+            error = abs(assignment.estimated_hours - assignment.actual_hours)
+            self.member_error_stats.update(assignment.member_id, error)
+            
+            task = task_map.get(assignment.task_id)
+            if task is None:
+                continue
+            for skill in task.required_skills:
+                self.skill_error_stats.update(skill, error)
+            self.complexity_error_stats.update(complexity_bucket(task.complexity), error)
+    
+    def _append_history(self, feedback: Dict):
+        """Store a raw feedback record, spilling the oldest one when at capacity"""
+        maxlen = self.historical_data.maxlen
+        if maxlen is not None and len(self.historical_data) == maxlen and self.spill_path:
+            if maxlen == 0:
+                self._spill(feedback)
+                return
+            self._spill(self.historical_data[0])
+        self.historical_data.append(feedback)
+    
+    def restore_feedback(self, record: Dict):
+        """
+        Re-add a logged feedback record during crash recovery
+        
+        Restores the raw history and the sprint-level aggregates; the
+        per-member/skill/complexity aggregates need the assignments and
+        are not rebuilt. Nothing is spilled, since evicted records were
+        already spilled before the restart.
+        """
+        record = dict(record)
+        if isinstance(record.get("timestamp"), str):
+            record["timestamp"] = datetime.fromisoformat(record["timestamp"])
+        self.completion_rate_stats.update(record["task_feedback"]["completion_rate"])
+        self.prediction_error_stats.update(record["accuracy_metrics"]["prediction_error"])
+        self.historical_data.append(record)
+    
+    def _spill(self, record: Dict):
+        """Append a raw feedback record to the spill file"""
+        self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.spill_path.open("a") as spill_file:
+            spill_file.write(json.dumps(record, default=str) + "\n")
+    
     def _calculate_accuracy(self, assignments: List[Assignment]) -> Dict:
         """Calculate prediction vs reality metrics"""
         metrics = {
@@ -90,7 +213,7 @@ class FeedbackLoop:
             member.average_task_completion_time = actual_completion_hours
         else:
             # Exponential moving average
-            alpha = 0.3
+            alpha = self.COMPLETION_TIME_ALPHA
             member.average_task_completion_time = (
                 alpha * actual_completion_hours +
                 (1 - alpha) * member.average_task_completion_time
@@ -98,23 +221,108 @@ class FeedbackLoop:
         
         # Update reliability score
         if was_on_time:
-            member.reliability_score = min(member.reliability_score + 0.05, 1.0)
+            member.reliability_score = min(member.reliability_score + self.ON_TIME_RELIABILITY_STEP, 1.0)
         else:
-            member.reliability_score = max(member.reliability_score - 0.1, 0.0)
+            member.reliability_score = max(member.reliability_score - self.LATE_RELIABILITY_PENALTY, 0.0)
+    
+    def update_member_profiles(
+        self,
+        team_members: List[TeamMember],
+        completions: List[Tuple[str, float, bool]]
+    ):
+        """
+        Apply a whole sprint's completions to member profiles at once
+        
+        Produces exactly the same profiles as calling update_member_profile
+        for each completion in order, but computes every member's EWMA and
+        reliability with array operations: one vectorized step per position
+        in the longest per-member sequence rather than one Python call per
+        completion.
+        
+        Args:
+            team_members: Members to update
+            completions: (member_id, actual_completion_hours, was_on_time)
+                records in completion order
+        """
+        if not completions:
+            return
+        
+        member_index = {member.id: i for i, member in enumerate(team_members)}
+        unknown = {member_id for member_id, _, _ in completions if member_id not in member_index}
+        if unknown:
+            raise ValueError(f"Unknown member IDs in completions: {sorted(unknown)}")
+        
+        codes = np.array([member_index[member_id] for member_id, _, _ in completions])
+        hours = np.array([h for _, h, _ in completions], dtype=float)
+        on_time = np.array([flag for _, _, flag in completions], dtype=bool)
+        
+        # Position of each completion within its member's own sequence
+        order = np.argsort(codes, kind="stable")
+        counts = np.bincount(codes, minlength=len(team_members))
+        group_start = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        step = np.empty(len(codes), dtype=int)
+        step[order] = np.arange(len(codes)) - group_start[codes[order]]
+        
+        # Pad into (steps, members) grids; missing entries are masked out
+        num_steps = int(counts.max())
+        valid = np.zeros((num_steps, len(team_members)), dtype=bool)
+        hour_grid = np.zeros((num_steps, len(team_members)))
+        on_time_grid = np.zeros((num_steps, len(team_members)), dtype=bool)
+        valid[step, codes] = True
+        hour_grid[step, codes] = hours
+        on_time_grid[step, codes] = on_time
+        
+        average = np.array([m.average_task_completion_time for m in team_members], dtype=float)
+        reliability = np.array([m.reliability_score for m in team_members], dtype=float)
+        alpha = self.COMPLETION_TIME_ALPHA
+        
+        for k in range(num_steps):
+            x = hour_grid[k]
+            smoothed = np.where(average == 0, x, alpha * x + (1 - alpha) * average)
+            average = np.where(valid[k], smoothed, average)
+            
+            stepped = np.where(
+                on_time_grid[k],
+                np.minimum(reliability + self.ON_TIME_RELIABILITY_STEP, 1.0),
+                np.maximum(reliability - self.LATE_RELIABILITY_PENALTY, 0.0)
+            )
+            reliability = np.where(valid[k], stepped, reliability)
+        
+        # Write back only members that had completions
+        for i in np.flatnonzero(counts):
+            member = team_members[i]
+            member.average_task_completion_time = float(average[i])
+            member.reliability_score = float(reliability[i])
     
     def get_learning_insights(self) -> Dict:
-        """Extract insights from historical feedback"""
-        if not self.historical_data:
+        """Extract insights from the streaming aggregates"""
+        if self.completion_rate_stats.count == 0:
             return {}
         
         insights = {
-            "sprints_completed": len(self.historical_data),
-            "average_completion_rate": sum(
-                d["task_feedback"]["completion_rate"] for d in self.historical_data
-            ) / len(self.historical_data),
-            "average_prediction_error": sum(
-                d["accuracy_metrics"].get("prediction_error", 0) for d in self.historical_data
-            ) / len(self.historical_data)
+            "sprints_completed": self.completion_rate_stats.count,
+            "average_completion_rate": self.completion_rate_stats.mean,
+            "average_prediction_error": self.prediction_error_stats.mean,
+            "recent_completion_rate": self.completion_rate_stats.window_mean,
+            "recent_prediction_error": self.prediction_error_stats.window_mean,
+            "completion_rate_trend": self.completion_rate_stats.ewma,
+            "prediction_error_trend": self.prediction_error_stats.ewma,
+            "prediction_error_std": self.prediction_error_stats.std
         }
         
-        return insights
\ No newline at end of file
+        return insights
+    
+    def get_member_insights(self, member_id: str) -> Dict:
+        """Estimate-error aggregates for one team member"""
+        stats = self.member_error_stats.get(member_id)
+        return stats.summary() if stats else {}
+    
+    def get_skill_insights(self, skill: str) -> Dict:
+        """Estimate-error aggregates for tasks requiring a skill"""
+        stats = self.skill_error_stats.get(skill)
+        return stats.summary() if stats else {}
+    
+    def get_complexity_insights(self, complexity: float) -> Dict:
+        """Estimate-error aggregates for the complexity bucket containing a value"""
+        stats = self.complexity_error_stats.get(complexity_bucket(complexity))
+        return stats.summary() if stats else {}
\ No newline at end of file
@@ -0,0 +1,331 @@
+from typing import List, Dict, Optional
+from pathlib import Path
+from datetime import datetime, timezone
+import json
+import os
+import numpy as np
+from pydantic import BaseModel, Field
+from src.data_model.assignment import Assignment
+from src.data_model.task import Task, Priority, TaskStatus
+
+
+PRIORITY_CODES = {
+    Priority.LOW: 0,
+    Priority.MEDIUM: 1,
+    Priority.HIGH: 2,
+    Priority.CRITICAL: 3
+}
+
+# Fixed-width columns stored one .npy file per segment
+COLUMNS = {
+    "sprint_seq": np.int32,
+    "recorded_at": np.float64,
+    "member": np.int32,
+    "complexity": np.float32,
+    "priority": np.int8,
+    "estimated_hours": np.float64,
+    "actual_hours": np.float64,
+    "on_time": np.bool_,
+}
+
+# Variable-length skills are stored as (row, skill) pairs
+SKILL_COLUMNS = {
+    "skill_row": np.int32,
+    "skill_code": np.int32,
+}
+
+
+class AssignmentOutcome(BaseModel):
+    """Outcome of one completed assignment"""
+    member_id: str
+    required_skills: List[str] = []
+    complexity: float = Field(ge=0.0, le=1.0)
+    priority: Priority = Priority.MEDIUM
+    estimated_hours: float
+    actual_hours: float
+    on_time: bool
+    recorded_at: datetime = Field(default_factory=datetime.utcnow)
+
+    @classmethod
+    def from_assignment(cls, assignment: Assignment, task: Task) -> "AssignmentOutcome":
+        """Build an outcome record from a finished assignment and its task"""
+        return cls(
+            member_id=assignment.member_id,
+            required_skills=task.required_skills,
+            complexity=task.complexity,
+            priority=task.priority,
+            estimated_hours=task.estimated_hours,
+            actual_hours=assignment.actual_hours,
+            on_time=was_on_time(assignment, task),
+            recorded_at=assignment.completed_at or datetime.utcnow()
+        )
+
+
+def was_on_time(assignment: Assignment, task: Task) -> bool:
+    """Whether an assignment finished before its task's deadline"""
+    if task.status == TaskStatus.DELAYED:
+        return False
+    if assignment.completed_at is not None:
+        return assignment.completed_at <= task.deadline
+    return task.status == TaskStatus.COMPLETED
+
+
+class OutcomeStore:
+    """
+    Append-only columnar store for assignment outcomes
+
+    Outcomes are buffered in memory and flushed as immutable segments of
+    one .npy file per column. Reads memory-map segments and skip those
+    outside the requested sprint range, so filtered aggregations only
+    touch the columns and segments they need.
+    """
+
+    MANIFEST = "manifest.json"
+
+    def __init__(self, root_dir: str, segment_size: int = 100_000, compact_threshold: int = 16):
+        """
+        Args:
+            root_dir: Directory holding the manifest and segments
+            segment_size: Target number of rows per compacted segment
+            compact_threshold: Number of undersized segments that triggers
+                a compaction on flush
+        """
+        self.root_dir = Path(root_dir)
+        self.root_dir.mkdir(parents=True, exist_ok=True)
+        self.segment_size = segment_size
+        self.compact_threshold = compact_threshold
+        self._manifest = self._load_manifest()
+        self._member_codes = {m: i for i, m in enumerate(self._manifest["members"])}
+        self._skill_codes = {s: i for i, s in enumerate(self._manifest["skills"])}
+        self._buffer: Dict[str, list] = {name: [] for name in list(COLUMNS) + list(SKILL_COLUMNS)}
+
+    def _load_manifest(self) -> Dict:
+        path = self.root_dir / self.MANIFEST
+        if path.exists():
+            return json.loads(path.read_text())
+        return {"members": [], "skills": [], "segments": [], "next_sprint_seq": 0, "next_segment": 0}
+
+    def _write_manifest(self):
+        path = self.root_dir / self.MANIFEST
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self._manifest))
+        os.replace(tmp_path, path)
+
+    def _encode(self, value: str, codes: Dict[str, int], table: str) -> int:
+        code = codes.get(value)
+        if code is None:
+            code = len(codes)
+            codes[value] = code
+            self._manifest[table].append(value)
+        return code
+
+    @property
+    def latest_sprint_seq(self) -> int:
+        """Sequence number of the most recently recorded sprint (-1 if none)"""
+        return self._manifest["next_sprint_seq"] - 1
+
+    def record_sprint(self, outcomes: List[AssignmentOutcome], flush: bool = True) -> int:
+        """
+        Append one sprint's outcomes under a new sprint sequence number
+
+        Returns:
+            The sprint sequence number assigned to the outcomes
+        """
+        sprint_seq = self._manifest["next_sprint_seq"]
+        self._manifest["next_sprint_seq"] += 1
+
+        buffer = self._buffer
+        row = len(buffer["sprint_seq"])
+        for outcome in outcomes:
+            buffer["sprint_seq"].append(sprint_seq)
+            recorded_at = outcome.recorded_at
+            if recorded_at.tzinfo is None:
+                recorded_at = recorded_at.replace(tzinfo=timezone.utc)  # Naive times here are UTC, not local
+            buffer["recorded_at"].append(recorded_at.timestamp())
+            buffer["member"].append(self._encode(outcome.member_id, self._member_codes, "members"))
+            buffer["complexity"].append(outcome.complexity)
+            buffer["priority"].append(PRIORITY_CODES[outcome.priority])
+            buffer["estimated_hours"].append(outcome.estimated_hours)
+            buffer["actual_hours"].append(outcome.actual_hours)
+            buffer["on_time"].append(outcome.on_time)
+            for skill in outcome.required_skills:
+                buffer["skill_row"].append(row)
+                buffer["skill_code"].append(self._encode(skill, self._skill_codes, "skills"))
+            row += 1
+
+        if flush:
+            self.flush()
+        return sprint_seq
+
+    def flush(self):
+        """Write buffered rows as a new immutable segment"""
+        if self._buffer["sprint_seq"]:
+            self._write_segment(self._buffered_arrays())
+            self._buffer = {name: [] for name in self._buffer}
+        self._write_manifest()
+
+        small = [s for s in self._manifest["segments"] if s["rows"] < self.segment_size]
+        if len(small) >= self.compact_threshold:
+            self.compact()
+
+    def _buffered_arrays(self) -> Dict[str, np.ndarray]:
+        return {
+            name: np.asarray(self._buffer[name], dtype=dtype)
+            for name, dtype in {**COLUMNS, **SKILL_COLUMNS}.items()
+        }
+
+    def _write_segment(self, arrays: Dict[str, np.ndarray]):
+        name = f"seg-{self._manifest['next_segment']:06d}"
+        self._manifest["next_segment"] += 1
+        segment_dir = self.root_dir / name
+        segment_dir.mkdir()
+        for column, values in arrays.items():
+            np.save(segment_dir / f"{column}.npy", values)
+        sprint_seq = arrays["sprint_seq"]
+        self._manifest["segments"].append({
+            "name": name,
+            "rows": int(len(sprint_seq)),
+            "min_sprint": int(sprint_seq.min()),
+            "max_sprint": int(sprint_seq.max()),
+        })
+
+    def compact(self):
+        """Merge undersized segments into segments of up to segment_size rows"""
+        small = [s for s in self._manifest["segments"] if s["rows"] < self.segment_size]
+        if len(small) < 2:
+            return
+        keep = [s for s in self._manifest["segments"] if s["rows"] >= self.segment_size]
+
+        merged = [self._read_segment(s, mmap=False) for s in small]
+        offsets = np.cumsum([0] + [s["rows"] for s in small[:-1]])
+        combined = {name: np.concatenate([m[name] for m in merged]) for name in COLUMNS}
+        combined["skill_row"] = np.concatenate([
+            m["skill_row"] + offset for m, offset in zip(merged, offsets)
+        ]).astype(np.int32)
+        combined["skill_code"] = np.concatenate([m["skill_code"] for m in merged])
+
+        self._manifest["segments"] = keep
+        total = len(combined["sprint_seq"])
+        for start in range(0, total, self.segment_size):
+            stop = min(start + self.segment_size, total)
+            chunk = {name: combined[name][start:stop] for name in COLUMNS}
+            in_chunk = (combined["skill_row"] >= start) & (combined["skill_row"] < stop)
+            chunk["skill_row"] = (combined["skill_row"][in_chunk] - start).astype(np.int32)
+            chunk["skill_code"] = combined["skill_code"][in_chunk]
+            self._write_segment(chunk)
+        self._write_manifest()
+
+        for segment in small:
+            segment_dir = self.root_dir / segment["name"]
+            for column_file in segment_dir.iterdir():
+                column_file.unlink()
+            segment_dir.rmdir()
+
+    def _read_segment(self, segment: Dict, mmap: bool = True) -> Dict[str, np.ndarray]:
+        segment_dir = self.root_dir / segment["name"]
+        mode = "r" if mmap else None
+        return {
+            name: np.load(segment_dir / f"{name}.npy", mmap_mode=mode)
+            for name in list(COLUMNS) + list(SKILL_COLUMNS)
+        }
+
+    def __len__(self) -> int:
+        return sum(s["rows"] for s in self._manifest["segments"]) + len(self._buffer["sprint_seq"])
+
+    def query(
+        self,
+        skill: Optional[str] = None,
+        member_id: Optional[str] = None,
+        min_complexity: Optional[float] = None,
+        max_complexity: Optional[float] = None,
+        priority: Optional[Priority] = None,
+        last_n_sprints: Optional[int] = None
+    ) -> Dict[str, float]:
+        """
+        Aggregate estimate error over outcomes matching all given filters
+
+        Example: estimate error for Python tasks over complexity 0.7 in the
+        last 10 sprints is ``query(skill="Python", min_complexity=0.7,
+        last_n_sprints=10)``.
+        """
+        # Unknown dictionary values cannot match anything
+        if skill is not None and skill not in self._skill_codes:
+            return self._aggregate([])
+        if member_id is not None and member_id not in self._member_codes:
+            return self._aggregate([])
+
+        min_sprint = None
+        if last_n_sprints is not None:
+            min_sprint = self._manifest["next_sprint_seq"] - last_n_sprints
+
+        parts = []
+        for segment in self._manifest["segments"]:
+            if min_sprint is not None and segment["max_sprint"] < min_sprint:
+                continue
+            parts.append(self._filter(
+                self._read_segment(segment), skill, member_id,
+                min_complexity, max_complexity, priority, min_sprint
+            ))
+        if self._buffer["sprint_seq"]:
+            parts.append(self._filter(
+                self._buffered_arrays(), skill, member_id,
+                min_complexity, max_complexity, priority, min_sprint
+            ))
+        return self._aggregate(parts)
+
+    def _filter(
+        self,
+        columns: Dict[str, np.ndarray],
+        skill: Optional[str],
+        member_id: Optional[str],
+        min_complexity: Optional[float],
+        max_complexity: Optional[float],
+        priority: Optional[Priority],
+        min_sprint: Optional[int]
+    ) -> Dict[str, np.ndarray]:
+        """Select the measure columns for rows matching the filters"""
+        mask = np.ones(len(columns["sprint_seq"]), dtype=bool)
+        if min_sprint is not None:
+            mask &= columns["sprint_seq"] >= min_sprint
+        if member_id is not None:
+            mask &= columns["member"] == self._member_codes[member_id]
+        if min_complexity is not None:
+            mask &= columns["complexity"] >= np.float32(min_complexity)
+        if max_complexity is not None:
+            mask &= columns["complexity"] <= np.float32(max_complexity)
+        if priority is not None:
+            mask &= columns["priority"] == PRIORITY_CODES[priority]
+        if skill is not None:
+            has_skill = np.zeros_like(mask)
+            has_skill[columns["skill_row"][columns["skill_code"] == self._skill_codes[skill]]] = True
+            mask &= has_skill
+        return {
+            "estimated_hours": columns["estimated_hours"][mask],
+            "actual_hours": columns["actual_hours"][mask],
+            "on_time": columns["on_time"][mask],
+        }
+
+    @staticmethod
+    def _aggregate(parts: List[Dict[str, np.ndarray]]) -> Dict[str, float]:
+        count = sum(len(p["estimated_hours"]) for p in parts)
+        if count == 0:
+            return {
+                "count": 0,
+                "mean_error": 0.0,
+                "mean_abs_error": 0.0,
+                "mean_error_percent": 0.0,
+                "on_time_rate": 0.0,
+            }
+        estimated = np.concatenate([p["estimated_hours"] for p in parts])
+        actual = np.concatenate([p["actual_hours"] for p in parts])
+        on_time = np.concatenate([p["on_time"] for p in parts])
+        error = actual - estimated
+        with np.errstate(divide="ignore", invalid="ignore"):
+            error_percent = np.where(estimated > 0, np.abs(error) / estimated * 100, 0.0)
+        return {
+            "count": count,
+            "mean_error": float(error.mean()),
+            "mean_abs_error": float(np.abs(error).mean()),
+            "mean_error_percent": float(error_percent.mean()),
+            "on_time_rate": float(on_time.mean()),
+        }
@@ -0,0 +1,125 @@
+from collections import deque
+from typing import Deque, Dict, Hashable, Optional, Tuple
+import math
+
+
+class RunningStats:
+    """
+    Constant-time streaming statistics for a single metric
+
+    Maintains a running mean/variance (Welford), an exponentially
+    weighted moving average and a fixed-size window of recent values.
+    """
+
+    def __init__(self, ewma_alpha: float = 0.3, window_size: int = 10):
+        self.ewma_alpha = ewma_alpha
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.ewma: Optional[float] = None
+        self.minimum: Optional[float] = None
+        self.maximum: Optional[float] = None
+
+        # Windowed statistics keep a running sum so reads stay O(1)
+        self._window: Deque[float] = deque(maxlen=window_size)
+        self._window_sum = 0.0
+        self._window_sq_sum = 0.0
+
+    def update(self, value: float):
+        """Fold a new observation into all aggregates"""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+        if self.ewma is None:
+            self.ewma = value
+        else:
+            self.ewma = self.ewma_alpha * value + (1 - self.ewma_alpha) * self.ewma
+
+        self.minimum = value if self.minimum is None else min(self.minimum, value)
+        self.maximum = value if self.maximum is None else max(self.maximum, value)
+
+        if len(self._window) == self._window.maxlen:
+            evicted = self._window[0]
+            self._window_sum -= evicted
+            self._window_sq_sum -= evicted * evicted
+        self._window.append(value)
+        self._window_sum += value
+        self._window_sq_sum += value * value
+
+    @property
+    def variance(self) -> float:
+        """Population variance of all observations"""
+        if self.count == 0:
+            return 0.0
+        return self._m2 / self.count
+
+    @property
+    def std(self) -> float:
+        """Population standard deviation of all observations"""
+        return math.sqrt(self.variance)
+
+    @property
+    def window_mean(self) -> float:
+        """Mean over the most recent window"""
+        if not self._window:
+            return 0.0
+        return self._window_sum / len(self._window)
+
+    @property
+    def window_std(self) -> float:
+        """Standard deviation over the most recent window"""
+        if not self._window:
+            return 0.0
+        mean = self.window_mean
+        variance = self._window_sq_sum / len(self._window) - mean * mean
+        return math.sqrt(max(variance, 0.0))
+
+    def summary(self) -> Dict[str, float]:
+        """Return a snapshot of all aggregates"""
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "std": self.std,
+            "ewma": self.ewma if self.ewma is not None else 0.0,
+            "min": self.minimum if self.minimum is not None else 0.0,
+            "max": self.maximum if self.maximum is not None else 0.0,
+            "window_mean": self.window_mean,
+            "window_std": self.window_std,
+        }
+
+
+class KeyedRunningStats:
+    """Lazily created RunningStats per key (member, skill, bucket, ...)"""
+
+    def __init__(self, ewma_alpha: float = 0.3, window_size: int = 10):
+        self.ewma_alpha = ewma_alpha
+        self.window_size = window_size
+        self._stats: Dict[Hashable, RunningStats] = {}
+
+    def update(self, key: Hashable, value: float):
+        """Fold a value into the aggregates for the given key"""
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = RunningStats(self.ewma_alpha, self.window_size)
+            self._stats[key] = stats
+        stats.update(value)
+
+    def get(self, key: Hashable) -> Optional[RunningStats]:
+        """Return aggregates for a key, or None if never seen"""
+        return self._stats.get(key)
+
+    def keys(self):
+        return self._stats.keys()
+
+    def summary(self) -> Dict[Hashable, Dict[str, float]]:
+        """Return summaries for every key"""
+        return {key: stats.summary() for key, stats in self._stats.items()}
+
+
+def complexity_bucket(complexity: float, num_buckets: int = 5) -> Tuple[float, float]:
+    """Map a 0.0-1.0 complexity onto a fixed-width bucket (lower, upper)"""
+    width = 1.0 / num_buckets
+    index = min(int(complexity / width), num_buckets - 1)
+    return (round(index * width, 4), round((index + 1) * width, 4))
@@ -0,0 +1,128 @@
+from typing import List, Dict, Optional, Tuple
+from datetime import datetime
+import numpy as np
+from src.data_model.assignment import Assignment
+from src.data_model.task import Task
+from src.feature_engine.scoring_weights import ScoringWeights, WeightRegistry
+from src.learning.history_store import was_on_time
+
+
+class WeightTuner:
+    """
+    Offline tuner for the composite assignment-score weights
+
+    Fits non-negative weights so that the assignment score tracks the
+    realised outcome of each assignment: on-time completion minus a
+    penalty for estimate error. Fitted weights are shrunk towards the
+    prior weight set when little history is available.
+    """
+
+    FEATURES = ("skill", "workload", "reliability", "urgency")
+
+    def __init__(self, error_weight: float = 0.5, prior_strength: float = 50.0, min_samples: int = 10):
+        """
+        Args:
+            error_weight: Penalty per unit of relative estimate error (capped at 1.0)
+            prior_strength: Pseudo-count of samples backing the prior weights
+            min_samples: Minimum number of finished assignments required to fit
+        """
+        self.error_weight = error_weight
+        self.prior_strength = prior_strength
+        self.min_samples = min_samples
+
+    def _training_data(self, assignments: List[Assignment], tasks: List[Task]) -> Tuple[np.ndarray, np.ndarray]:
+        """Feature matrix (as scored at assignment time) and outcome utility"""
+        task_map = {task.id: task for task in tasks}
+        rows, targets = [], []
+        for assignment in assignments:
+            task = task_map.get(assignment.task_id)
+            reasoning = assignment.reasoning
+            if task is None or assignment.actual_hours is None or "skill_match" not in reasoning:
+                continue
+            rows.append([
+                reasoning["skill_match"],
+                1.0 - min(reasoning["workload"], 1.0),
+                reasoning["reliability"],
+                reasoning["urgency"]
+            ])
+            estimated = assignment.estimated_hours
+            relative_error = abs(assignment.actual_hours - estimated) / estimated if estimated > 0 else 0.0
+            targets.append(float(was_on_time(assignment, task)) - self.error_weight * min(relative_error, 1.0))
+        return np.array(rows, dtype=float).reshape(-1, len(self.FEATURES)), np.array(targets, dtype=float)
+
+    @staticmethod
+    def _score_correlation(features: np.ndarray, targets: np.ndarray, weights: np.ndarray) -> float:
+        scores = features @ weights
+        if scores.std() == 0 or targets.std() == 0:
+            return 0.0
+        return float(np.corrcoef(scores, targets)[0, 1])
+
+    def fit(
+        self,
+        assignments: List[Assignment],
+        tasks: List[Task],
+        prior: Optional[ScoringWeights] = None,
+        version: Optional[str] = None
+    ) -> ScoringWeights:
+        """
+        Fit a new weight set from finished assignments
+
+        Returns the prior weights unchanged (apart from the version) when
+        there are fewer than min_samples usable assignments.
+        """
+        prior = prior or ScoringWeights()
+        prior_vector = np.array([
+            prior.weight_skill, prior.weight_workload, prior.weight_reliability, prior.weight_urgency
+        ])
+        features, targets = self._training_data(assignments, tasks)
+        n = len(targets)
+
+        fitted = prior_vector
+        if n >= self.min_samples:
+            from scipy.optimize import nnls
+
+            # Centre so the intercept does not leak into the weights
+            centred_features = features - features.mean(axis=0)
+            centred_targets = targets - targets.mean()
+            raw, _ = nnls(centred_features, centred_targets)
+            if raw.sum() > 0:
+                fitted = raw / raw.sum()
+
+        shrink = n / (n + self.prior_strength) if n >= self.min_samples else 0.0
+        weights = shrink * fitted + (1 - shrink) * prior_vector
+        weights = weights / weights.sum()
+
+        return ScoringWeights(
+            version=version or f"tuned-{datetime.utcnow():%Y%m%d%H%M%S}",
+            weight_skill=float(weights[0]),
+            weight_workload=float(weights[1]),
+            weight_reliability=float(weights[2]),
+            weight_urgency=float(weights[3]),
+            metrics={
+                "samples": float(n),
+                "prior_correlation": self._score_correlation(features, targets, prior_vector) if n else 0.0,
+                "fitted_correlation": self._score_correlation(features, targets, weights) if n else 0.0
+            }
+        )
+
+    def fit_profiles(
+        self,
+        history: Dict[str, Tuple[List[Assignment], List[Task]]],
+        registry: WeightRegistry,
+        version_prefix: Optional[str] = None,
+        activate: bool = True
+    ) -> Dict[str, ScoringWeights]:
+        """
+        Fit and register one weight set per team profile
+
+        Each profile is shrunk towards the registry's current default
+        weights, so small teams inherit the organisation-wide weights.
+        """
+        prefix = version_prefix or f"tuned-{datetime.utcnow():%Y%m%d%H%M%S}"
+        prior = registry.get()
+        fitted = {}
+        for profile, (assignments, tasks) in history.items():
+            weights = self.fit(assignments, tasks, prior=prior, version=f"{prefix}-{profile}")
+            registry.register(weights, activate=activate, profile=profile)
+            fitted[profile] = weights
+        return fitted
@@ -0,0 +1,92 @@
+from typing import List, Optional
+from abc import ABC, abstractmethod
+from config.settings import Settings
+from src.utils.logger import logger
+
+SYSTEM_PROMPT = (
+    "You explain task assignments made by an agile sprint planner. "
+    "Answer only with the requested JSON object."
+)
+
+
+class LLMProvider(ABC):
+    """Async text-completion backend used for rationale generation"""
+    name = "base"
+
+    @abstractmethod
+    async def complete(self, prompt: str) -> str:
+        """The model's answer to prompt (SYSTEM_PROMPT is added by the provider)"""
+
+
+class OpenAIProvider(LLMProvider):
+    """
+    OpenAI chat-completions provider
+
+    base_url can point at any OpenAI-compatible server, including the
+    local stub in src.llm.stub_server.
+    """
+    name = "openai"
+
+    def __init__(self, api_key: str, model: str, base_url: Optional[str] = None):
+        self.api_key = api_key
+        self.model = model
+        self.base_url = base_url
+        self._client = None
+
+    async def complete(self, prompt: str) -> str:
+        if self._client is None:
+            from openai import AsyncOpenAI
+
+            self._client = AsyncOpenAI(api_key=self.api_key, base_url=self.base_url)
+        response = await self._client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0
+        )
+        return response.choices[0].message.content
+
+
+class GeminiProvider(LLMProvider):
+    """Google Gemini provider"""
+    name = "gemini"
+
+    def __init__(self, api_key: str, model: str):
+        self.api_key = api_key
+        self.model = model
+        self._model = None
+
+    async def complete(self, prompt: str) -> str:
+        if self._model is None:
+            import google.generativeai as genai
+
+            genai.configure(api_key=self.api_key)
+            self._model = genai.GenerativeModel(self.model)
+        response = await self._model.generate_content_async(f"{SYSTEM_PROMPT}\n\n{prompt}")
+        return response.text
+
+
+def build_provider(name: str, settings: Settings) -> LLMProvider:
+    """Create a provider by name, validating the settings it needs"""
+    if name == "openai":
+        settings.require("openai_api_key", feature="OpenAI rationale provider")
+        return OpenAIProvider(settings.openai_api_key, settings.openai_model, settings.openai_base_url)
+    if name == "gemini":
+        settings.require("gemini_api_key", feature="Gemini rationale provider")
+        return GeminiProvider(settings.gemini_api_key, settings.gemini_model)
+    raise ValueError(f"Unknown LLM provider: {name}")
+
+
+def build_providers(settings: Settings) -> List[LLMProvider]:
+    """Primary then secondary provider, skipping any that are not configured"""
+    providers = []
+    for name in (settings.primary_llm, settings.secondary_llm):
+        if not name or any(p.name == name for p in providers):
+            continue
+        try:
+            providers.append(build_provider(name, settings))
+        except (RuntimeError, ValueError) as e:
+            logger.warning(f"Skipping LLM provider '{name}': {e}")
+    return providers
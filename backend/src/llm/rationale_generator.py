@@ -0,0 +1,199 @@
+from typing import List, Dict, Optional
+from collections import OrderedDict
+from datetime import datetime
+import asyncio
+import hashlib
+import json
+from src.data_model.assignment import Assignment
+from src.data_model.task import Task
+from src.data_model.team_member import TeamMember
+from src.llm.providers import LLMProvider
+from src.utils.logger import logger
+
+# Features sent to the model; the cache key covers all of them
+RATIONALE_FEATURES = (
+    "task_title", "required_skills", "priority", "member_name",
+    "member_skills", "skill_match", "workload", "reliability", "urgency"
+)
+
+
+def rationale_features(assignment: Assignment, task: Task, member: TeamMember) -> Dict:
+    """Compact, cache-friendly description of one assignment"""
+    reasoning = assignment.reasoning
+    return {
+        "assignment_id": assignment.id,
+        "task_id": assignment.task_id,
+        "member_id": assignment.member_id,
+        "task_title": task.title,
+        "required_skills": sorted(task.required_skills),
+        "priority": task.priority.value,
+        "member_name": member.name,
+        "member_skills": sorted(f"{s.name}:{s.proficiency:.1f}" for s in member.skills),
+        "skill_match": round(reasoning.get("skill_match", assignment.skill_compatibility_score), 2),
+        "workload": round(reasoning.get("workload", 0.0), 2),
+        "reliability": round(reasoning.get("reliability", 0.0), 2),
+        "urgency": round(reasoning.get("urgency", assignment.urgency_boost), 2),
+    }
+
+
+def template_rationale(features: Dict) -> str:
+    """Deterministic rationale used when no provider answers"""
+    return (
+        f"{features['member_name']} was chosen for '{features['task_title']}' with a "
+        f"{features['skill_match']:.0%} skill match, {features['workload']:.0%} prior workload "
+        f"and {features['reliability']:.0%} reliability (task urgency {features['urgency']:.0%})."
+    )
+
+
+class RationaleGenerator:
+    """
+    Batched, cached natural-language rationales for assignments
+
+    Assignments are grouped into batches of up to batch_size per prompt.
+    Each batch tries the providers in order (primary, then secondary)
+    under a per-provider concurrency limit and timeout, and falls back to
+    a template when every provider fails. Responses are cached by the
+    assignment features, so identical situations are never re-prompted.
+    """
+
+    def __init__(
+        self,
+        providers: List[LLMProvider],
+        batch_size: int = 20,
+        max_concurrency: int = 4,
+        timeout_seconds: float = 20.0,
+        cache_size: int = 10_000
+    ):
+        self.providers = providers
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self.timeout_seconds = timeout_seconds
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        # Semaphores are bound to a running loop, so they are created lazily
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    @staticmethod
+    def cache_key(features: Dict) -> str:
+        payload = json.dumps({k: features[k] for k in RATIONALE_FEATURES}, sort_keys=True)
+        return hashlib.sha1(payload.encode()).hexdigest()
+
+    @staticmethod
+    def build_prompt(batch: List[Dict]) -> str:
+        items = [
+            {"index": i, **{k: features[k] for k in RATIONALE_FEATURES}}
+            for i, features in enumerate(batch)
+        ]
+        return (
+            "For each assignment below, write one or two sentences explaining why the "
+            "member is a good fit for the task, using the skill match, workload (0 = idle), "
+            "reliability and urgency scores.\n"
+            'Respond with JSON: {"rationales": {"<index>": "<rationale>", ...}}\n\n'
+            f"Assignments:\n{json.dumps(items)}"
+        )
+
+    @staticmethod
+    def parse_response(text: str, batch_size: int) -> Dict[int, str]:
+        """Extract {index: rationale} from a model response"""
+        start, end = text.find("{"), text.rfind("}")
+        if start < 0 or end < start:
+            raise ValueError("No JSON object in response")
+        rationales = json.loads(text[start:end + 1]).get("rationales", {})
+        parsed = {int(index): str(value) for index, value in rationales.items()}
+        if not all(i in parsed for i in range(batch_size)):
+            raise ValueError("Response is missing rationales")
+        return parsed
+
+    def _semaphore(self, provider: LLMProvider) -> asyncio.Semaphore:
+        semaphore = self._semaphores.get(provider.name)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphores[provider.name] = semaphore
+        return semaphore
+
+    async def _generate_batch(self, batch: List[Dict]) -> Dict[str, Dict]:
+        prompt = self.build_prompt(batch)
+        for provider in self.providers:
+            try:
+                async with self._semaphore(provider):
+                    text = await asyncio.wait_for(provider.complete(prompt), self.timeout_seconds)
+                parsed = self.parse_response(text, len(batch))
+            except Exception as e:
+                logger.warning(f"Rationale provider '{provider.name}' failed: {e!r}")
+                continue
+            results = {}
+            for i, features in enumerate(batch):
+                self._remember(self.cache_key(features), parsed[i])
+                results[features["assignment_id"]] = {"text": parsed[i], "source": provider.name}
+            return results
+
+        return {
+            features["assignment_id"]: {"text": template_rationale(features), "source": "template"}
+            for features in batch
+        }
+
+    def _remember(self, key: str, text: str):
+        self._cache[key] = text
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    async def generate(self, items: List[Dict]) -> Dict[str, Dict]:
+        """
+        Rationales for assignment feature dicts (see rationale_features)
+
+        Returns:
+            {assignment_id: {"text": ..., "source": provider name | "cache" | "template"}}
+        """
+        results = {}
+        pending = []
+        for features in items:
+            cached = self._cache.get(self.cache_key(features))
+            if cached is not None:
+                results[features["assignment_id"]] = {"text": cached, "source": "cache"}
+            else:
+                pending.append(features)
+
+        batches = [pending[i:i + self.batch_size] for i in range(0, len(pending), self.batch_size)]
+        for batch_results in await asyncio.gather(*(self._generate_batch(b) for b in batches)):
+            results.update(batch_results)
+        return results
+
+
+class RationaleStore:
+    """Rationales per sprint, filled in after the plan response is sent"""
+
+    def __init__(self, max_sprints: int = 1000):
+        self.max_sprints = max_sprints
+        self._sprints: "OrderedDict[str, Dict]" = OrderedDict()
+
+    def start(self, sprint_id: str, assignments: List[Assignment]):
+        self._sprints[sprint_id] = {
+            "status": "pending",
+            "requested_at": datetime.utcnow(),
+            "rationales": {},
+            "_task_by_assignment": {a.id: (a.task_id, a.member_id) for a in assignments}
+        }
+        while len(self._sprints) > self.max_sprints:
+            self._sprints.popitem(last=False)
+
+    def complete(self, sprint_id: str, results: Dict[str, Dict]):
+        entry = self._sprints.get(sprint_id)
+        if entry is None:
+            return
+        for assignment_id, result in results.items():
+            task_id, member_id = entry["_task_by_assignment"][assignment_id]
+            entry["rationales"][task_id] = {"member_id": member_id, **result}
+        entry["status"] = "complete"
+
+    def fail(self, sprint_id: str, error: str):
+        entry = self._sprints.get(sprint_id)
+        if entry is not None:
+            entry["status"] = "failed"
+            entry["error"] = error
+
+    def get(self, sprint_id: str) -> Optional[Dict]:
+        entry = self._sprints.get(sprint_id)
+        if entry is None:
+            return None
+        return {k: v for k, v in entry.items() if not k.startswith("_")}
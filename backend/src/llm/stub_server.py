@@ -0,0 +1,65 @@
+"""
+Local OpenAI-compatible stub for exercising rationale generation
+
+Run it and point the OpenAI provider at it:
+
+    python -m src.llm.stub_server --port 8099
+    OPENAI_BASE_URL=http://127.0.0.1:8099/v1 OPENAI_API_KEY=stub RATIONALE_ENABLED=true ...
+"""
+import argparse
+import asyncio
+import json
+import time
+from collections import deque
+from fastapi import FastAPI, Request
+
+app = FastAPI(title="LLM stub")
+app.state.delay_seconds = 0.0
+app.state.requests = deque(maxlen=100)  # Recent request bodies and headers, for tests
+
+
+def stub_rationales(prompt: str) -> dict:
+    """Deterministic rationales for every assignment in a rationale prompt"""
+    items = json.loads(prompt.split("Assignments:\n", 1)[1])
+    return {
+        "rationales": {
+            str(item["index"]): (
+                f"{item['member_name']} fits '{item['task_title']}' "
+                f"(skill match {item['skill_match']:.0%}, workload {item['workload']:.0%})."
+            )
+            for item in items
+        }
+    }
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    app.state.requests.append({"body": body, "headers": dict(request.headers)})
+    if app.state.delay_seconds:
+        await asyncio.sleep(app.state.delay_seconds)
+    prompt = body["messages"][-1]["content"]
+    return {
+        "id": "chatcmpl-stub",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "stub"),
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": json.dumps(stub_rationales(prompt))},
+            "finish_reason": "stop"
+        }],
+        "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+    }
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="OpenAI-compatible LLM stub")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--delay", type=float, default=0.0, help="Artificial latency per request (seconds)")
+    args = parser.parse_args()
+    app.state.delay_seconds = args.delay
+    uvicorn.run(app, host=args.host, port=args.port)
@@ -1,4 +1,5 @@
 from fastapi import FastAPI
+from contextlib import asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
 import sys
 from pathlib import Path
@@ -6,15 +7,26 @@ from pathlib import Path
 # Add parent directory to path to import config
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from config.settings import settings
-from src.api.routes import router
-import uvicorn
+from config.settings import get_settings
+from src.api.routes import router, get_tenant_registry
+from src.api.profiling import ProfileStore, ProfilingMiddleware, build_admin_router
+
+settings = get_settings()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Recover this worker's persisted tenants (when STATE_DIR is set) before serving requests
+    tenant_registry = get_tenant_registry()
+    tenant_registry.load_persisted()
+    yield
+    tenant_registry.close()
 
 # Create FastAPI app
 app = FastAPI(
     title=settings.app_name,
     description="AI-powered Agile sprint planning and task assignment",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -29,6 +41,18 @@ app.add_middleware(
 # Include API routes
 app.include_router(router)
 
+# Opt-in request profiling (see PROFILING_* settings)
+if settings.profiling_enabled:
+    settings.require("profiling_admin_token", feature="Request profiling")
+    profile_store = ProfileStore(settings.profiling_dir, settings.profiling_max_profiles)
+    app.add_middleware(
+        ProfilingMiddleware,
+        store=profile_store,
+        admin_token=settings.profiling_admin_token,
+        sample_rate=settings.profiling_sample_rate
+    )
+    app.include_router(build_admin_router(profile_store, settings.profiling_admin_token))
+
 @app.get("/")
 def root():
     return {
@@ -42,6 +66,8 @@ def health_check():
     return {"status": "healthy"}
 
 if __name__ == "__main__":
+    import uvicorn
+    
     uvicorn.run(
         "src.main:app",
         host=settings.host,
@@ -0,0 +1,207 @@
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from pathlib import Path
+import json
+import os
+import queue
+import threading
+import time
+import zlib
+from pydantic_core import to_json
+from src.utils.logger import logger
+
+SEGMENT_PREFIX = "wal-"
+SEGMENT_SUFFIX = ".log"
+
+
+def _segment_name(first_seq: int) -> str:
+    return f"{SEGMENT_PREFIX}{first_seq:012d}{SEGMENT_SUFFIX}"
+
+
+def _encode(seq: int, event_type: str, data: Any) -> bytes:
+    payload = to_json({"seq": seq, "type": event_type, "data": data})
+    return f"{zlib.crc32(payload):08x} ".encode() + payload + b"\n"
+
+
+def _decode(line: bytes) -> Optional[Dict]:
+    """Parse one log line; None for a torn or corrupt record"""
+    if not line.endswith(b"\n") or len(line) < 10 or line[8:9] != b" ":
+        return None
+    payload = line[9:-1]
+    try:
+        if int(line[:8], 16) != zlib.crc32(payload):
+            return None
+        return json.loads(payload)
+    except ValueError:
+        return None
+
+
+class EventLog:
+    """
+    Append-only, segmented write-ahead log with group commit
+
+    Each record is one CRC-protected JSON line with a sequence number.
+    append() only enqueues; a single writer thread collects everything
+    queued within group_commit_ms, writes it and fsyncs once, so
+    concurrent writers share one disk sync. wait() blocks until a
+    sequence number is durable.
+
+    A new segment (wal-<first seq>.log) is started on open and by
+    rotate(), which lets a snapshot drop every older segment.
+    """
+
+    def __init__(self, directory: str, group_commit_ms: float = 2.0, fsync: bool = True):
+        self.directory = Path(directory)
+        self.group_commit_ms = group_commit_ms
+        self.fsync = fsync
+        self.last_seq = 0
+        self.commits = 0  # Number of disk syncs, for group-commit diagnostics
+        self._durable_seq = 0
+        self._error: Optional[BaseException] = None
+        self._lock = threading.Lock()
+        self._durable = threading.Condition()
+        self._queue: "queue.Queue[Tuple]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+
+    def segments(self) -> List[Tuple[int, Path]]:
+        """(first seq, path) of every segment, oldest first"""
+        found = []
+        for path in self.directory.glob(f"{SEGMENT_PREFIX}*{SEGMENT_SUFFIX}"):
+            try:
+                found.append((int(path.name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)]), path))
+            except ValueError:
+                continue
+        return sorted(found)
+
+    def replay(self, after_seq: int = 0) -> Iterator[Tuple[int, str, Any]]:
+        """
+        Yield (seq, type, data) for every logged event after after_seq
+
+        A torn or corrupt record ends the log: the segment is truncated
+        there and any later segments are removed, so the next run appends
+        after the last good record.
+        """
+        self.last_seq = max(self.last_seq, after_seq)
+        segments = self.segments()
+        for position, (_, path) in enumerate(segments):
+            offset = 0
+            with path.open("rb") as segment:
+                for line in segment:
+                    record = _decode(line)
+                    if record is None:
+                        self._truncate(path, offset, [p for _, p in segments[position + 1:]])
+                        return
+                    offset += len(line)
+                    seq = record["seq"]
+                    self.last_seq = max(self.last_seq, seq)
+                    if seq > after_seq:
+                        yield seq, record["type"], record["data"]
+
+    @staticmethod
+    def _truncate(path: Path, offset: int, later_segments: List[Path]):
+        logger.warning(f"Event log: discarding torn record in {path.name} at byte {offset}")
+        with path.open("r+b") as segment:
+            segment.truncate(offset)
+        for later in later_segments:
+            logger.warning(f"Event log: discarding {later.name} after the torn record")
+            later.unlink()
+
+    def open(self):
+        """Start writing a new segment after the last replayed event"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._durable_seq = self.last_seq
+        self._writer = threading.Thread(target=self._write_loop, name="event-log-writer", daemon=True)
+        self._writer.start()
+
+    def append(self, event_type: str, data: Any) -> int:
+        """Queue an event; returns its sequence number (see wait())"""
+        if self._writer is None:
+            raise RuntimeError("Event log is not open")
+        with self._lock:
+            self.last_seq += 1
+            seq = self.last_seq
+            # Encoded under the lock so queue order matches sequence order
+            self._queue.put(("event", seq, _encode(seq, event_type, data)))
+        return seq
+
+    def wait(self, seq: int):
+        """Block until every event up to seq is on disk"""
+        with self._durable:
+            while self._durable_seq < seq and self._error is None:
+                self._durable.wait()
+            if self._error is not None:
+                raise RuntimeError("Event log writer failed") from self._error
+
+    def rotate(self) -> int:
+        """Start a new segment after all queued events; returns its first seq"""
+        done = threading.Event()
+        with self._lock:
+            first_seq = self.last_seq + 1
+            self._queue.put(("rotate", first_seq, done))
+        done.wait()
+        return first_seq
+
+    def drop_segments_before(self, seq: int):
+        """Delete segments that only contain events before seq"""
+        segments = self.segments()
+        for (_, path), (next_first, _) in zip(segments, segments[1:]):
+            if next_first <= seq:
+                path.unlink()
+
+    def close(self):
+        """Flush queued events and stop the writer"""
+        if self._writer is None:
+            return
+        self._queue.put(("stop", None, None))
+        self._writer.join()
+        self._writer = None
+
+    def _open_segment(self, first_seq: int):
+        return (self.directory / _segment_name(first_seq)).open("ab")
+
+    def _sync(self, segment):
+        segment.flush()
+        if self.fsync:
+            os.fsync(segment.fileno())
+        self.commits += 1
+
+    def _next_batch(self) -> List[Tuple]:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.group_commit_ms / 1000
+        while batch[-1][0] == "event":
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write_loop(self):
+        segment = self._open_segment(self.last_seq + 1)
+        running = True
+        try:
+            while running:
+                durable_seq = None
+                for kind, seq, payload in self._next_batch():
+                    if kind == "event":
+                        segment.write(payload)
+                        durable_seq = seq
+                        continue
+                    self._sync(segment)
+                    segment.close()
+                    if kind == "rotate":
+                        segment = self._open_segment(seq)
+                        payload.set()
+                    else:
+                        running = False
+                if running and durable_seq is not None:
+                    self._sync(segment)
+                with self._durable:
+                    if durable_seq is not None:
+                        self._durable_seq = durable_seq
+                    self._durable.notify_all()
+        except BaseException as e:
+            logger.error(f"Event log writer failed: {e!r}")
+            with self._durable:
+                self._error = e
+                self._durable.notify_all()
+            segment.close()
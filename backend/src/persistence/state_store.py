@@ -0,0 +1,284 @@
+from typing import Any, Dict, List, Optional
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+import os
+import threading
+import time
+from pydantic import BaseModel
+from pydantic_core import to_json
+from src.data_model.team_member import TeamMember
+from src.data_model.task import Task, TaskStatus
+from src.data_model.sprint import Sprint
+from src.data_model.assignment import Assignment
+from src.persistence.event_log import EventLog
+from src.utils.logger import logger
+
+SNAPSHOT_PREFIX = "snapshot-"
+SNAPSHOT_SUFFIX = ".json"
+
+
+class Snapshot(BaseModel):
+    """Compact image of the planner state as of one log sequence number"""
+    seq: int
+    created_at: datetime
+    team_members: List[TeamMember] = []
+    tasks: List[Task] = []
+    sprints: List[Sprint] = []
+    feedback: List[Dict[str, Any]] = []
+    analytics: Dict[str, Any] = {}
+    assignments: Dict[str, Any] = {}
+
+
+class PlannerState:
+    """
+    The mutable planner state covered by the event log
+
+    Holds references to the API's in-memory lists (and optionally a
+    FeedbackLoop, SprintAnalytics and AssignmentLedger), so recovery fills
+    them in place. Events are applied
+    by the _apply_<event type> methods and upsert by id, so replaying an
+    event twice is harmless.
+    """
+
+    def __init__(
+        self,
+        team_members: List[TeamMember],
+        tasks: List[Task],
+        sprints: List[Sprint],
+        feedback_loop=None,
+        analytics=None,
+        ledger=None
+    ):
+        self.team_members = team_members
+        self.tasks = tasks
+        self.sprints = sprints
+        self.feedback_loop = feedback_loop
+        self.analytics = analytics
+        self.ledger = ledger
+        self._positions: Dict[int, Dict[str, int]] = {}
+
+    def to_snapshot(self, seq: int) -> Snapshot:
+        return Snapshot.model_construct(
+            seq=seq,
+            created_at=datetime.utcnow(),
+            team_members=list(self.team_members),
+            tasks=list(self.tasks),
+            sprints=list(self.sprints),
+            feedback=list(self.feedback_loop.historical_data) if self.feedback_loop is not None else [],
+            analytics=self.analytics.export() if self.analytics is not None else {},
+            assignments=self.ledger.export() if self.ledger is not None else {}
+        )
+
+    def load_snapshot(self, snapshot: Snapshot):
+        self.team_members[:] = snapshot.team_members
+        self.tasks[:] = snapshot.tasks
+        self.sprints[:] = snapshot.sprints
+        if self.feedback_loop is not None:
+            self.feedback_loop.historical_data.clear()
+            for record in snapshot.feedback:
+                self.feedback_loop.restore_feedback(record)
+        if self.analytics is not None:
+            self.analytics.restore(snapshot.analytics)
+        if self.ledger is not None:
+            self.ledger.restore(snapshot.assignments)
+        self._positions.clear()
+
+    def apply(self, event_type: str, data: Dict):
+        handler = getattr(self, f"_apply_{event_type}", None)
+        if handler is None:
+            raise ValueError(f"Unknown event type: {event_type}")
+        handler(data)
+
+    def _upsert(self, items: List, item):
+        positions = self._positions.get(id(items))
+        if positions is None:
+            positions = {existing.id: i for i, existing in enumerate(items)}
+            self._positions[id(items)] = positions
+        position = positions.get(item.id)
+        if position is None:
+            positions[item.id] = len(items)
+            items.append(item)
+        else:
+            items[position] = item
+
+    def _apply_member_created(self, data: Dict):
+        self._upsert(self.team_members, TeamMember.model_validate(data["member"]))
+
+    def _apply_task_created(self, data: Dict):
+        self._upsert(self.tasks, Task.model_validate(data["task"]))
+
+    def _apply_plan_committed(self, data: Dict):
+        sprint = Sprint.model_validate(data["sprint"])
+        sprint_tasks = [Task.model_validate(task) for task in data["tasks"]]
+        self._upsert(self.sprints, sprint)
+        for task in sprint_tasks:
+            self._upsert(self.tasks, task)
+        for member in data["members"]:
+            self._upsert(self.team_members, TeamMember.model_validate(member))
+        if self.analytics is not None:
+            self.analytics.open_sprint(sprint, sprint_tasks)
+        if self.ledger is not None:
+            self.ledger.record(Assignment.model_validate(a) for a in data.get("assignments", []))
+
+    def _apply_task_status_changed(self, data: Dict):
+        task = Task.model_validate(data["task"])
+        self._upsert(self.tasks, task)
+        if data.get("sprint") is not None:
+            self._upsert(self.sprints, Sprint.model_validate(data["sprint"]))
+        previous = data.get("previous")
+        if self.analytics is not None and previous is not None and previous != task.status:
+            self.analytics.record_transition(task, TaskStatus(previous), datetime.fromisoformat(data["at"]))
+        if self.ledger is not None and task.status == TaskStatus.COMPLETED:
+            self.ledger.release(task.id)
+
+    def _apply_sprint_closed(self, data: Dict):
+        sprint = Sprint.model_validate(data["sprint"])
+        self._upsert(self.sprints, sprint)
+        for task in data["tasks"]:
+            task = Task.model_validate(task)
+            self._upsert(self.tasks, task)
+            if self.ledger is not None and task.assigned_to is None:
+                self.ledger.release(task.id)  # Carried over
+        for member in data["members"]:
+            self._upsert(self.team_members, TeamMember.model_validate(member))
+        if self.analytics is not None:
+            self.analytics.close_sprint(sprint.id, datetime.fromisoformat(data["at"]))
+
+    def _apply_feedback_recorded(self, data: Dict):
+        if self.feedback_loop is not None:
+            self.feedback_loop.restore_feedback(data["feedback"])
+
+
+class StateStore:
+    """
+    Crash recovery for planner state: event log plus periodic snapshots
+
+    Mutations run inside mutation(), which serializes them with
+    snapshots, and log what they changed with record(). The caller
+    returns once its events are durable; appends from concurrent
+    requests are group-committed. Every snapshot_interval events the
+    state is written to a snapshot and older log segments are deleted,
+    so recovery reads one snapshot plus at most snapshot_interval events.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        state: PlannerState,
+        snapshot_interval: int = 10_000,
+        group_commit_ms: float = 2.0,
+        fsync: bool = True
+    ):
+        self.directory = Path(directory)
+        self.state = state
+        self.snapshot_interval = snapshot_interval
+        self.log = EventLog(self.directory, group_commit_ms=group_commit_ms, fsync=fsync)
+        self.lock = threading.RLock()
+        self._snapshot_seq = 0
+        self._snapshotting = False
+
+    def _snapshots(self) -> List[Path]:
+        return sorted(self.directory.glob(f"{SNAPSHOT_PREFIX}*{SNAPSHOT_SUFFIX}"))
+
+    def recover(self) -> Dict[str, float]:
+        """
+        Load the latest snapshot, replay the log tail and open the log
+
+        Returns:
+            {"snapshot_seq", "replayed_events", "seconds"}
+        """
+        start = time.perf_counter()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with self.lock:
+            snapshots = self._snapshots()
+            if snapshots:
+                snapshot = Snapshot.model_validate_json(snapshots[-1].read_bytes())
+                self.state.load_snapshot(snapshot)
+                self._snapshot_seq = snapshot.seq
+
+            replayed = 0
+            for _, event_type, data in self.log.replay(after_seq=self._snapshot_seq):
+                self.state.apply(event_type, data)
+                replayed += 1
+            self.log.open()
+
+        stats = {
+            "snapshot_seq": self._snapshot_seq,
+            "replayed_events": replayed,
+            "seconds": time.perf_counter() - start
+        }
+        logger.info(
+            f"Recovered planner state from snapshot {stats['snapshot_seq']} "
+            f"and {replayed} events in {stats['seconds']:.3f}s"
+        )
+        return stats
+
+    @contextmanager
+    def mutation(self):
+        """
+        Scope of one state change
+
+        Holds the state lock while the body mutates state and records
+        events, then waits (without the lock) until they are durable.
+        """
+        with self.lock:
+            yield
+            seq = self.log.last_seq
+        self.log.wait(seq)
+        self._maybe_snapshot()
+
+    def record(self, event_type: str, data: Dict[str, Any]) -> int:
+        """Log an event describing a change made inside mutation()"""
+        with self.lock:
+            return self.log.append(event_type, data)
+
+    def _maybe_snapshot(self):
+        with self.lock:
+            if self._snapshotting or self.log.last_seq - self._snapshot_seq < self.snapshot_interval:
+                return
+            self._snapshotting = True
+        try:
+            self.snapshot()
+        finally:
+            self._snapshotting = False
+
+    def snapshot(self) -> int:
+        """Write a snapshot of the current state; returns its sequence number"""
+        with self.lock:
+            seq = self.log.last_seq
+            payload = to_json(self.state.to_snapshot(seq))
+            self.log.rotate()
+
+        path = self.directory / f"{SNAPSHOT_PREFIX}{seq:012d}{SNAPSHOT_SUFFIX}"
+        temporary = path.with_suffix(".tmp")
+        with temporary.open("wb") as snapshot_file:
+            snapshot_file.write(payload)
+            snapshot_file.flush()
+            if self.log.fsync:
+                os.fsync(snapshot_file.fileno())
+        os.replace(temporary, path)
+        if self.log.fsync:
+            self._fsync_directory()
+
+        self._snapshot_seq = seq
+        self.log.drop_segments_before(seq + 1)
+        for older in self._snapshots():
+            if older != path:
+                older.unlink()
+        return seq
+
+    def _fsync_directory(self):
+        if os.name != "posix":
+            return
+        descriptor = os.open(self.directory, os.O_RDONLY)
+        try:
+            os.fsync(descriptor)
+        finally:
+            os.close(descriptor)
+
+    def close(self, snapshot: bool = True):
+        """Stop the log writer, writing a final snapshot so the next start replays nothing"""
+        if snapshot and self.log.last_seq > self._snapshot_seq:
+            self.snapshot()
+        self.log.close()
@@ -0,0 +1,296 @@
+from typing import List, Dict, Optional
+from datetime import datetime, timedelta, timezone
+import heapq
+import numpy as np
+from pydantic import BaseModel
+from src.data_model.team_member import TeamMember
+from src.data_model.task import Task, TaskStatus, PRIORITY_WEIGHTS
+from src.decision_engine.matrix_assigner import PlanningMatrices
+from src.feature_engine.planning_context import PlanningContext
+from src.feature_engine.scoring_weights import WeightRegistry
+
+
+class ScheduledTask(BaseModel):
+    """Placement of one backlog task on the roadmap"""
+    task_id: str
+    member_id: str
+    sprint_index: int
+    completion_date: datetime  # End of the sprint the task is planned in
+    is_late: bool
+
+
+class SprintForecast(BaseModel):
+    """Planned load of one future sprint"""
+    index: int
+    start_date: datetime
+    end_date: datetime
+    capacity_hours: float
+    planned_hours: float
+    utilization: float
+    task_count: int
+    completed_fraction: float  # Share of backlog hours done by the end of this sprint
+
+
+class RoadmapPlan(BaseModel):
+    """Multi-sprint plan and release forecast for a backlog"""
+    as_of: datetime
+    sprint_length_days: int
+    sprints: List[SprintForecast]
+    scheduled: List[ScheduledTask]
+    unscheduled: Dict[str, str] = {}  # task_id -> reason ("skills", "capacity", "dependency")
+    late_task_ids: List[str] = []
+    release_date: Optional[datetime] = None  # End of the last used sprint, if everything fits
+
+
+class HorizonPlanner:
+    """
+    Rolling-horizon roadmap planner
+
+    Places the whole backlog over K future sprints in one pass. Tasks are
+    taken in dependency order, most deadline-critical first (a task
+    inherits the earliest due sprint of anything that depends on it), and
+    each task goes into the earliest sprint where its dependencies are
+    done and a qualified member has capacity left. The member is chosen
+    with the usual composite score, using that sprint's workload.
+    """
+
+    def __init__(
+        self,
+        weight_registry: Optional[WeightRegistry] = None,
+        sprint_length_days: int = 14,
+        dependency_lag: int = 1
+    ):
+        """
+        Args:
+            weight_registry: Source of the active scoring weights
+            sprint_length_days: Length of every future sprint
+            dependency_lag: Sprints between a task and its dependents
+                (1 = dependents start the sprint after; 0 = same sprint allowed)
+        """
+        self.weight_registry = weight_registry or WeightRegistry()
+        self.sprint_length_days = sprint_length_days
+        self.dependency_lag = dependency_lag
+
+    def member_capacity(self, team_members: List[TeamMember], num_sprints: int, as_of: datetime) -> np.ndarray:
+        """
+        Assignable hours per member and sprint, shape (members, sprints)
+
+        Uses each member's max utilization, removes leave that overlaps a
+        sprint and the current workload from the first sprint.
+        """
+        length = timedelta(days=self.sprint_length_days)
+        capacity = np.zeros((len(team_members), num_sprints))
+        for i, member in enumerate(team_members):
+            if not member.availability:
+                continue
+            per_sprint = member.total_hours_available * member.max_workload_percent
+            for s in range(num_sprints):
+                start = as_of + s * length
+                capacity[i, s] = per_sprint * (1.0 - self._leave_fraction(member, start, start + length))
+            capacity[i, 0] = max(capacity[i, 0] - member.current_workload, 0.0)
+        return capacity
+
+    @staticmethod
+    def _leave_fraction(member: TeamMember, start: datetime, end: datetime) -> float:
+        if member.leave_start is None or member.leave_end is None:
+            # Open-ended leave blocks the whole horizon
+            return 1.0 if member.on_leave else 0.0
+        leave_start = _naive_utc(member.leave_start)
+        leave_end = _naive_utc(member.leave_end)
+        overlap = (min(end, leave_end) - max(start, leave_start)).total_seconds()
+        return min(max(overlap, 0.0) / (end - start).total_seconds(), 1.0)
+
+    def _dependencies(self, tasks: List[Task]) -> List[List[int]]:
+        """In-backlog prerequisites of every task, from depends_on and blocks"""
+        index = {task.id: i for i, task in enumerate(tasks)}
+        prerequisites = [set() for _ in tasks]
+        for i, task in enumerate(tasks):
+            for dependency in task.depends_on:
+                if dependency in index:
+                    prerequisites[i].add(index[dependency])
+            for blocked in task.blocks:
+                if blocked in index:
+                    prerequisites[index[blocked]].add(i)
+        return [sorted(p) for p in prerequisites]
+
+    def plan(
+        self,
+        tasks: List[Task],
+        team_members: List[TeamMember],
+        num_sprints: int,
+        weight_profile: Optional[str] = None,
+        as_of: Optional[datetime] = None
+    ) -> RoadmapPlan:
+        """
+        Plan the backlog over num_sprints sprints starting at as_of
+
+        Completed tasks are ignored and already assigned tasks are taken
+        to finish in the current sprint (their hours are part of the
+        members' current workload); dependencies on tasks outside the
+        backlog count as satisfied. Nothing passed in is modified.
+
+        Raises:
+            ValueError: if the backlog's dependencies contain a cycle
+        """
+        backlog = [task for task in tasks if task.status != TaskStatus.COMPLETED]
+        context = PlanningContext(backlog, as_of)
+        as_of = context.as_of
+
+        prerequisites = self._dependencies(backlog)
+        dependents = [[] for _ in backlog]
+        for i, deps in enumerate(prerequisites):
+            for dep in deps:
+                dependents[dep].append(i)
+        topological = self._topological_order(backlog, prerequisites, dependents)
+
+        # Sprint in which each task is due, tightened by its dependents' deadlines
+        days_left = np.array([(task.deadline - as_of).total_seconds() / 86400.0 for task in backlog])
+        due = np.floor(days_left / self.sprint_length_days).astype(int)
+        for i in reversed(topological):
+            for dependent in dependents[i]:
+                due[i] = min(due[i], due[dependent] - self.dependency_lag)
+
+        matrices = PlanningMatrices(backlog, team_members, context)
+        weights = self.weight_registry.get(weight_profile)
+        static_scores, skill_ok = matrices.static_scores(weights)
+        hours = matrices.hours
+        priority = [PRIORITY_WEIGHTS[task.priority] for task in backlog]
+
+        capacity = self.member_capacity(team_members, num_sprints, as_of)
+        remaining = capacity.copy()
+        base_hours = np.array([m.total_hours_available for m in team_members], dtype=float)
+        used = np.zeros_like(capacity)
+        used[:, 0] = [m.current_workload for m in team_members]
+        safe_base = np.where(base_hours > 0, base_hours, 1.0)
+
+        # Tasks already assigned are in flight: done by the end of the current sprint
+        in_flight = np.array([task.is_assigned() for task in backlog], dtype=bool)
+        sprint_of = np.full(len(backlog), -1, dtype=int)
+        sprint_of[in_flight] = 0
+        member_of = np.full(len(backlog), -1, dtype=int)
+        unscheduled: Dict[str, str] = {}
+
+        pending = [len(deps) for deps in prerequisites]
+        heap = [(due[i], -priority[i], i) for i in range(len(backlog)) if not pending[i]]
+        heapq.heapify(heap)
+        while heap:
+            _, _, t = heapq.heappop(heap)
+            for dependent in dependents[t]:
+                pending[dependent] -= 1
+                if not pending[dependent]:
+                    heapq.heappush(heap, (due[dependent], -priority[dependent], dependent))
+
+            if in_flight[t]:
+                continue
+            if any(sprint_of[dep] < 0 for dep in prerequisites[t]):
+                unscheduled[backlog[t].id] = "dependency"
+                continue
+            if not skill_ok[t].any():
+                unscheduled[backlog[t].id] = "skills"
+                continue
+
+            earliest = max((sprint_of[dep] + self.dependency_lag for dep in prerequisites[t]), default=0)
+            fits = skill_ok[t][:, None] & (remaining[:, earliest:] >= hours[t])
+            open_sprints = fits.any(axis=0)
+            if not open_sprints.any():
+                unscheduled[backlog[t].id] = "capacity"
+                continue
+
+            s = earliest + int(np.argmax(open_sprints))
+            workload_penalty = 1.0 - np.minimum(used[:, s] / safe_base, 1.0)
+            scores = static_scores[t] + weights.weight_workload * workload_penalty
+            scores[~fits[:, s - earliest]] = -np.inf
+            m = int(np.argmax(scores))
+
+            sprint_of[t] = s
+            member_of[t] = m
+            remaining[m, s] -= hours[t]
+            used[m, s] += hours[t]
+
+        return self._build_plan(backlog, team_members, as_of, capacity, sprint_of, member_of, in_flight, unscheduled)
+
+    @staticmethod
+    def _topological_order(tasks: List[Task], prerequisites: List[List[int]], dependents: List[List[int]]) -> List[int]:
+        pending = [len(deps) for deps in prerequisites]
+        order = [i for i in range(len(tasks)) if not pending[i]]
+        for i in order:
+            for dependent in dependents[i]:
+                pending[dependent] -= 1
+                if not pending[dependent]:
+                    order.append(dependent)
+        if len(order) < len(tasks):
+            cyclic = sorted(tasks[i].id for i in range(len(tasks)) if pending[i])
+            raise ValueError(f"Task dependencies contain a cycle: {cyclic}")
+        return order
+
+    def _build_plan(
+        self,
+        backlog: List[Task],
+        team_members: List[TeamMember],
+        as_of: datetime,
+        capacity: np.ndarray,
+        sprint_of: np.ndarray,
+        member_of: np.ndarray,
+        in_flight: np.ndarray,
+        unscheduled: Dict[str, str]
+    ) -> RoadmapPlan:
+        length = timedelta(days=self.sprint_length_days)
+        num_sprints = capacity.shape[1]
+        hours = np.array([task.estimated_hours for task in backlog], dtype=float)
+        scheduled_mask = (sprint_of >= 0) & ~in_flight
+
+        planned_hours = np.bincount(sprint_of[scheduled_mask], weights=hours[scheduled_mask], minlength=num_sprints)
+        task_counts = np.bincount(sprint_of[scheduled_mask], minlength=num_sprints)
+        total_hours = hours[~in_flight].sum()
+        cumulative = np.cumsum(planned_hours) / total_hours if total_hours > 0 else np.ones(num_sprints)
+        sprint_capacity = capacity.sum(axis=0)
+
+        sprints = [
+            SprintForecast(
+                index=s,
+                start_date=as_of + s * length,
+                end_date=as_of + (s + 1) * length,
+                capacity_hours=float(sprint_capacity[s]),
+                planned_hours=float(planned_hours[s]),
+                utilization=float(planned_hours[s] / sprint_capacity[s]) if sprint_capacity[s] > 0 else 0.0,
+                task_count=int(task_counts[s]),
+                completed_fraction=float(cumulative[s])
+            )
+            for s in range(num_sprints)
+        ]
+
+        scheduled = []
+        late_task_ids = []
+        for t in np.flatnonzero(scheduled_mask):
+            task = backlog[t]
+            completion = as_of + (int(sprint_of[t]) + 1) * length
+            is_late = completion > task.deadline
+            if is_late:
+                late_task_ids.append(task.id)
+            scheduled.append(ScheduledTask(
+                task_id=task.id,
+                member_id=team_members[member_of[t]].id,
+                sprint_index=int(sprint_of[t]),
+                completion_date=completion,
+                is_late=is_late
+            ))
+
+        release_date = None
+        if not unscheduled and scheduled:
+            release_date = as_of + (int(sprint_of[scheduled_mask].max()) + 1) * length
+
+        return RoadmapPlan(
+            as_of=as_of,
+            sprint_length_days=self.sprint_length_days,
+            sprints=sprints,
+            scheduled=scheduled,
+            unscheduled=unscheduled,
+            late_task_ids=late_task_ids,
+            release_date=release_date
+        )
+
+
+def _naive_utc(value: datetime) -> datetime:
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
@@ -0,0 +1,241 @@
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+from datetime import datetime, timedelta
+from pathlib import Path
+import json
+import random
+import threading
+import time
+import uuid
+import numpy as np
+from pydantic import TypeAdapter
+from src.data_model.assignment import Assignment
+from src.data_model.sprint import Sprint
+from src.data_model.task import Task
+from src.data_model.team_member import TeamMember
+from src.decision_engine.assignment_ledger import AssignmentLedger
+from src.decision_engine.candidate_index import CandidateIndex
+from src.decision_engine.constraints import Constraint
+from src.utils.logger import logger
+
+RECORD_PREFIX = "plans-"
+
+_constraint_list = TypeAdapter(List[Constraint])
+
+
+def plan_quality(sprint: Sprint, assignments: Sequence[Assignment], team_members: Sequence[TeamMember]) -> Dict[str, Any]:
+    """
+    Quality metrics of a finished plan (members' workloads include it)
+
+    workload_std is the standard deviation of member utilization, the
+    spread SprintOptimizer uses when classifying risk.
+    """
+    utilization = np.array([member.workload_utilization() for member in team_members], dtype=float)
+    return {
+        "total_score": float(sum(a.final_score for a in assignments)),
+        "workload_std": float(utilization.std()) if utilization.size else 0.0,
+        "is_feasible": sprint.is_feasible,
+        "risk_level": sprint.risk_level,
+        "assigned_tasks": len(assignments),
+        "planned_tasks": sprint.planned_tasks
+    }
+
+
+class PlanCapture:
+    """
+    Anonymized inputs of one planning run, taken before the plan mutates them
+
+    Members and tasks are renamed m0, m1, ... and t0, t1, ... (names,
+    emails, titles and descriptions are dropped; skills, hours, dates
+    and dependencies are kept, since planning depends on them). finish()
+    adds the outcome under the same pseudonyms.
+    """
+
+    def __init__(
+        self,
+        team_members: Sequence[TeamMember],
+        backlog: Sequence[Task],
+        constraints: Sequence[Constraint],
+        duration_days: int,
+        as_of: datetime,
+        weight_profile: Optional[str] = None,
+        weights_version: Optional[str] = None
+    ):
+        self._members = {member.id: f"m{i}" for i, member in enumerate(team_members)}
+        self._tasks = {task.id: f"t{i}" for i, task in enumerate(backlog)}
+        self.record: Dict[str, Any] = {
+            "id": uuid.uuid4().hex,
+            "recorded_at": datetime.utcnow().isoformat(),
+            "duration_days": duration_days,
+            "as_of": as_of.isoformat(),
+            "weight_profile": weight_profile,
+            "weights_version": weights_version,
+            "team": [self._member(member) for member in team_members],
+            "backlog": [self._task(task) for task in backlog],
+            "constraints": [self._constraint(c) for c in _constraint_list.dump_python(list(constraints), mode="json")]
+        }
+
+    def _task_alias(self, task_id: str) -> str:
+        # Dependencies and constraints may name tasks outside the backlog
+        return self._tasks.setdefault(task_id, f"t{len(self._tasks)}")
+
+    def _member_alias(self, member_id: str) -> str:
+        return self._members.setdefault(member_id, f"m{len(self._members)}")
+
+    def _member(self, member: TeamMember) -> Dict[str, Any]:
+        data = member.model_dump(mode="json", exclude_none=True)
+        data.update(id=self._members[member.id], name="", email="")
+        return data
+
+    def _task(self, task: Task) -> Dict[str, Any]:
+        data = task.model_dump(mode="json", exclude_none=True, exclude={"assigned_to", "sprint_id"})
+        data.update(
+            id=self._tasks[task.id],
+            title="",
+            description="",
+            depends_on=[self._task_alias(i) for i in task.depends_on],
+            blocks=[self._task_alias(i) for i in task.blocks]
+        )
+        return data
+
+    def _constraint(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        if "task_id" in data:
+            data["task_id"] = self._task_alias(data["task_id"])
+        if "task_ids" in data:
+            data["task_ids"] = [self._task_alias(i) for i in data["task_ids"]]
+        if data.get("member_id") is not None:
+            data["member_id"] = self._member_alias(data["member_id"])
+        if "member_ids" in data:
+            data["member_ids"] = [self._member_alias(i) for i in data["member_ids"]]
+        return data
+
+    def finish(
+        self,
+        sprint: Sprint,
+        assignments: Sequence[Assignment],
+        team_members: Sequence[TeamMember],
+        latency_ms: float
+    ) -> Dict[str, Any]:
+        """The complete record: inputs plus the plan's quality, assignments and latency"""
+        self.record["result"] = {
+            "latency_ms": latency_ms,
+            **plan_quality(sprint, assignments, team_members),
+            "assignments": {self._task_alias(a.task_id): self._member_alias(a.member_id) for a in assignments}
+        }
+        return self.record
+
+
+class PlanRecorder:
+    """
+    Sampled recorder of /sprints/plan runs for offline replay
+
+    Records are appended as JSON lines to hourly files
+    (plans-YYYYMMDDTHH.jsonl); the oldest files are deleted once there
+    are more than max_files. See benchmarks/replay_plans.py.
+
+    Args:
+        directory: Where record files are written
+        sample_rate: Fraction of planning runs recorded
+        max_files: Hourly files kept
+    """
+
+    def __init__(self, directory: str, sample_rate: float = 1.0, max_files: int = 168):
+        self.directory = Path(directory)
+        self.sample_rate = sample_rate
+        self.max_files = max_files
+        self._lock = threading.Lock()
+
+    def sampled(self) -> bool:
+        return self.sample_rate >= 1.0 or random.random() < self.sample_rate
+
+    def save(self, record: Dict[str, Any]):
+        """Append one record (errors are logged, never raised into the request)"""
+        line = json.dumps(record, separators=(",", ":"))
+        try:
+            with self._lock:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                path = self.directory / f"{RECORD_PREFIX}{datetime.utcnow():%Y%m%dT%H}.jsonl"
+                with path.open("a") as records:
+                    records.write(line + "\n")
+                for older in sorted(self.directory.glob(f"{RECORD_PREFIX}*.jsonl"))[:-self.max_files or None]:
+                    older.unlink()
+        except OSError as e:
+            logger.warning(f"Could not record plan: {e}")
+
+
+def load_records(paths: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """Records from record files or directories of them, oldest file first"""
+    files: List[Path] = []
+    for path in map(Path, paths):
+        files.extend(sorted(path.glob(f"{RECORD_PREFIX}*.jsonl")) if path.is_dir() else [path])
+    for path in files:
+        with path.open() as records:
+            for line in records:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue  # Torn final line of a file still being written
+
+
+def replay_record(record: Dict[str, Any], optimizer, candidate_index_settings: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Plan a recorded run again with optimizer
+
+    Inputs are rebuilt from the record, so replays never share state.
+    With candidate_index_settings (CandidateIndex keyword arguments) the
+    team is indexed, outside the timed section, as a tenant's would be.
+
+    Returns:
+        The same fields as the record's result, for the new plan
+    """
+    team = [TeamMember.model_validate(member) for member in record["team"]]
+    backlog = [Task.model_validate(task) for task in record["backlog"]]
+    constraints = _constraint_list.validate_python(record.get("constraints", []))
+    as_of = datetime.fromisoformat(record["as_of"])
+    sprint = Sprint(
+        id=f"replay-{record['id']}",
+        name="replay",
+        start_date=as_of,
+        end_date=as_of + timedelta(days=record["duration_days"]),
+        duration_days=record["duration_days"],
+        team_members=[member.id for member in team]
+    )
+
+    candidate_index = None
+    if candidate_index_settings is not None:
+        candidate_index = CandidateIndex(**candidate_index_settings)
+        for member in team:
+            candidate_index.upsert(member)
+
+    start = time.perf_counter()
+    planned, _, assignments = optimizer.plan_sprint_with_assignments(
+        sprint,
+        backlog,
+        team,
+        weight_profile=record.get("weight_profile"),
+        as_of=as_of,
+        constraints=constraints,
+        candidate_index=candidate_index,
+        ledger=AssignmentLedger()
+    )
+    latency_ms = (time.perf_counter() - start) * 1000
+    return {
+        "latency_ms": latency_ms,
+        **plan_quality(planned, assignments, team),
+        "assignments": {a.task_id: a.member_id for a in assignments}
+    }
+
+
+def compare_results(baseline: Dict[str, Any], replayed: Dict[str, Any]) -> Dict[str, Any]:
+    """Per-record differences between a baseline result and its replay"""
+    base_assignments = baseline.get("assignments", {})
+    new_assignments = replayed.get("assignments", {})
+    same = sum(1 for task, member in new_assignments.items() if base_assignments.get(task) == member)
+    return {
+        "latency_ratio": replayed["latency_ms"] / baseline["latency_ms"] if baseline["latency_ms"] else None,
+        "total_score_delta": replayed["total_score"] - baseline["total_score"],
+        "workload_std_delta": replayed["workload_std"] - baseline["workload_std"],
+        "assigned_tasks_delta": replayed["assigned_tasks"] - baseline["assigned_tasks"],
+        "feasibility_changed": replayed["is_feasible"] != baseline["is_feasible"],
+        "risk_changed": replayed["risk_level"] != baseline["risk_level"],
+        "assignment_agreement": same / max(len(base_assignments), len(new_assignments), 1)
+    }
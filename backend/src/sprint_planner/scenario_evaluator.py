@@ -0,0 +1,197 @@
+from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import math
+import numpy as np
+from pydantic import BaseModel, Field
+from src.data_model.team_member import TeamMember
+from src.data_model.task import Task
+from src.decision_engine.matrix_assigner import (
+    PlanningMatrices,
+    greedy_assign,
+    select_within_capacity,
+    urgency_order
+)
+from src.decision_engine.constraints import CompiledConstraints, Constraint, compile_constraints
+from src.feature_engine.planning_context import PlanningContext
+from src.feature_engine.scoring_weights import WeightRegistry, ScoringWeights
+from src.sprint_planner.sprint_optimizer import SprintOptimizer
+
+BASELINE = "baseline"
+
+
+class ScenarioSpec(BaseModel):
+    """One what-if perturbation of the base planning state"""
+    name: str
+    add_members: List[TeamMember] = []  # Hypothetical hires
+    remove_member_ids: List[str] = []  # Members leaving the team
+    on_leave_member_ids: List[str] = []  # Stay on the team but take no tasks
+    capacity_multiplier: float = Field(default=1.0, ge=0.0)  # Applied to every member's hours
+    scope_cut: float = Field(default=0.0, ge=0.0, le=1.0)  # Fraction of least urgent tasks dropped
+
+
+class ScenarioResult(BaseModel):
+    """Plan outcome of one scenario and its difference from the baseline"""
+    name: str
+    is_feasible: bool
+    risk_level: str
+    planned_tasks: int
+    assigned_tasks: int
+    total_capacity: float
+    utilization: float
+    workload_variance: float
+    total_score: float
+    assignments: Dict[str, str] = {}  # task_id -> member_id
+    unassigned_task_ids: List[str] = []
+
+    # Deltas against the baseline
+    added_task_ids: List[str] = []
+    dropped_task_ids: List[str] = []
+    reassigned: Dict[str, Dict[str, Optional[str]]] = {}  # task_id -> {"from", "to"}
+
+
+class ScenarioEvaluator:
+    """
+    What-if analysis of a sprint plan without side effects
+
+    The skill matrix, urgency and task hours are computed once for the
+    base state; every scenario is then re-planned from those arrays by
+    masking members, scaling capacity and trimming scope, mirroring
+    SprintOptimizer.plan_sprint. Team members and tasks are only read.
+    """
+
+    def __init__(self, weight_registry: Optional[WeightRegistry] = None, max_workers: int = 4):
+        self.weight_registry = weight_registry or WeightRegistry()
+        self.max_workers = max_workers
+
+    def evaluate(
+        self,
+        tasks: List[Task],
+        team_members: List[TeamMember],
+        scenarios: List[ScenarioSpec],
+        weight_profile: Optional[str] = None,
+        as_of: Optional[datetime] = None,
+        constraints: Optional[List[Constraint]] = None
+    ) -> List[ScenarioResult]:
+        """
+        Evaluate the baseline followed by every scenario
+
+        constraints apply to every scenario and are compiled once.
+
+        Raises:
+            ValueError: if a scenario references an unknown member id, or
+                a constraint an unknown member or conflicting pins
+        """
+        known_ids = {member.id for member in team_members}
+        for scenario in scenarios:
+            unknown = (set(scenario.remove_member_ids) | set(scenario.on_leave_member_ids)) - known_ids
+            if unknown:
+                raise ValueError(f"Scenario '{scenario.name}' references unknown members: {sorted(unknown)}")
+
+        candidates = [task for task in tasks if not task.is_assigned()]
+        matrices = PlanningMatrices(candidates, team_members, PlanningContext(candidates, as_of))
+        weights = self.weight_registry.get(weight_profile)
+        order = urgency_order(matrices)
+
+        # Hired members are appended once so all scenarios share one skill matrix
+        extra_members = [member for scenario in scenarios for member in scenario.add_members]
+        if extra_members:
+            matrices = matrices.with_members(extra_members)
+
+        member_masks = []
+        offset = len(team_members)
+        for scenario in scenarios:
+            mask = np.zeros(len(matrices.member_ids), dtype=bool)
+            mask[:len(team_members)] = True
+            mask[offset:offset + len(scenario.add_members)] = True
+            offset += len(scenario.add_members)
+            member_masks.append(mask)
+
+        # Shared by all scenarios; computed before the workers start
+        matrices.static_scores(weights)
+        compiled = compile_constraints(constraints, matrices.tasks, matrices.member_ids) if constraints else None
+
+        baseline_mask = np.zeros(len(matrices.member_ids), dtype=bool)
+        baseline_mask[:len(team_members)] = True
+        baseline = self._evaluate_one(matrices, order, weights, ScenarioSpec(name=BASELINE), baseline_mask, compiled)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = list(executor.map(
+                lambda args: self._evaluate_one(matrices, order, weights, *args, compiled),
+                zip(scenarios, member_masks)
+            ))
+
+        return [baseline] + [self._with_deltas(result, baseline) for result in results]
+
+    @staticmethod
+    def _evaluate_one(
+        matrices: PlanningMatrices,
+        order: np.ndarray,
+        weights: ScoringWeights,
+        scenario: ScenarioSpec,
+        member_mask: np.ndarray,
+        constraints: Optional[CompiledConstraints] = None
+    ) -> ScenarioResult:
+        position = {member_id: i for i, member_id in enumerate(matrices.member_ids)}
+        team_mask = member_mask.copy()
+        for member_id in scenario.remove_member_ids:
+            team_mask[position[member_id]] = False
+        assignable = team_mask.copy()
+        for member_id in scenario.on_leave_member_ids:
+            assignable[position[member_id]] = False
+
+        capacity = matrices.capacity * scenario.capacity_multiplier
+        total_capacity = float(capacity[team_mask].sum())
+
+        # Scope cut drops the least urgent tasks before selection
+        num_tasks = len(matrices.task_ids)
+        candidate_mask = np.zeros(num_tasks, dtype=bool)
+        candidate_mask[order[:num_tasks - math.floor(num_tasks * scenario.scope_cut)]] = True
+
+        selected = select_within_capacity(matrices, candidate_mask, total_capacity)
+        plan = greedy_assign(
+            matrices, selected, weights, member_mask=assignable, capacity=capacity, constraints=constraints
+        )
+        assigned = plan["member"] >= 0
+
+        team_capacity = capacity[team_mask]
+        workload_ratio = np.where(
+            team_capacity > 0, plan["workload"][team_mask] / np.where(team_capacity > 0, team_capacity, 1.0), 0.0
+        )
+        workload_variance = float(workload_ratio.std()) if workload_ratio.size else 0.0
+        utilization = float(matrices.hours[selected].sum()) / total_capacity if total_capacity > 0 else 0.0
+
+        if assigned.any():
+            is_feasible, risk_level = SprintOptimizer.classify_risk(utilization, workload_variance)
+        else:
+            is_feasible, risk_level = False, "critical"
+
+        task_ids = matrices.task_ids
+        return ScenarioResult(
+            name=scenario.name,
+            is_feasible=is_feasible,
+            risk_level=risk_level,
+            planned_tasks=int(selected.sum()),
+            assigned_tasks=int(assigned.sum()),
+            total_capacity=total_capacity,
+            utilization=utilization,
+            workload_variance=workload_variance,
+            total_score=float(plan["score"][assigned].sum()),
+            assignments={
+                task_ids[t]: matrices.member_ids[plan["member"][t]] for t in np.flatnonzero(assigned)
+            },
+            unassigned_task_ids=[task_ids[t] for t in np.flatnonzero(selected & ~assigned)]
+        )
+
+    @staticmethod
+    def _with_deltas(result: ScenarioResult, baseline: ScenarioResult) -> ScenarioResult:
+        planned = set(result.assignments) | set(result.unassigned_task_ids)
+        baseline_planned = set(baseline.assignments) | set(baseline.unassigned_task_ids)
+        result.added_task_ids = sorted(planned - baseline_planned)
+        result.dropped_task_ids = sorted(baseline_planned - planned)
+        result.reassigned = {
+            task_id: {"from": baseline.assignments.get(task_id), "to": result.assignments.get(task_id)}
+            for task_id in sorted(planned & baseline_planned)
+            if baseline.assignments.get(task_id) != result.assignments.get(task_id)
+        }
+        return result
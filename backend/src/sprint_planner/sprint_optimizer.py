@@ -1,43 +1,116 @@
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional, Callable
 from src.data_model.sprint import Sprint
 from src.data_model.team_member import TeamMember
 from src.data_model.task import Task
+from src.data_model.assignment import Assignment
 from src.decision_engine.task_assigner import TaskAssigner
 from src.feature_engine.feature_extractor import FeatureExtractor
+from src.feature_engine.planning_context import PlanningContext
+from src.decision_engine.constraints import Constraint
+from src.decision_engine.candidate_index import CandidateIndex
+from src.decision_engine.assignment_ledger import AssignmentLedger
+from datetime import datetime
 
 class SprintOptimizer:
     """Optimizes sprint planning and feasibility"""
     
-    def __init__(self):
-        self.task_assigner = TaskAssigner()
+    def __init__(self, estimate_model=None, weight_registry=None):
+        """
+        Args:
+            estimate_model: Optional EstimateCorrectionModel used to pack and
+                assign tasks by predicted rather than raw estimated hours
+            weight_registry: Optional WeightRegistry with versioned scoring weights
+        """
+        self.estimate_model = estimate_model
+        self.task_assigner = TaskAssigner(
+            estimate_model=estimate_model,
+            weight_registry=weight_registry
+        )
         self.feature_extractor = FeatureExtractor()
     
     def plan_sprint(
         self,
         sprint: Sprint,
         available_tasks: List[Task],
-        team_members: List[TeamMember]
+        team_members: List[TeamMember],
+        weight_profile: Optional[str] = None,
+        as_of: Optional[datetime] = None,
+        constraints: Optional[List[Constraint]] = None
     ) -> Tuple[Sprint, List[Task]]:
         """
         Plans a sprint by:
         1. Selecting tasks within capacity
         2. Assigning tasks to team members
         3. Evaluating feasibility
+        
+        All urgency scoring uses one reference time (as_of, default now),
+        so the same inputs and as_of always produce the same plan.
+        """
+        sprint, selected_tasks, _ = self.plan_sprint_with_assignments(
+            sprint,
+            available_tasks,
+            team_members,
+            weight_profile,
+            as_of,
+            constraints=constraints
+        )
+        return sprint, selected_tasks
+    
+    def plan_sprint_with_assignments(
+        self,
+        sprint: Sprint,
+        available_tasks: List[Task],
+        team_members: List[TeamMember],
+        weight_profile: Optional[str] = None,
+        as_of: Optional[datetime] = None,
+        progress: Optional[Callable[[str, int, int], None]] = None,
+        constraints: Optional[List[Constraint]] = None,
+        candidate_index: Optional[CandidateIndex] = None,
+        ledger: Optional[AssignmentLedger] = None
+    ) -> Tuple[Sprint, List[Task], List[Assignment]]:
+        """
+        Same as plan_sprint, also returning the assignments made for the sprint
+        
+        progress, if given, is called with (stage, done, total) as the
+        plan advances through the "selecting", "assigning" and
+        "assessing" stages. constraints restrict who may take which
+        selected task (see src.decision_engine.constraints).
+        candidate_index, if given, narrows large teams to each task's
+        best skill matches before exact scoring. Assignments are recorded
+        in ledger (default: the assigner's own).
         """
+        context = PlanningContext(available_tasks, as_of)
         
         # Calculate sprint capacity
         capacity = self._calculate_sprint_capacity(team_members)
         
+        # Predicted effort per task (raw estimates when no model is configured)
+        effective_hours = None
+        if self.estimate_model is not None:
+            effective_hours = self.estimate_model.predict_hours(available_tasks)
+        
         # Select tasks that fit within capacity
         selected_tasks = self._select_tasks_for_sprint(
             available_tasks,
-            capacity
+            capacity,
+            effective_hours,
+            context
         )
         
+        if progress is not None:
+            progress("selecting", len(selected_tasks), len(available_tasks))
+        
         # Assign selected tasks
         assignments = self.task_assigner.assign_tasks(
             selected_tasks,
-            team_members
+            team_members,
+            constraints=constraints,
+            weight_profile=weight_profile,
+            context=context,
+            sprint_id=sprint.id,
+            progress=(lambda done, total: progress("assigning", done, total)) if progress else None,
+            candidate_index=candidate_index,
+            ledger=ledger
         )
         
         # Evaluate sprint feasibility
@@ -45,12 +118,19 @@ class SprintOptimizer:
             sprint,
             selected_tasks,
             team_members,
-            assignments
+            assignments,
+            effective_hours
         )
         
         sprint.planned_tasks = len(selected_tasks)
+        sprint.task_ids = [task.id for task in selected_tasks]
+        for task in selected_tasks:
+            task.sprint_id = sprint.id
         
-        return sprint, selected_tasks
+        if progress is not None:
+            progress("assessing", len(assignments), len(selected_tasks))
+        
+        return sprint, selected_tasks, assignments
     
     def _calculate_sprint_capacity(self, team_members: List[TeamMember]) -> float:
         """Calculate total sprint capacity in hours"""
@@ -59,26 +139,35 @@ class SprintOptimizer:
     def _select_tasks_for_sprint(
         self,
         available_tasks: List[Task],
-        sprint_capacity: float
+        sprint_capacity: float,
+        effective_hours: Optional[Dict[str, float]] = None,
+        context: Optional[PlanningContext] = None
     ) -> List[Task]:
         """
         Select tasks that fit within sprint capacity
         Uses greedy algorithm: prioritize by urgency
+        
+        effective_hours optionally maps task IDs to predicted effort used
+        instead of each task's raw estimated_hours.
         """
+        if context is None:
+            context = PlanningContext(available_tasks)
+        
         selected = []
         total_effort = 0.0
         
         # Sort by urgency
         sorted_tasks = sorted(
             available_tasks,
-            key=lambda t: self.feature_extractor.task_urgency_factor(t),
+            key=lambda t: self.feature_extractor.task_urgency_factor(t, context),
             reverse=True
         )
         
         for task in sorted_tasks:
-            if total_effort + task.estimated_hours <= sprint_capacity * 0.85:  # 85% utilization target
+            hours = effective_hours[task.id] if effective_hours else task.estimated_hours
+            if total_effort + hours <= sprint_capacity * 0.85:  # 85% utilization target
                 selected.append(task)
-                total_effort += task.estimated_hours
+                total_effort += hours
         
         return selected
     
@@ -87,7 +176,8 @@ class SprintOptimizer:
         sprint: Sprint,
         tasks: List[Task],
         team_members: List[TeamMember],
-        assignments: List
+        assignments: List,
+        effective_hours: Optional[Dict[str, float]] = None
     ) -> Tuple[bool, str]:
         """
         Assess if sprint plan is feasible
@@ -102,11 +192,20 @@ class SprintOptimizer:
         workload_variance = self._calculate_variance(workloads)
         
         # Check utilization
-        total_effort = sum(task.estimated_hours for task in tasks)
+        if effective_hours:
+            total_effort = sum(effective_hours[task.id] for task in tasks)
+        else:
+            total_effort = sum(task.estimated_hours for task in tasks)
         total_capacity = sum(member.total_hours_available for member in team_members)
         utilization = total_effort / total_capacity if total_capacity > 0 else 0.0
         
-        # Determine risk level
+        return self.classify_risk(utilization, workload_variance)
+    
+    @staticmethod
+    def classify_risk(utilization: float, workload_variance: float) -> Tuple[bool, str]:
+        """
+        Map planned utilization and workload spread to (is_feasible, risk_level)
+        """
         if utilization > 0.95:
             risk = "high"
             feasible = False
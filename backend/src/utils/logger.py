@@ -23,8 +23,8 @@ class Logger:
         console_handler.setLevel(logging.INFO)
         console_handler.setFormatter(formatter)
         
-        # File handler
-        file_handler = logging.FileHandler('agile_planner.log')
+        # File handler (the log file is only opened on the first record)
+        file_handler = logging.FileHandler('agile_planner.log', delay=True)
         file_handler.setLevel(logging.DEBUG)
         file_handler.setFormatter(formatter)
         
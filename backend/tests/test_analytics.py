@@ -0,0 +1,157 @@
+import pytest
+import json
+import time
+from pydantic_core import to_json
+from datetime import datetime, timedelta
+from src.analytics.sprint_analytics import SprintAnalytics
+from src.data_model.sprint import Sprint
+from src.data_model.task import Task, TaskStatus, Priority
+
+START = datetime(2026, 1, 5, 9, 0)
+
+
+def make_sprint(sprint_id: str, start: datetime = START, team=("alice", "bob")) -> Sprint:
+    return Sprint(
+        id=sprint_id,
+        name=sprint_id,
+        start_date=start,
+        end_date=start + timedelta(days=10),
+        duration_days=10,
+        team_members=list(team)
+    )
+
+
+def make_task(task_id: str, member_id: str, hours: float = 8.0, sprint_id: str = "s1") -> Task:
+    return Task(
+        id=task_id,
+        title=task_id,
+        description="Analytics task",
+        required_skills=["Python"],
+        complexity=0.5,
+        estimated_hours=hours,
+        priority=Priority.MEDIUM,
+        deadline=START + timedelta(days=10),
+        assigned_to=member_id,
+        sprint_id=sprint_id
+    )
+
+
+def set_status(analytics: SprintAnalytics, task: Task, status: TaskStatus, day: float):
+    previous = task.status
+    task.status = status
+    analytics.record_transition(task, previous, START + timedelta(days=day))
+
+
+class TestBurndown:
+    """Test burndown rollups"""
+
+    def test_completions_burn_down_on_their_day(self):
+        """Test completed hours leave the remaining line on the day they were completed"""
+        analytics = SprintAnalytics()
+        first, second = make_task("t1", "alice", 8.0), make_task("t2", "bob", 4.0)
+        analytics.open_sprint(make_sprint("s1"), [first, second])
+
+        set_status(analytics, first, TaskStatus.IN_PROGRESS, 0.5)
+        set_status(analytics, first, TaskStatus.COMPLETED, 2.5)
+        set_status(analytics, second, TaskStatus.COMPLETED, 4.2)
+
+        chart = analytics.burndown("s1", as_of=START + timedelta(days=5))
+        assert chart.remaining_hours == [12.0, 12.0, 4.0, 4.0, 0.0, 0.0]
+        assert chart.ideal_hours[0] == 12.0 and chart.ideal_hours[-1] == 0.0
+        assert chart.completed_hours == 12.0
+
+    def test_reopened_task_and_added_scope(self):
+        """Test reopening a task and scope added mid-sprint raise the remaining hours"""
+        analytics = SprintAnalytics()
+        task = make_task("t1", "alice", 8.0)
+        analytics.open_sprint(make_sprint("s1"), [task])
+
+        set_status(analytics, task, TaskStatus.COMPLETED, 1)
+        set_status(analytics, task, TaskStatus.IN_PROGRESS, 2)
+        analytics.open_sprint(make_sprint("s1"), [make_task("t2", "bob")])  # Already tracked: ignored
+
+        chart = analytics.burndown("s1", as_of=START + timedelta(days=3))
+        assert chart.remaining_hours == [8.0, 0.0, 8.0, 8.0]
+        assert chart.scope_hours == 8.0
+
+    def test_unknown_sprint(self):
+        """Test untracked sprints raise KeyError"""
+        with pytest.raises(KeyError):
+            SprintAnalytics().burndown("missing")
+
+
+class TestVelocity:
+    """Test velocity and carry-over rollups"""
+
+    def close_sprints(self, analytics: SprintAnalytics, completed_per_sprint):
+        for index, completed in enumerate(completed_per_sprint):
+            sprint_id = f"s{index}"
+            start = START + timedelta(days=14 * index)
+            sprint_tasks = [make_task(f"{sprint_id}-t{i}", "alice", sprint_id=sprint_id) for i in range(4)]
+            analytics.open_sprint(make_sprint(sprint_id, start, team=("alice",)), sprint_tasks)
+            for task in sprint_tasks[:completed]:
+                previous = task.status
+                task.status = TaskStatus.COMPLETED
+                analytics.record_transition(task, previous, start + timedelta(days=3))
+            closure = analytics.close_sprint(sprint_id, start + timedelta(days=10))
+        return closure
+
+    def test_member_velocity_uses_recent_window(self):
+        """Test sprint_velocity is the mean of the last velocity_window closed sprints"""
+        analytics = SprintAnalytics(velocity_window=2)
+        closure = self.close_sprints(analytics, [4, 1, 3])
+
+        assert closure.member_velocity == {"alice": 2.0}
+        assert closure.carry_over_rate == 0.25
+
+        team = analytics.velocity(last_n=2)
+        assert [point.completed_tasks for point in team.sprints] == [1, 3]
+        assert team.average_tasks == 2.0
+        assert team.carry_over_rate == 0.5
+        assert analytics.velocity("alice").average_hours == pytest.approx(64.0 / 3)
+
+        with pytest.raises(ValueError):
+            analytics.close_sprint("s2")
+
+    def test_restore_rebuilds_rollups(self):
+        """Test an export restores identical charts"""
+        analytics = SprintAnalytics(velocity_window=2)
+        self.close_sprints(analytics, [4, 1, 3])
+
+        restored = SprintAnalytics(velocity_window=2)
+        restored.restore(analytics.export())
+        assert restored.velocity("alice") == analytics.velocity("alice")
+        assert restored.burndown("s1") == analytics.burndown("s1")
+
+    def test_export_holds_aggregates_not_history(self):
+        """Test snapshots carry rollups, so their size does not grow with status changes"""
+        analytics = SprintAnalytics(velocity_window=2)
+        task = make_task("t1", "alice")
+        analytics.open_sprint(make_sprint("s1", team=("alice",)), [task])
+        for day in range(50):
+            set_status(analytics, task, TaskStatus.IN_PROGRESS if day % 2 else TaskStatus.PENDING, day / 10)
+        before = len(to_json(analytics.export()))
+        for day in range(50):
+            set_status(analytics, task, TaskStatus.IN_PROGRESS if day % 2 else TaskStatus.PENDING, 5 + day / 10)
+        set_status(analytics, task, TaskStatus.COMPLETED, 9)
+        analytics.close_sprint("s1", START + timedelta(days=10))
+
+        exported = json.loads(to_json(analytics.export()))
+        assert "transitions" not in exported
+        assert len(to_json(exported)) < before * 2
+
+        restored = SprintAnalytics(velocity_window=2)
+        restored.restore(exported)
+        assert restored.burndown("s1") == analytics.burndown("s1")
+        assert restored.velocity("alice") == analytics.velocity("alice")
+
+    def test_queries_do_not_scale_with_history(self):
+        """Test chart queries over hundreds of sprints stay in the millisecond range"""
+        analytics = SprintAnalytics()
+        self.close_sprints(analytics, [i % 5 for i in range(300)])
+
+        start = time.perf_counter()
+        for _ in range(100):
+            analytics.burndown("s150")
+            analytics.velocity("alice", last_n=20)
+        assert (time.perf_counter() - start) / 100 < 0.01
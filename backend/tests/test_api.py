@@ -0,0 +1,784 @@
+import pytest
+import json
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from datetime import datetime, timedelta
+import asyncio
+import threading
+import time
+from src.api import routes
+from src.api.plan_cache import PlanCache
+from src.api.event_broker import EventBroker
+from src.api.admission import AdmissionController, Overloaded
+from src.api.tenants import TenantLimitReached, TenantRegistry, tenant_worker
+from src.api import binary_formats
+from src.data_model.team_member import TeamMember
+from src.data_model.task import Task
+from config.settings import Settings
+from src.learning.estimate_model import EstimateCorrectionModel
+from src.learning.history_store import AssignmentOutcome
+from src.sprint_planner.sprint_optimizer import SprintOptimizer
+from src.sprint_planner.plan_recording import load_records
+
+
+def default_tenant():
+    return routes.get_tenant_registry().get("default")
+
+
+@pytest.fixture
+def client():
+    """Create a test client over a fresh in-memory state"""
+    routes.get_tenant_registry.cache_clear()
+    app = FastAPI()
+    app.include_router(routes.router)
+    return TestClient(app)
+
+
+@pytest.fixture
+def seeded_client(client):
+    """Client with two members and two tasks"""
+    for name, skills in [("Alice", ["Python", "FastAPI"]), ("Bob", ["JavaScript", "React"])]:
+        client.post("/team-members", json={
+            "name": name,
+            "email": f"{name.lower()}@example.com",
+            "skills": [{"name": s, "proficiency": 0.8} for s in skills],
+            "total_hours_available": 40
+        })
+    for title, skills in [("Build API", ["Python"]), ("Build UI", ["React"])]:
+        client.post("/tasks", json={
+            "title": title,
+            "description": title,
+            "required_skills": skills,
+            "complexity": 0.5,
+            "estimated_hours": 8,
+            "priority": "high",
+            "deadline": (datetime.utcnow() + timedelta(days=5)).isoformat()
+        })
+    return client
+
+
+class TestPlanningApi:
+    """Test the planning API end to end"""
+
+    def test_plan_sprint_response_shape(self, seeded_client):
+        """Test the plan response is serialized with sprint and tasks"""
+        member_ids = [m["id"] for m in seeded_client.get("/team-members").json()]
+        response = seeded_client.post("/sprints/plan", json={
+            "name": "Sprint 1", "duration_days": 14, "team_member_ids": member_ids
+        })
+        assert response.status_code == 200
+        body = response.json()
+        assert body["sprint"]["planned_tasks"] == 2
+        assert {t["assigned_to"] for t in body["tasks"]} == set(member_ids)
+        assert body["tasks"][0]["priority"] == "high"
+
+        sprint = seeded_client.get(f"/sprints/{body['sprint']['id']}")
+        assert sprint.status_code == 200
+        assert sprint.json()["id"] == body["sprint"]["id"]
+
+    def test_plan_sprint_constraints(self, seeded_client):
+        """Test constraints are validated and applied when planning"""
+        member_ids = [m["id"] for m in seeded_client.get("/team-members").json()]
+        ui_task = next(t["id"] for t in seeded_client.get("/tasks").json() if t["title"] == "Build UI")
+        request = {"name": "Sprint 1", "duration_days": 14, "team_member_ids": member_ids}
+        
+        unknown = seeded_client.post("/sprints/plan", json={
+            **request, "constraints": [{"type": "pin", "task_id": ui_task, "member_id": "ghost"}]
+        })
+        assert unknown.status_code == 400
+        malformed = seeded_client.post("/sprints/plan", json={**request, "constraints": [{"type": "teleport"}]})
+        assert malformed.status_code == 422
+        
+        response = seeded_client.post("/sprints/plan", json={
+            **request, "constraints": [{"type": "pin", "task_id": ui_task, "member_id": member_ids[0]}]
+        })
+        assert response.status_code == 200
+        assert {t["id"]: t["assigned_to"] for t in response.json()["tasks"]}[ui_task] == member_ids[0]
+
+    def test_plan_recording(self, seeded_client, tmp_path, monkeypatch):
+        """Test computed plans are recorded for replay and cached retries are not"""
+        settings = routes.get_settings()
+        monkeypatch.setattr(settings, "plan_recording_enabled", True)
+        monkeypatch.setattr(settings, "plan_recording_dir", str(tmp_path))
+        routes.get_plan_recorder.cache_clear()
+        member_ids = [m["id"] for m in seeded_client.get("/team-members").json()]
+        request = {"name": "Sprint 1", "duration_days": 14, "team_member_ids": member_ids}
+        try:
+            seeded_client.post("/sprints/plan", json=request)
+            seeded_client.post("/sprints/plan", json=request)
+        finally:
+            routes.get_plan_recorder.cache_clear()
+        
+        records = list(load_records([str(tmp_path)]))
+        assert len(records) == 1
+        assert records[0]["result"]["assigned_tasks"] == 2
+        assert records[0]["result"]["latency_ms"] > 0
+
+    def test_close_releases_corrected_hours(self, seeded_client, monkeypatch):
+        """Test closing a sprint planned with corrected hours returns workloads to zero"""
+        model = EstimateCorrectionModel()
+        for _ in range(30):
+            model.partial_fit([
+                AssignmentOutcome(
+                    member_id="member_1", required_skills=["Python"], complexity=(i % 10) / 10,
+                    estimated_hours=2.0 + i % 12, actual_hours=(2.0 + i % 12) * 1.5, on_time=True
+                )
+                for i in range(20)
+            ])
+        monkeypatch.setattr(routes, "get_sprint_optimizer", lambda: SprintOptimizer(estimate_model=model))
+        member_ids = [m["id"] for m in seeded_client.get("/team-members").json()]
+        plan = seeded_client.post("/sprints/plan", json={
+            "name": "Sprint 1", "duration_days": 14, "team_member_ids": member_ids
+        }).json()
+        
+        assignments = seeded_client.get(f"/sprints/{plan['sprint']['id']}/assignments").json()
+        assert {a["estimated_hours"] for a in assignments} == {8.0}
+        assert all(a["planned_hours"] > 8.0 for a in assignments)
+        workloads = {m["id"]: m["current_workload"] for m in seeded_client.get("/team-members").json()}
+        assert sum(workloads.values()) == pytest.approx(sum(a["planned_hours"] for a in assignments))
+        
+        seeded_client.post(f"/sprints/{plan['sprint']['id']}/close")
+        assert all(m["current_workload"] == pytest.approx(0.0) for m in seeded_client.get("/team-members").json())
+
+    def test_writes_are_not_held_behind_planning(self, client, tmp_path, monkeypatch):
+        """Test task writes proceed while a plan runs, and a plan that raced a write is redone"""
+        registry = TenantRegistry(Settings(state_dir=str(tmp_path), state_fsync=False))
+        monkeypatch.setattr(routes, "get_tenant_registry", lambda: registry)
+        planning, release = threading.Event(), threading.Event()
+
+        class SlowOptimizer(SprintOptimizer):
+            calls = 0
+
+            def plan_sprint_with_assignments(self, *args, **kwargs):
+                SlowOptimizer.calls += 1
+                if SlowOptimizer.calls == 1:
+                    planning.set()
+                    release.wait(10)
+                return super().plan_sprint_with_assignments(*args, **kwargs)
+
+        monkeypatch.setattr(routes, "get_sprint_optimizer", lambda: SlowOptimizer())
+        member_id = client.post("/team-members", json={
+            "name": "Alice", "email": "alice@example.com",
+            "skills": [{"name": "Python", "proficiency": 0.8}], "total_hours_available": 40
+        }).json()["id"]
+        task = {
+            "title": "Build API", "description": "Build API", "required_skills": ["Python"], "complexity": 0.5,
+            "estimated_hours": 8, "priority": "high", "deadline": (datetime.utcnow() + timedelta(days=5)).isoformat()
+        }
+        client.post("/tasks", json=task)
+
+        responses = []
+        planner = threading.Thread(target=lambda: responses.append(client.post("/sprints/plan", json={
+            "name": "Sprint 1", "duration_days": 14, "team_member_ids": [member_id]
+        })))
+        planner.start()
+        assert planning.wait(10)
+        started = time.perf_counter()
+        late_task = client.post("/tasks", json={**task, "title": "Build UI"}).json()
+        assert time.perf_counter() - started < 5  # Not held until the plan finishes
+        release.set()
+        planner.join(10)
+
+        plan = responses[0].json()
+        assert SlowOptimizer.calls == 2
+        assert late_task["id"] in {t["id"] for t in plan["tasks"]}
+        assert client.get("/team-members").json()[0]["current_workload"] == 16
+        registry.close()
+
+        recovered = TenantRegistry(Settings(state_dir=str(tmp_path), state_fsync=False))
+        tenant = recovered.get("default")
+        assert {t.assigned_to for t in tenant.tasks} == {member_id}
+        assert tenant.team_members[0].current_workload == 16
+        assert len(tenant.assignments.for_sprint(plan["sprint"]["id"])) == 2
+        recovered.close()
+
+    def test_cached_and_duplicate_plans_skip_admission(self, seeded_client, monkeypatch):
+        """Test a cached retry and a duplicate of a running plan are answered without waiting for admission"""
+        planning, release = threading.Event(), threading.Event()
+
+        class SlowOptimizer(SprintOptimizer):
+            calls = 0
+
+            def plan_sprint_with_assignments(self, sprint, *args, **kwargs):
+                SlowOptimizer.calls += 1
+                if sprint.name == "Sprint 2":
+                    planning.set()
+                    release.wait(10)
+                return super().plan_sprint_with_assignments(sprint, *args, **kwargs)
+
+        monkeypatch.setattr(routes, "get_sprint_optimizer", lambda: SlowOptimizer())
+        member_ids = [m["id"] for m in seeded_client.get("/team-members").json()]
+        first_request = {"name": "Sprint 1", "duration_days": 14, "team_member_ids": member_ids}
+        first = seeded_client.post("/sprints/plan", json=first_request)
+        second_request = {"name": "Sprint 2", "duration_days": 14, "team_member_ids": member_ids}
+
+        responses = []
+        def plan_second():
+            responses.append(seeded_client.post("/sprints/plan", json=second_request))
+        planners = [threading.Thread(target=plan_second)]
+        planners[0].start()
+        assert planning.wait(10)
+        planners.append(threading.Thread(target=plan_second))
+        planners[1].start()
+
+        started = time.perf_counter()
+        retry = seeded_client.post("/sprints/plan", json=first_request)
+        assert time.perf_counter() - started < 5  # Not queued behind Sprint 2
+        assert retry.headers["X-Plan-Cache"] == "hit"
+        assert retry.json() == first.json()
+
+        release.set()
+        for thread in planners:
+            thread.join(10)
+        assert sorted(r.headers["X-Plan-Cache"] for r in responses) == ["coalesced", "miss"]
+        assert responses[0].json() == responses[1].json()
+        assert SlowOptimizer.calls == 2
+
+    def test_assignment_ledger_endpoints(self, seeded_client):
+        """Test member, task and sprint assignment queries follow the plan and completion"""
+        member_ids = [m["id"] for m in seeded_client.get("/team-members").json()]
+        plan = seeded_client.post("/sprints/plan", json={
+            "name": "Sprint 1", "duration_days": 14, "team_member_ids": member_ids
+        }).json()
+        task = plan["tasks"][0]
+        
+        sprint_assignments = seeded_client.get(f"/sprints/{plan['sprint']['id']}/assignments").json()
+        assert {a["task_id"] for a in sprint_assignments} == {t["id"] for t in plan["tasks"]}
+        current = seeded_client.get(f"/team-members/{task['assigned_to']}/assignments").json()
+        assert task["id"] in {a["task_id"] for a in current}
+        
+        seeded_client.patch(f"/tasks/{task['id']}/status", json={"status": "completed"})
+        current = seeded_client.get(f"/team-members/{task['assigned_to']}/assignments").json()
+        assert task["id"] not in {a["task_id"] for a in current}
+        history = seeded_client.get(f"/tasks/{task['id']}/assignments").json()
+        assert [a["member_id"] for a in history] == [task["assigned_to"]]
+        assert seeded_client.get("/tasks/missing/assignments").status_code == 404
+
+    def test_list_endpoints(self, seeded_client):
+        """Test list endpoints return every stored model"""
+        assert len(seeded_client.get("/team-members").json()) == 2
+        tasks = seeded_client.get("/tasks").json()
+        assert len(tasks) == 2
+        assert tasks[0]["status"] == "pending"
+
+    def test_scenarios_do_not_change_state(self, seeded_client):
+        """Test the scenario endpoint returns a baseline and deltas without planning"""
+        member_ids = [m["id"] for m in seeded_client.get("/team-members").json()]
+        response = seeded_client.post("/sprints/scenarios", json={
+            "team_member_ids": member_ids,
+            "scenarios": [{"name": "leave", "on_leave_member_ids": [member_ids[0]]}]
+        })
+        assert response.status_code == 200
+        baseline, leave = response.json()
+        assert baseline["assigned_tasks"] == 2
+        assert leave["assigned_tasks"] == 1
+        assert len(leave["reassigned"]) == 1
+        assert all(t["assigned_to"] is None for t in seeded_client.get("/tasks").json())
+        assert all(m["current_workload"] == 0 for m in seeded_client.get("/team-members").json())
+
+    def test_repeated_plan_request_is_served_from_cache(self, seeded_client):
+        """Test a retried plan request returns the committed plan instead of a new sprint"""
+        member_ids = [m["id"] for m in seeded_client.get("/team-members").json()]
+        request = {"name": "Sprint 1", "duration_days": 14, "team_member_ids": member_ids}
+        first = seeded_client.post("/sprints/plan", json=request)
+        second = seeded_client.post("/sprints/plan", json=request)
+
+        assert first.headers["X-Plan-Cache"] == "miss"
+        assert second.headers["X-Plan-Cache"] == "hit"
+        assert second.json() == first.json()
+        assert len(default_tenant().sprints) == 1
+
+    def test_get_sprint_conditional_request(self, seeded_client):
+        """Test GET /sprints/{id} answers 304 when the ETag still matches"""
+        member_ids = [m["id"] for m in seeded_client.get("/team-members").json()]
+        sprint_id = seeded_client.post("/sprints/plan", json={
+            "name": "Sprint 1", "duration_days": 14, "team_member_ids": member_ids
+        }).json()["sprint"]["id"]
+
+        response = seeded_client.get(f"/sprints/{sprint_id}")
+        etag = response.headers["ETag"]
+        not_modified = seeded_client.get(f"/sprints/{sprint_id}", headers={"If-None-Match": etag})
+        assert not_modified.status_code == 304
+        assert not_modified.content == b""
+
+        default_tenant().sprints[0].completed_tasks = 1
+        modified = seeded_client.get(f"/sprints/{sprint_id}", headers={"If-None-Match": etag})
+        assert modified.status_code == 200
+        assert modified.headers["ETag"] != etag
+
+
+class TestTaskStatusApi:
+    """Test task status transitions and the events they publish"""
+
+    def test_status_updates_sprint_counters(self, seeded_client):
+        """Test completing and delaying tasks updates the sprint and emits events"""
+        member_ids = [m["id"] for m in seeded_client.get("/team-members").json()]
+        plan = seeded_client.post("/sprints/plan", json={
+            "name": "Sprint 1", "duration_days": 14, "team_member_ids": member_ids, "job_id": "job-1"
+        }).json()
+        sprint_id = plan["sprint"]["id"]
+        first, second = [t["id"] for t in plan["tasks"]]
+        assert plan["sprint"]["task_ids"] == [first, second]
+
+        seeded_client.patch(f"/tasks/{first}/status", json={"status": "completed", "actual_hours": 6})
+        seeded_client.patch(f"/tasks/{second}/status", json={"status": "delayed"})
+        seeded_client.patch(f"/tasks/{second}/status", json={"status": "completed"})
+
+        sprint = seeded_client.get(f"/sprints/{sprint_id}").json()
+        assert sprint["completed_tasks"] == 2
+        assert sprint["failed_tasks"] == 0
+
+        frames = b"".join(default_tenant().event_broker.recent())
+        assert b"event: plan_progress" in frames and b'"job_id":"job-1"' in frames
+        assert b"event: assignments_changed" in frames
+        assert frames.count(b"event: task_status_changed") == 3
+        assert b'"completed_tasks":2' in frames
+
+    def test_close_sprint_carries_over_and_updates_velocity(self, seeded_client):
+        """Test closing a sprint returns unfinished work to the backlog and feeds the charts"""
+        member_ids = [m["id"] for m in seeded_client.get("/team-members").json()]
+        plan = seeded_client.post("/sprints/plan", json={
+            "name": "Sprint 1", "duration_days": 14, "team_member_ids": member_ids
+        }).json()
+        sprint_id = plan["sprint"]["id"]
+        done, open_task = plan["tasks"]
+        seeded_client.patch(f"/tasks/{done['id']}/status", json={"status": "completed"})
+
+        burndown = seeded_client.get(f"/sprints/{sprint_id}/burndown").json()
+        assert burndown["scope_hours"] == 16.0
+        assert burndown["remaining_hours"] == [8.0]
+
+        closure = seeded_client.post(f"/sprints/{sprint_id}/close").json()
+        assert closure["carried_over_task_ids"] == [open_task["id"]]
+        assert closure["carry_over_rate"] == 0.5
+        assert seeded_client.post(f"/sprints/{sprint_id}/close").status_code == 409
+
+        members = {m["id"]: m for m in seeded_client.get("/team-members").json()}
+        assert members[done["assigned_to"]]["sprint_velocity"] == 1.0
+        assert members[open_task["assigned_to"]]["sprint_velocity"] == 0.0
+        assert all(m["current_workload"] == 0.0 for m in members.values())
+        carried = next(t for t in seeded_client.get("/tasks").json() if t["id"] == open_task["id"])
+        assert carried["assigned_to"] is None and carried["sprint_id"] is None
+
+        velocity = seeded_client.get("/analytics/velocity").json()
+        assert [p["completed_tasks"] for p in velocity["sprints"]] == [1]
+        assert velocity["carry_over_rate"] == 0.5
+
+    def test_unknown_task(self, client):
+        """Test updating a missing task returns 404"""
+        assert client.patch("/tasks/missing/status", json={"status": "completed"}).status_code == 404
+
+
+class TestTenants:
+    """Test tenant partitioning"""
+
+    def test_tenants_are_isolated(self, seeded_client):
+        """Test members, tasks and lookups are scoped to the X-Tenant-ID tenant"""
+        other = {"X-Tenant-ID": "acme"}
+        assert seeded_client.get("/team-members", headers=other).json() == []
+        assert seeded_client.get("/tasks", headers=other).json() == []
+
+        member_ids = [m["id"] for m in seeded_client.get("/team-members").json()]
+        response = seeded_client.post("/sprints/roadmap", headers=other, json={"team_member_ids": member_ids})
+        assert response.status_code == 400
+
+        task_id = seeded_client.get("/tasks").json()[0]["id"]
+        assert seeded_client.patch(f"/tasks/{task_id}/status", headers=other, json={"status": "completed"}).status_code == 404
+        assert len(seeded_client.get("/team-members", headers={"X-Tenant-ID": "default"}).json()) == 2
+
+    def test_invalid_tenant_id(self, client):
+        """Test malformed tenant ids are rejected"""
+        assert client.get("/tasks", headers={"X-Tenant-ID": "../etc"}).status_code == 400
+
+    def test_worker_affinity(self, client, monkeypatch):
+        """Test a worker only serves the tenants pinned to it"""
+        registry = TenantRegistry(Settings(), worker_count=4, worker_index=1)
+        monkeypatch.setattr(routes, "get_tenant_registry", lambda: registry)
+        owned = next(f"t{i}" for i in range(100) if tenant_worker(f"t{i}", 4) == 1)
+        foreign = next(f"t{i}" for i in range(100) if tenant_worker(f"t{i}", 4) == 2)
+
+        response = client.post("/team-members", headers={"X-Tenant-ID": owned}, json={
+            "name": "Alice", "email": "alice@example.com", "skills": [], "total_hours_available": 40
+        })
+        assert response.status_code == 200
+        response = client.get("/tasks", headers={"X-Tenant-ID": foreign})
+        assert response.status_code == 421
+        assert response.headers["X-Tenant-Worker"] == "2"
+        assert registry.tenant_ids() == [owned]
+
+    def test_persisted_tenants_are_recovered(self, tmp_path):
+        """Test each tenant has its own event log and is recovered on startup"""
+        settings = Settings(state_dir=str(tmp_path), state_fsync=False)
+        registry = TenantRegistry(settings)
+        for tenant_id in ["acme", "globex"]:
+            tenant = registry.get(tenant_id)
+            member = TeamMember(
+                id=f"{tenant_id}-1", name=tenant_id, email=f"{tenant_id}@example.com",
+                skills=[], total_hours_available=40
+            )
+            with tenant.mutation():
+                tenant.add_member(member)
+                tenant.record("member_created", member=member)
+        registry.close()
+
+        recovered = TenantRegistry(settings)
+        assert recovered.load_persisted() == ["acme", "globex"]
+        assert [m.id for m in recovered.get("acme").team_members] == ["acme-1"]
+        assert recovered.get("acme").members_by_ids(["acme-1", "globex-1"])[0].name == "acme"
+        recovered.close()
+
+    def test_reads_do_not_create_tenants(self, client, tmp_path, monkeypatch):
+        """Test reads of an unknown tenant return an empty view without creating its state"""
+        registry = TenantRegistry(Settings(state_dir=str(tmp_path), state_fsync=False))
+        monkeypatch.setattr(routes, "get_tenant_registry", lambda: registry)
+        unknown = {"X-Tenant-ID": "nobody"}
+
+        assert client.get("/team-members", headers=unknown).json() == []
+        assert client.get("/tasks", headers=unknown).json() == []
+        assert client.get("/sprints/s1", headers=unknown).status_code == 404
+        assert client.get("/events", headers=unknown).status_code == 404
+        assert registry.tenant_ids() == []
+        assert not (tmp_path / "nobody").exists()
+
+        client.post("/team-members", headers=unknown, json={
+            "name": "Alice", "email": "alice@example.com", "skills": [], "total_hours_available": 40
+        })
+        registry.close()  # A restarted worker finds the tenant on disk when it is read
+        assert [m["name"] for m in client.get("/team-members", headers=unknown).json()] == ["Alice"]
+        assert registry.tenant_ids() == ["nobody"]
+        registry.close()
+
+    def test_tenant_limit_evicts_idle_tenants(self, tmp_path):
+        """Test max_tenants closes the least recently used idle persistent tenant, else refuses"""
+        settings = Settings(state_dir=str(tmp_path), state_fsync=False, max_tenants=2, tenant_idle_seconds=60)
+        registry = TenantRegistry(settings)
+        acme = registry.get("acme")
+        with acme.mutation():
+            member = TeamMember(id="a1", name="Alice", email="alice@example.com", skills=[], total_hours_available=40)
+            acme.add_member(member)
+            acme.record("member_created", member=member)
+        registry.get("globex")
+
+        with pytest.raises(TenantLimitReached):
+            registry.get("initech")  # Both were just used
+        assert registry.tenant_ids() == ["acme", "globex"]
+
+        acme.last_used -= 120
+        registry.get("globex").last_used -= 90
+        registry.get("initech")
+        assert registry.tenant_ids() == ["globex", "initech"]
+        assert acme.state_store.log._writer is None  # Its log writer thread was stopped
+
+        assert [m.id for m in registry.find("acme").team_members] == ["a1"]  # Recovered from its log
+        assert registry.tenant_ids() == ["initech", "acme"]
+        registry.close()
+
+    def test_evicted_tenant_is_recovered_after_it_closes(self, tmp_path):
+        """Test a lookup of a tenant still being closed waits for its final snapshot before recovering it"""
+        settings = Settings(state_dir=str(tmp_path), state_fsync=False, max_tenants=2, tenant_idle_seconds=60)
+        registry = TenantRegistry(settings)
+        acme = registry.get("acme")
+        with acme.mutation():
+            member = TeamMember(id="a1", name="Alice", email="alice@example.com", skills=[], total_hours_available=40)
+            acme.add_member(member)
+            acme.record("member_created", member=member)
+        acme.last_used -= 200
+        registry.get("initech").last_used -= 100
+
+        closing, finish = threading.Event(), threading.Event()
+        close = acme.close
+        def slow_close():
+            closing.set()
+            finish.wait(10)
+            close()
+        acme.close = slow_close
+
+        evictor = threading.Thread(target=registry.get, args=("globex",))
+        evictor.start()
+        assert closing.wait(10)
+        found = []
+        reader = threading.Thread(target=lambda: found.append(registry.find("acme")))
+        reader.start()
+        reader.join(0.2)
+        assert reader.is_alive()  # Waiting for the old state to close
+
+        finish.set()
+        evictor.join(10)
+        reader.join(10)
+        assert found[0] is not acme
+        assert [m.id for m in found[0].team_members] == ["a1"]
+        assert sorted(registry.tenant_ids()) == ["acme", "globex"]
+        registry.close()
+
+    def test_held_tenants_are_not_evicted(self, tmp_path):
+        """Test a tenant held by a request is not closed, however long it has been idle"""
+        settings = Settings(state_dir=str(tmp_path), state_fsync=False, max_tenants=1, tenant_idle_seconds=60)
+        registry = TenantRegistry(settings)
+        acme = registry.get("acme", hold=True)
+        acme.last_used -= 120
+
+        with pytest.raises(TenantLimitReached):
+            registry.get("globex")
+        registry.release(acme)
+        registry.get("globex")
+        assert registry.tenant_ids() == ["globex"]
+        registry.close()
+
+    def test_in_memory_tenants_are_not_evicted(self, client, monkeypatch):
+        """Test new tenants get a 503 when the loaded ones cannot be closed without losing state"""
+        registry = TenantRegistry(Settings(max_tenants=1, tenant_idle_seconds=0))
+        monkeypatch.setattr(routes, "get_tenant_registry", lambda: registry)
+        member = {"name": "Alice", "email": "alice@example.com", "skills": [], "total_hours_available": 40}
+
+        assert client.post("/team-members", headers={"X-Tenant-ID": "acme"}, json=member).status_code == 200
+        response = client.post("/team-members", headers={"X-Tenant-ID": "globex"}, json=member)
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "60"
+        assert registry.tenant_ids() == ["acme"]
+
+
+class TestBinaryFormats:
+    """Test Arrow / MessagePack content negotiation"""
+
+    def test_negotiation(self, monkeypatch):
+        """Test Accept parsing, q-values and fallback past unavailable formats"""
+        monkeypatch.setattr(binary_formats, "is_available", lambda media_type: media_type != binary_formats.MSGPACK)
+        negotiate = binary_formats.negotiate
+        assert negotiate(None) == binary_formats.JSON
+        assert negotiate("text/html, */*;q=0.1") == binary_formats.JSON
+        assert negotiate("application/json;q=0.5, application/vnd.apache.arrow.stream") == binary_formats.ARROW_STREAM
+        assert negotiate("application/x-msgpack, application/json;q=0.5") == binary_formats.JSON
+        with pytest.raises(HTTPException) as error:
+            negotiate("application/msgpack")
+        assert error.value.status_code == 406
+
+    def test_missing_dependency_returns_406(self, seeded_client, monkeypatch):
+        """Test binary formats are refused cleanly when their library is not installed"""
+        monkeypatch.setattr(binary_formats, "is_available", lambda media_type: media_type == binary_formats.JSON)
+        monkeypatch.setattr(routes, "is_available", binary_formats.is_available)
+        assert seeded_client.get("/tasks", headers={"Accept": "application/msgpack"}).status_code == 406
+        assert seeded_client.get("/export/tasks").status_code == 406
+        response = seeded_client.get("/tasks", headers={"Accept": "application/msgpack, application/json;q=0.9"})
+        assert response.status_code == 200 and len(response.json()) == 2
+
+    def test_columns(self, seeded_client):
+        """Test models are laid out column by column with plain values"""
+        columns = binary_formats.columns(default_tenant().tasks, Task)
+        assert columns["title"] == ["Build API", "Build UI"]
+        assert columns["priority"] == ["high", "high"]
+        assert columns["required_skills"] == [["Python"], ["React"]]
+
+    def test_arrow_plan(self, seeded_client):
+        """Test the plan as an Arrow table with the sprint in the schema metadata"""
+        pa = pytest.importorskip("pyarrow")
+        member_ids = [m["id"] for m in seeded_client.get("/team-members").json()]
+        response = seeded_client.post("/sprints/plan", headers={"Accept": binary_formats.ARROW_STREAM}, json={
+            "name": "Sprint 1", "duration_days": 14, "team_member_ids": member_ids
+        })
+        table = pa.ipc.open_stream(response.content).read_all()
+        assert table.num_rows == 2
+        assert json.loads(table.schema.metadata[b"sprint"])["name"] == "Sprint 1"
+
+
+class TestEventBroker:
+    """Test live event fan-out"""
+
+    def test_fan_out_with_filters_and_resume(self):
+        """Test subscribers receive matching frames and can resume after an event id"""
+        async def scenario():
+            broker = EventBroker()
+            everything = broker.subscribe()
+            one_sprint = broker.subscribe(sprint_id="s1")
+            broker.publish("task_status_changed", {"task_id": "t1"}, "s1")
+            broker.publish("task_status_changed", {"task_id": "t2"}, "s2")
+            await asyncio.sleep(0)
+
+            assert everything.queue.qsize() == 2
+            assert one_sprint.queue.qsize() == 1
+            assert (await one_sprint.next_frame()).startswith(b"id: 1\nevent: task_status_changed\n")
+
+            resumed = broker.subscribe(last_event_id=1)
+            assert (await resumed.next_frame()).startswith(b"id: 2\n")
+            assert await resumed.next_frame(timeout=0.01) is None
+
+        asyncio.run(scenario())
+
+    def test_resume_after_broker_reset(self):
+        """Test a Last-Event-ID from before a restart gets a resync, then the new events"""
+        async def scenario():
+            broker = EventBroker()
+            for i in range(5):
+                broker.publish("sprint_progress", {"i": i})
+
+            restarted = EventBroker()
+            empty = restarted.subscribe(last_event_id=5)
+            assert b"event: resync" in await empty.next_frame()
+
+            restarted.publish("sprint_progress", {"i": 0})
+            behind = restarted.subscribe(last_event_id=5)
+            assert b"event: resync" in await behind.next_frame()
+            assert (await empty.next_frame()).startswith(b"id: 1\n")
+            assert await behind.next_frame(timeout=0.01) is None  # Missed nothing it was not told about
+
+            current = restarted.subscribe(last_event_id=1)
+            assert await current.next_frame(timeout=0.01) is None
+
+        asyncio.run(scenario())
+
+    def test_slow_subscriber_is_told_to_resync(self):
+        """Test a full queue is replaced by a resync event without affecting others"""
+        async def scenario():
+            broker = EventBroker(max_queued=2)
+            slow = broker.subscribe()
+            for i in range(3):
+                broker.publish("sprint_progress", {"i": i})
+            await asyncio.sleep(0)
+
+            assert slow.queue.qsize() == 1
+            assert b"event: resync" in await slow.next_frame()
+            assert slow.dropped == 2
+
+        asyncio.run(scenario())
+
+
+class TestAdmissionControl:
+    """Test cost-weighted admission of planning requests"""
+
+    def test_serializes_teams_and_bounds_cost(self):
+        """Test one plan per team runs at a time, other teams in parallel, within the budget"""
+        async def scenario():
+            controller = AdmissionController(budget=10, max_concurrency=4)
+            running, peak, order = set(), [0], []
+
+            def plan(name):
+                def work():
+                    running.add(name)
+                    peak[0] = max(peak[0], len(running))
+                    time.sleep(0.05)
+                    order.append(name)
+                    running.discard(name)
+                return work
+
+            await asyncio.gather(
+                controller.run("a", 4, plan("a1")),
+                controller.run("a", 4, plan("a2")),
+                controller.run("b", 4, plan("b1")),
+                controller.run("c", 100, plan("c1"))  # Over budget: runs alone
+            )
+            assert order.index("a1") < order.index("a2")
+            assert peak[0] == 2
+            assert controller.stats() == {"running": 0, "queued": 0, "cost_in_use": 0.0}
+
+        asyncio.run(scenario())
+
+    def test_idle_team_is_not_held_behind_busy_team(self):
+        """Test a team with nothing running starts at once while another team's plans are queued"""
+        async def scenario():
+            controller = AdmissionController(max_concurrency=4)
+            running = asyncio.ensure_future(controller.run("a", 1, lambda: time.sleep(0.3)))
+            await asyncio.sleep(0.01)
+            queued = asyncio.ensure_future(controller.run("a", 1, lambda: None))
+            await asyncio.sleep(0)
+            assert controller.stats()["queued"] == 1
+
+            start = time.perf_counter()
+            await controller.run("b", 1, lambda: None)
+            assert time.perf_counter() - start < 0.2
+            assert controller.stats()["queued"] == 1
+            await asyncio.gather(running, queued)
+
+        asyncio.run(scenario())
+
+    def test_overflow_is_rejected(self):
+        """Test full queues, per-team limits and expired waits are turned away"""
+        async def scenario():
+            controller = AdmissionController(max_concurrency=1, queue_size=2, queue_timeout_seconds=0.05, max_queued_per_team=1)
+            blocker = asyncio.ensure_future(controller.run("a", 1, lambda: time.sleep(0.2)))
+            await asyncio.sleep(0.01)
+            waiting = asyncio.ensure_future(controller.run("b", 1, lambda: None))
+            await asyncio.sleep(0)
+
+            with pytest.raises(Overloaded) as per_team:
+                await controller.run("b", 1, lambda: None)
+            assert per_team.value.status_code == 429
+            with pytest.raises(Overloaded) as timed_out:
+                await waiting
+            assert timed_out.value.status_code == 503
+
+            controller.queue_size = 0
+            with pytest.raises(Overloaded) as full:
+                await controller.run("c", 1, lambda: None)
+            assert full.value.status_code == 503
+            await blocker
+
+        asyncio.run(scenario())
+
+    def test_plan_rejected_with_retry_after(self, seeded_client, monkeypatch):
+        """Test an overloaded planner answers 503 with Retry-After while reads still work"""
+        async def overloaded(team, cost, func):
+            raise Overloaded(503, "Planning capacity exhausted, retry later")
+
+        monkeypatch.setattr(routes.get_admission_controller(), "run", overloaded)
+        member_ids = [m["id"] for m in seeded_client.get("/team-members").json()]
+        response = seeded_client.post("/sprints/plan", json={
+            "name": "Sprint 1", "duration_days": 14, "team_member_ids": member_ids
+        })
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+        assert seeded_client.get("/tasks").status_code == 200
+
+
+class TestPlanCache:
+    """Test the plan result cache"""
+
+    def test_concurrent_requests_share_one_computation(self):
+        """Test single-flight coalescing of identical keys"""
+        cache = PlanCache()
+        calls = []
+        started = threading.Event()
+
+        def compute():
+            calls.append(1)
+            started.set()
+            time.sleep(0.1)
+            return b"plan"
+
+        results = []
+        def worker():
+            results.append(cache.get_or_compute("key", compute))
+
+        leader = threading.Thread(target=worker)
+        leader.start()
+        started.wait()
+        followers = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in followers:
+            thread.start()
+        for thread in [leader] + followers:
+            thread.join()
+
+        assert len(calls) == 1
+        assert sorted(source for _, source in results) == ["coalesced"] * 4 + ["miss"]
+        assert cache.get_or_compute("key", compute) == (b"plan", "hit")
+
+    def test_ttl_and_lru_eviction(self):
+        """Test entries expire after the TTL and the least recently used is evicted"""
+        cache = PlanCache(ttl_seconds=0.05, max_entries=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        time.sleep(0.06)
+        assert cache.get("a") is None
+
+    def test_failures_are_not_cached(self):
+        """Test a failed computation is retried on the next request"""
+        cache = PlanCache()
+
+        def fail():
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            cache.get_or_compute("key", fail)
+        assert cache.get_or_compute("key", lambda: b"plan") == (b"plan", "miss")
@@ -1,5 +1,22 @@
+import random
 import pytest
 from src.decision_engine.task_assigner import TaskAssigner
+from src.decision_engine.constraints import (
+    PinConstraint,
+    ExcludeConstraint,
+    SameAssigneeConstraint,
+    MaxTasksConstraint,
+    SkillCapacityConstraint,
+    compile_constraints
+)
+from src.decision_engine.matrix_assigner import PlanningMatrices, greedy_assign
+from src.decision_engine.candidate_index import CandidateIndex
+from src.decision_engine.assignment_ledger import AssignmentLedger
+from src.data_model.assignment import Assignment
+from src.feature_engine.feature_extractor import FeatureExtractor
+from src.feature_engine.skill_taxonomy import SkillTaxonomy
+from src.feature_engine.planning_context import PlanningContext
+from src.feature_engine.scoring_weights import ScoringWeights
 from src.data_model.team_member import TeamMember, Skill
 from src.data_model.task import Task, Priority
 from datetime import datetime, timedelta
@@ -118,3 +135,228 @@ class TestTaskAssignment:
             reasoning_str = task_assigner.get_assignment_reasoning(assignment)
             assert assignment.task_id in reasoning_str
             assert assignment.member_id in reasoning_str
+
+
+@pytest.fixture
+def python_tasks():
+    """Four Python tasks of decreasing priority"""
+    as_of = datetime(2026, 1, 1)
+    return [
+        Task(
+            id=f"py_{i}",
+            title=f"Python task {i}",
+            description="Backend work",
+            required_skills=["Python"] + (["FastAPI"] if i % 2 else []),
+            complexity=0.5,
+            estimated_hours=6.0,
+            priority=[Priority.CRITICAL, Priority.HIGH, Priority.MEDIUM, Priority.LOW][i],
+            deadline=as_of + timedelta(days=3 + i)
+        )
+        for i in range(4)
+    ]
+
+
+def python_team(team_members):
+    """Both fixture members, the second also knowing Python"""
+    bob = team_members[1].model_copy(update={"skills": team_members[1].skills + [Skill(name="Python", proficiency=0.7)]})
+    return [team_members[0], bob]
+
+
+class TestConstraints:
+    """Test planning constraints in both assignment paths"""
+    
+    def test_pin_waives_skill_threshold(self, task_assigner, team_members, tasks):
+        """Test a pinned task goes to its member even without the skills"""
+        constraints = [PinConstraint(task_id="task_2", member_id="member_1")]
+        assignments = task_assigner.assign_tasks(tasks, team_members, constraints)
+        assert {a.task_id: a.member_id for a in assignments}["task_2"] == "member_1"
+    
+    def test_exclusion_leaves_task_unassigned(self, task_assigner, team_members, tasks):
+        """Test excluding the only qualified member leaves the task open"""
+        constraints = [ExcludeConstraint(task_id="task_1", member_ids=["member_1"])]
+        assignments = task_assigner.assign_tasks(tasks, team_members, constraints)
+        assert "task_1" not in {a.task_id for a in assignments}
+    
+    def test_same_assignee_and_caps(self, task_assigner, team_members, python_tasks):
+        """Test groups follow their first assignment and caps stop assignment"""
+        team = python_team(team_members)
+        constraints = [
+            SameAssigneeConstraint(task_ids=["py_1", "py_3"]),
+            PinConstraint(task_id="py_3", member_id="member_2"),
+            MaxTasksConstraint(member_id="member_1", max_tasks=1),
+            SkillCapacityConstraint(skill="python", max_hours=18.0),
+        ]
+        context = PlanningContext(python_tasks, datetime(2026, 1, 1))
+        assignments = task_assigner.assign_tasks(python_tasks, team, constraints, context=context)
+        assigned = {a.task_id: a.member_id for a in assignments}
+        
+        assert assigned["py_1"] == "member_2"  # Pinned through its group
+        assert list(assigned.values()).count("member_1") == 1
+        assert len(assigned) == 3  # 18 Python hours fit three 6-hour tasks
+    
+    def test_matrix_path_matches_task_assigner(self, team_members, python_tasks):
+        """Test greedy_assign with compiled constraints agrees with TaskAssigner"""
+        team = python_team(team_members)
+        constraints = [
+            SameAssigneeConstraint(task_ids=["py_0", "py_2"]),
+            ExcludeConstraint(task_id="py_1", member_ids=["member_1"]),
+            MaxTasksConstraint(max_tasks=2),
+        ]
+        context = PlanningContext(python_tasks, datetime(2026, 1, 1))
+        matrices = PlanningMatrices(python_tasks, team, context)
+        compiled = compile_constraints(constraints, matrices.tasks, matrices.member_ids)
+        plan = greedy_assign(matrices, [True] * len(python_tasks), ScoringWeights(), constraints=compiled)
+        
+        assignments = TaskAssigner().assign_tasks(python_tasks, [m.model_copy() for m in team], constraints, context=context)
+        expected = {a.task_id: a.member_id for a in assignments}
+        actual = {
+            matrices.task_ids[t]: matrices.member_ids[m] for t, m in enumerate(plan["member"]) if m >= 0
+        }
+        assert actual == expected
+        assert actual["py_2"] == actual["py_0"]
+        assert actual["py_1"] == "member_2"
+    
+    def test_invalid_constraints(self, tasks):
+        """Test unknown members and conflicting pins are rejected"""
+        with pytest.raises(ValueError):
+            compile_constraints([PinConstraint(task_id="task_1", member_id="ghost")], tasks, ["member_1"])
+        conflicting = [
+            SameAssigneeConstraint(task_ids=["task_1", "task_2"]),
+            PinConstraint(task_id="task_1", member_id="member_1"),
+            PinConstraint(task_id="task_2", member_id="member_2"),
+        ]
+        with pytest.raises(ValueError):
+            compile_constraints(conflicting, tasks, ["member_1", "member_2"])
+
+
+def synthetic_org(count: int, seed: int = 0):
+    """Members drawn from a few skill families, plus one task per family"""
+    rng = random.Random(seed)
+    families = [[f"f{f}-s{s}" for s in range(6)] for f in range(8)]
+    members = []
+    for i in range(count):
+        family = rng.choice(families)
+        members.append(TeamMember(
+            id=f"m{i}", name=f"M{i}", email=f"m{i}@example.com",
+            skills=[Skill(name=s, proficiency=round(rng.uniform(0.3, 1.0), 2)) for s in rng.sample(family, 3)],
+            total_hours_available=40.0
+        ))
+    tasks = [
+        Task(
+            id=f"t{f}", title=f"T{f}", description="", required_skills=family[:2], complexity=0.5,
+            estimated_hours=4.0, priority=Priority.HIGH, deadline=datetime(2026, 1, 10)
+        )
+        for f, family in enumerate(families)
+    ]
+    return members, tasks
+
+
+class TestCandidateIndex:
+    """Test approximate top-k candidate retrieval"""
+    
+    def test_vectors_score_like_feature_extractor(self, team_members, tasks):
+        """Test the index's inner product equals the exact skill score"""
+        taxonomy = SkillTaxonomy()
+        taxonomy.add_skills({"FastAPI": {"parent": "Python"}, "React": {"parent": "JavaScript"}})
+        index = CandidateIndex(top_k=2, min_members=1, taxonomy=taxonomy)
+        for member in team_members:
+            index.upsert(member)
+        for task in tasks:
+            query = index._query(task)
+            for member in team_members:
+                score = float(index._vectors[index._rows[member.id]] @ query)
+                assert score == pytest.approx(FeatureExtractor.skill_task_compatibility(member, task, taxonomy), abs=1e-6)
+    
+    def test_full_probe_is_exact(self):
+        """Test probing every list returns the exact top-k"""
+        members, tasks = synthetic_org(300)
+        index = CandidateIndex(top_k=10, n_lists=12, n_probe=12, min_members=1, taxonomy=SkillTaxonomy())
+        for member in members:
+            index.upsert(member)
+        for task in tasks:
+            found = index.search(task)
+            assert set(found) == set(index.exact_search(task))
+    
+    def test_recall_and_incremental_updates(self):
+        """Test partial probing keeps most true neighbours as members change"""
+        members, tasks = synthetic_org(400)
+        index = CandidateIndex(top_k=10, n_probe=4, min_members=1, taxonomy=SkillTaxonomy())
+        for member in members[:200]:
+            index.upsert(member)
+        index.search(tasks[0])  # Trains on the first 200
+        for member in members[200:]:
+            index.upsert(member)
+        
+        hits = sum(len(set(index.search(task)) & set(index.exact_search(task))) for task in tasks)
+        assert hits / (10 * len(tasks)) >= 0.9
+        assert index._trained_size == 400  # Retrained after doubling
+        
+        index.remove("m0")
+        assert all("m0" not in index.search(task) for task in tasks)
+    
+    def test_assigner_scores_only_candidates(self):
+        """Test TaskAssigner restricted to top-k candidates matches full scoring on them"""
+        members, tasks = synthetic_org(120, seed=1)
+        index = CandidateIndex(top_k=40, n_probe=100, min_members=1, taxonomy=SkillTaxonomy())
+        for member in members:
+            index.upsert(member)
+        context = PlanningContext(tasks, datetime(2026, 1, 1))
+        
+        full = TaskAssigner().assign_tasks([t.model_copy() for t in tasks], [m.model_copy() for m in members], context=context)
+        narrowed = TaskAssigner().assign_tasks(
+            [t.model_copy() for t in tasks], [m.model_copy() for m in members], context=context, candidate_index=index
+        )
+        assert {a.task_id: a.member_id for a in narrowed} == {a.task_id: a.member_id for a in full}
+        assert CandidateIndex(min_members=1000).search(tasks[0]) is None  # Small pools are scored exactly
+
+
+def make_assignment(i: int, task_id: str, member_id: str, sprint_id: str = "sprint_1", assigned_at=None) -> Assignment:
+    return Assignment(
+        id=f"a{i}", task_id=task_id, member_id=member_id, sprint_id=sprint_id,
+        assigned_at=assigned_at or datetime(2026, 1, 1) + timedelta(hours=i),
+        estimated_hours=4.0, skill_compatibility_score=0.8, workload_penalty=0.0,
+        urgency_boost=0.5, final_score=0.7
+    )
+
+
+class TestAssignmentLedger:
+    """Test the indexed, bounded assignment ledger"""
+    
+    def test_indexes_and_release(self):
+        """Test lookups by member, task and sprint as tasks are reassigned and released"""
+        ledger = AssignmentLedger()
+        ledger.record([make_assignment(1, "t1", "m1"), make_assignment(2, "t2", "m1")])
+        ledger.record([make_assignment(3, "t1", "m2", sprint_id="sprint_2")])  # Reassigned
+        
+        assert [a.task_id for a in ledger.current_for_member("m1")] == ["t2"]
+        assert ledger.current_for_task("t1").member_id == "m2"
+        assert [a.id for a in ledger.task_history("t1")] == ["a1", "a3"]
+        assert [a.id for a in ledger.for_sprint("sprint_1")] == ["a1", "a2"]
+        
+        ledger.release("t2")
+        assert ledger.current_for_member("m1") == []
+        ledger.record([make_assignment(2, "t2", "m1")])  # Replayed id is ignored
+        assert len(ledger) == 3 and ledger.current_for_task("t2") is None
+    
+    def test_retention_archives_oldest(self, tmp_path):
+        """Test evicted history is archived and current assignments stay queryable"""
+        ledger = AssignmentLedger(max_entries=2, max_age_days=30, archive_dir=str(tmp_path))
+        ledger.record([make_assignment(i, f"t{i}", "m1") for i in range(3)], now=datetime(2026, 1, 2))
+        assert len(ledger) == 2 and ledger.get("a0") is None
+        assert ledger.current_for_task("t0").id == "a0"
+        
+        ledger.record([make_assignment(3, "t0", "m2", assigned_at=datetime(2026, 3, 1))], now=datetime(2026, 3, 1))
+        assert len(ledger) == 1  # a1 and a2 aged out
+        assert [a.id for a in ledger.task_history("t0")] == ["a3"]
+        assert [a.id for a in ledger.task_history("t0", include_archived=True)] == ["a0", "a3"]
+        assert len(list(tmp_path.glob("assignments-*.jsonl"))) == 1
+    
+    def test_export_restore(self):
+        """Test a restored ledger answers the same queries"""
+        ledger = AssignmentLedger(max_entries=2)
+        ledger.record([make_assignment(i, f"t{i}", "m1") for i in range(3)])
+        restored = AssignmentLedger(max_entries=2)
+        restored.restore(ledger.export())
+        
+        assert [a.id for a in restored.current_for_member("m1")] == ["a0", "a1", "a2"]
+        assert [a.id for a in restored.for_sprint("sprint_1")] == ["a1", "a2"]
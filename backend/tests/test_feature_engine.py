@@ -1,8 +1,11 @@
 import pytest
-from src.feature_engine.feature_extractor import FeatureExtractor
+from src.feature_engine.feature_extractor import FeatureExtractor, SkillCoverage
+from src.feature_engine.planning_context import PlanningContext
+from src.feature_engine.skill_taxonomy import SkillTaxonomy
 from src.data_model.team_member import TeamMember, Skill
 from src.data_model.task import Task, Priority
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+import numpy as np
 
 
 @pytest.fixture
@@ -80,3 +83,131 @@ class TestFeatureExtraction:
         assert capacity["total_capacity"] == 80.0
         assert capacity["available_capacity"] == 80.0
         assert capacity["utilization_ratio"] == 0.0
+
+
+TAXONOMY = {
+    "Python": {"aliases": ["py", "python3"]},
+    "FastAPI": {"parent": "Python"},
+    "Django": {"parent": "Python", "related": {"FastAPI": 0.6}},
+    "JavaScript": {"aliases": ["js"]},
+    "React": {"parent": "JavaScript"},
+}
+
+
+class TestSkillTaxonomy:
+    """Test skill normalization, aliases and transitive similarity"""
+    
+    def test_aliases_and_case(self):
+        """Test aliases and differently cased names are the same skill"""
+        taxonomy = SkillTaxonomy()
+        taxonomy.add_skills(TAXONOMY)
+        assert taxonomy.similarity(["PY", "  python3 "], ["python"]).tolist() == [[1.0], [1.0]]
+        assert taxonomy.coverage([("docker", 0.5)], ["Docker", "Kubernetes"]) == [0.5, 0.0]
+        with pytest.raises(ValueError):
+            taxonomy.add_skills({"Perl": {"aliases": ["py"]}})
+    
+    def test_transitive_similarity(self):
+        """Test children cover parents and the closure follows chains"""
+        taxonomy = SkillTaxonomy(child_weight=0.7, parent_weight=0.4)
+        taxonomy.add_skills(TAXONOMY)
+        block = taxonomy.similarity(["FastAPI", "Python", "Django"], ["Python", "FastAPI", "React"])
+        assert block[0, 0] == pytest.approx(0.7)  # FastAPI covers Python
+        assert block[1, 1] == pytest.approx(0.4)  # Python partly covers FastAPI
+        assert block[2, 1] == pytest.approx(0.6)  # Related beats Django -> Python -> FastAPI (0.28)
+        assert block[0, 2] == 0.0
+    
+    def test_incremental_load_matches_full_load(self):
+        """Test adding definitions in batches gives the same closure"""
+        full = SkillTaxonomy()
+        full.add_skills(TAXONOMY)
+        incremental = SkillTaxonomy()
+        for name, definition in TAXONOMY.items():
+            incremental.add_skills({name: definition})
+        
+        skills = full.skills
+        assert sorted(incremental.skills) == sorted(skills)
+        assert np.allclose(incremental.similarity(skills, skills), full.similarity(skills, skills))
+    
+    def test_disk_cache(self, tmp_path):
+        """Test a closure computed once is reused from the cache directory"""
+        first = SkillTaxonomy(cache_dir=str(tmp_path))
+        first.add_skills(TAXONOMY)
+        assert len(list(tmp_path.glob("skill-closure-*.npy"))) == 1
+        
+        second = SkillTaxonomy(cache_dir=str(tmp_path))
+        second._add_edge = None  # A cache hit never folds edges in
+        second.add_skills(TAXONOMY)
+        assert second.fingerprint == first.fingerprint
+        skills = first.skills
+        assert np.array_equal(second.similarity(skills, skills), first.similarity(skills, skills))
+    
+    def test_matrix_matches_pairwise(self, sample_member, sample_task):
+        """Test the vectorized matrix equals per-pair scoring with a taxonomy"""
+        taxonomy = SkillTaxonomy()
+        taxonomy.add_skills(TAXONOMY)
+        members = [
+            sample_member,
+            sample_member.model_copy(update={"id": "m2", "skills": [Skill(name="django", proficiency=0.6)]}),
+            sample_member.model_copy(update={"id": "m3", "skills": []}),
+        ]
+        tasks = [
+            sample_task,
+            sample_task.model_copy(update={"id": "t2", "required_skills": ["python", "React"]}),
+            sample_task.model_copy(update={"id": "t3", "required_skills": []}),
+        ]
+        matrix = FeatureExtractor.skill_compatibility_matrix(tasks, members, taxonomy)
+        for i, task in enumerate(tasks):
+            for j, member in enumerate(members):
+                assert matrix[i, j] == pytest.approx(FeatureExtractor.skill_task_compatibility(member, task, taxonomy))
+        assert matrix[1, 1] == pytest.approx(0.7 * 0.6 / 2)
+        
+        coverage = SkillCoverage(tasks, members, taxonomy)
+        assert np.allclose(coverage.scores(1), matrix[1])
+        assert np.allclose(coverage.scores(0, [2, 0]), matrix[0, [2, 0]])
+        assert coverage.scores(2, [1]).tolist() == [1.0]
+    
+    def test_empty_taxonomy_matches_names(self):
+        """Test an empty taxonomy matches normalized names and keeps the best proficiency"""
+        taxonomy = SkillTaxonomy()
+        held = [("Python", 0.5), (" python ", 0.9), ("Go", 0.4)]
+        assert taxonomy.coverage(held, ["PYTHON", "Rust", "go"]) == [0.9, 0.0, 0.4]
+
+
+class TestPlanningContext:
+    """Test the per-run planning context"""
+    
+    def test_urgency_matches_scalar(self, sample_task):
+        """Test vectorized urgency equals the per-task computation"""
+        as_of = datetime(2026, 1, 1, 12, 0, 0)
+        tasks = [
+            sample_task.model_copy(update={"id": f"t{h}", "deadline": as_of + timedelta(hours=h)})
+            for h in range(-50, 300, 7)
+        ]
+        context = PlanningContext(tasks, as_of)
+        
+        for task in tasks:
+            assert context.deadline_urgency[task.id] == task.urgency_score(as_of)
+            expected = 0.6 * task.urgency_score(as_of) + 0.4 * task.priority_weight()
+            assert FeatureExtractor.task_urgency_factor(task, context) == expected
+    
+    def test_as_of_makes_plans_reproducible(self, sample_task):
+        """Test urgency depends only on the reference time"""
+        as_of = sample_task.deadline - timedelta(days=10)
+        assert PlanningContext([sample_task], as_of).urgency_factor(sample_task) == 0.6 * 0.3 + 0.4 * 0.85
+        later = PlanningContext([sample_task], as_of + timedelta(days=9))
+        assert later.urgency_factor(sample_task) == 0.6 * 0.9 + 0.4 * 0.85
+    
+    def test_deadline_normalized_to_utc(self, sample_task):
+        """Test timezone-aware deadlines are converted once at ingest"""
+        aware = datetime(2026, 1, 1, 12, 0, tzinfo=timezone(timedelta(hours=5)))
+        task = Task(**{**sample_task.model_dump(), "deadline": aware})
+        assert task.deadline == datetime(2026, 1, 1, 7, 0)
+        assert task.deadline.tzinfo is None
+    
+    def test_assigned_deadline_normalized_to_utc(self, sample_task):
+        """Test an aware deadline set after construction is normalized and still scored"""
+        as_of = datetime(2026, 1, 1, 0, 0)
+        sample_task.deadline = datetime(2026, 1, 3, 12, 0, tzinfo=timezone(timedelta(hours=-5)))
+        assert sample_task.deadline == datetime(2026, 1, 3, 17, 0)
+        assert sample_task.urgency_score(as_of) == 0.9
+        assert PlanningContext([sample_task], as_of).deadline_urgency[sample_task.id] == 0.9
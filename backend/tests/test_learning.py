@@ -0,0 +1,308 @@
+import json
+import time
+import pytest
+from src.learning.feedback_loop import FeedbackLoop
+from src.learning.streaming_stats import RunningStats
+from src.learning.history_store import OutcomeStore, AssignmentOutcome
+from src.learning.estimate_model import EstimateCorrectionModel
+from src.sprint_planner.sprint_optimizer import SprintOptimizer
+from src.learning.weight_tuner import WeightTuner
+from src.feature_engine.scoring_weights import WeightRegistry, ScoringWeights
+from src.data_model.assignment import Assignment
+from src.data_model.team_member import TeamMember, Skill
+from src.data_model.task import Task, Priority, TaskStatus
+from datetime import datetime, timedelta, timezone
+
+
+@pytest.fixture
+def team_members():
+    """Create sample team members"""
+    return [
+        TeamMember(
+            id="member_1",
+            name="Alice",
+            email="alice@example.com",
+            skills=[Skill(name="Python", proficiency=0.9)],
+            total_hours_available=40.0,
+            current_workload=16.0,
+            reliability_score=0.9
+        ),
+    ]
+
+
+@pytest.fixture
+def tasks():
+    """Create sample completed tasks"""
+    return [
+        Task(
+            id="task_1",
+            title="Build Backend API",
+            description="Create REST API endpoints",
+            required_skills=["Python"],
+            complexity=0.7,
+            estimated_hours=10.0,
+            priority=Priority.HIGH,
+            deadline=datetime.utcnow() + timedelta(days=5),
+            status=TaskStatus.COMPLETED
+        ),
+        Task(
+            id="task_2",
+            title="Write Tests",
+            description="Create unit tests",
+            required_skills=["Python"],
+            complexity=0.2,
+            estimated_hours=6.0,
+            priority=Priority.MEDIUM,
+            deadline=datetime.utcnow() + timedelta(days=7),
+            status=TaskStatus.DELAYED
+        ),
+    ]
+
+
+@pytest.fixture
+def assignments():
+    """Create sample assignments with actual hours recorded"""
+    return [
+        Assignment(
+            id="a1", task_id="task_1", member_id="member_1",
+            estimated_hours=10.0, actual_hours=12.0,
+            skill_compatibility_score=0.9, workload_penalty=0.6,
+            urgency_boost=0.8, final_score=0.8,
+            completed_at=datetime.utcnow()
+        ),
+        Assignment(
+            id="a2", task_id="task_2", member_id="member_1",
+            estimated_hours=6.0, actual_hours=9.0,
+            skill_compatibility_score=0.9, workload_penalty=0.6,
+            urgency_boost=0.6, final_score=0.7
+        ),
+    ]
+
+
+class TestStreamingAggregates:
+    """Test streaming feedback aggregates"""
+
+    def test_running_stats_match_batch(self):
+        """Test running mean/variance against a direct computation"""
+        values = [3.0, 5.0, 8.0, 1.0, 4.0]
+        stats = RunningStats(window_size=3)
+        for value in values:
+            stats.update(value)
+
+        mean = sum(values) / len(values)
+        variance = sum((v - mean) ** 2 for v in values) / len(values)
+        assert stats.mean == pytest.approx(mean)
+        assert stats.variance == pytest.approx(variance)
+        assert stats.window_mean == pytest.approx(sum(values[-3:]) / 3)
+
+    def test_insights_from_aggregates(self, assignments, team_members, tasks):
+        """Test insights are served from aggregates"""
+        loop = FeedbackLoop()
+        loop.collect_sprint_feedback(assignments, team_members, tasks)
+        loop.collect_sprint_feedback(assignments, team_members, tasks)
+
+        insights = loop.get_learning_insights()
+        assert insights["sprints_completed"] == 2
+        assert insights["average_completion_rate"] == 50.0
+        assert insights["average_prediction_error"] == 2.5
+        assert loop.get_member_insights("member_1")["count"] == 4
+        assert loop.get_skill_insights("Python")["mean"] == 2.5
+        assert loop.get_complexity_insights(0.75)["mean"] == 2.0
+
+    def test_history_cap_spills_to_disk(self, tmp_path, assignments, team_members, tasks):
+        """Test capped history spills evicted records"""
+        spill_path = tmp_path / "history.jsonl"
+        loop = FeedbackLoop(max_history=2, spill_path=str(spill_path))
+        for _ in range(3):
+            loop.collect_sprint_feedback(assignments, team_members, tasks)
+
+        assert len(loop.historical_data) == 2
+        spilled = [json.loads(line) for line in spill_path.read_text().splitlines()]
+        assert len(spilled) == 1
+        assert loop.get_learning_insights()["sprints_completed"] == 3
+
+
+class TestOutcomeStore:
+    """Test the columnar outcome store"""
+
+    def test_filtered_query_survives_restart(self, tmp_path, assignments, team_members, tasks):
+        """Test outcomes persist and filtered aggregations are correct"""
+        store = OutcomeStore(str(tmp_path / "outcomes"))
+        loop = FeedbackLoop(outcome_store=store)
+        loop.collect_sprint_feedback(assignments, team_members, tasks)
+
+        reopened = OutcomeStore(str(tmp_path / "outcomes"))
+        assert len(reopened) == 2
+        result = reopened.query(skill="Python", min_complexity=0.7, last_n_sprints=10)
+        assert result["count"] == 1
+        assert result["mean_error"] == 2.0
+        assert result["on_time_rate"] == 1.0
+        assert reopened.query(member_id="unknown")["count"] == 0
+
+    def test_compaction_preserves_results(self, tmp_path, assignments, tasks):
+        """Test merging small segments keeps query results unchanged"""
+        store = OutcomeStore(str(tmp_path / "outcomes"), compact_threshold=100)
+        task_map = {t.id: t for t in tasks}
+        for _ in range(5):
+            store.record_sprint([
+                AssignmentOutcome.from_assignment(a, task_map[a.task_id]) for a in assignments
+            ])
+        before = store.query(skill="Python", last_n_sprints=3)
+        store.compact()
+        assert store.query(skill="Python", last_n_sprints=3) == before
+        assert before["count"] == 6
+
+
+    def test_recorded_at_is_utc(self, tmp_path, monkeypatch):
+        """Test naive recorded_at times are stored as UTC whatever the host's time zone"""
+        monkeypatch.setenv("TZ", "America/New_York")
+        time.tzset()
+        try:
+            store = OutcomeStore(str(tmp_path / "outcomes"))
+            store.record_sprint([AssignmentOutcome(
+                member_id="member_1", required_skills=["Python"], complexity=0.5,
+                estimated_hours=8, actual_hours=8, on_time=True, recorded_at=datetime(2026, 1, 1, 12, 0)
+            )], flush=False)
+            stored = store._buffered_arrays()["recorded_at"][0]
+        finally:
+            monkeypatch.undo()
+            time.tzset()
+        assert stored == datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc).timestamp()
+
+class TestEstimateCorrection:
+    """Test the learned estimate-correction model"""
+
+    @staticmethod
+    def _train(model, ratio):
+        for sprint in range(30):
+            model.partial_fit([
+                AssignmentOutcome(
+                    member_id="member_1",
+                    required_skills=["Python"],
+                    complexity=(i % 10) / 10,
+                    estimated_hours=2.0 + i % 12,
+                    actual_hours=(2.0 + i % 12) * ratio,
+                    on_time=True
+                )
+                for i in range(20)
+            ])
+
+    def test_raw_estimates_until_trained(self, tasks):
+        """Test untrained model returns raw estimates"""
+        model = EstimateCorrectionModel()
+        hours = model.predict_hours(tasks)
+        assert hours == {t.id: t.estimated_hours for t in tasks}
+
+    def test_learns_systematic_overrun(self, tasks, team_members):
+        """Test corrected hours reflect a consistent 50% overrun"""
+        model = EstimateCorrectionModel()
+        self._train(model, 1.5)
+
+        hours = model.predict_hours(tasks)
+        assert hours["task_1"] == pytest.approx(15.0, rel=0.1)
+        matrix = model.predict_matrix(tasks, team_members)
+        assert matrix.shape == (2, 1)
+        assert matrix[0, 0] == pytest.approx(15.0, rel=0.1)
+
+    def test_planner_packs_corrected_hours(self, tasks, team_members):
+        """Test sprint selection uses corrected hours"""
+        model = EstimateCorrectionModel()
+        self._train(model, 2.0)
+        optimizer = SprintOptimizer(estimate_model=model)
+
+        # 30h capacity * 0.85 fits both raw estimates (16h) but not 32h corrected
+        effective = model.predict_hours(tasks)
+        assert len(optimizer._select_tasks_for_sprint(tasks, 30.0)) == 2
+        selected = optimizer._select_tasks_for_sprint(tasks, 30.0, effective)
+        assert sum(effective[t.id] for t in selected) <= 25.5
+        assert len(selected) == 1
+
+
+class TestWeightTuning:
+    """Test offline scoring-weight tuning and the weight registry"""
+
+    @staticmethod
+    def _history(tasks):
+        """Assignments where skill match alone predicts on-time delivery"""
+        task = tasks[0]
+        assignments = []
+        for i in range(200):
+            skill_match = (i % 10) / 10
+            on_time = skill_match >= 0.5
+            assignments.append(Assignment(
+                id=f"a{i}", task_id=task.id, member_id="member_1",
+                estimated_hours=10.0, actual_hours=10.0,
+                skill_compatibility_score=skill_match, workload_penalty=0.5,
+                urgency_boost=0.5, final_score=0.5,
+                completed_at=task.deadline + (timedelta(hours=-1) if on_time else timedelta(days=1)),
+                reasoning={
+                    "skill_match": skill_match,
+                    "workload": ((i * 7) % 10) / 10,
+                    "reliability": ((i * 3) % 10) / 10,
+                    "urgency": 0.5
+                }
+            ))
+        return assignments, [task]
+
+    def test_fit_favours_predictive_feature(self, tasks):
+        """Test the tuner shifts weight towards the feature that predicts outcomes"""
+        assignments, history_tasks = self._history(tasks)
+        weights = WeightTuner(prior_strength=10).fit(assignments, history_tasks, version="v1")
+
+        assert weights.version == "v1"
+        assert weights.weight_skill > 0.4
+        assert sum(weights.as_kwargs().values()) == pytest.approx(1.0)
+        assert weights.metrics["fitted_correlation"] > weights.metrics["prior_correlation"]
+
+    def test_registry_hot_reload(self, tmp_path):
+        """Test weights activated in one registry are picked up by another"""
+        path = str(tmp_path / "weights.json")
+        writer = WeightRegistry(path)
+        reader = WeightRegistry(path)
+        assert reader.get().version == "builtin"
+
+        writer.register(ScoringWeights(version="v2", weight_skill=0.7,
+                                       weight_workload=0.1, weight_reliability=0.1,
+                                       weight_urgency=0.1), activate=True, profile="backend")
+        assert reader.get("backend").version == "v2"
+        assert reader.get().version == "builtin"
+
+
+class TestBatchProfileUpdates:
+    """Test vectorized member-profile updates"""
+
+    def test_batch_matches_sequential(self):
+        """Test bulk updates equal applying completions one by one"""
+        def make_members():
+            return [
+                TeamMember(
+                    id=f"m{i}", name=f"M{i}", email=f"m{i}@example.com",
+                    skills=[], total_hours_available=40.0,
+                    average_task_completion_time=0.0 if i % 3 == 0 else 4.0 + i,
+                    reliability_score=(i % 10) / 10
+                )
+                for i in range(30)
+            ]
+
+        completions = [
+            (f"m{(i * 7) % 25}", float(i % 13), i % 4 != 0)
+            for i in range(400)
+        ]
+
+        loop = FeedbackLoop()
+        sequential = make_members()
+        by_id = {m.id: m for m in sequential}
+        for member_id, hours, on_time in completions:
+            loop.update_member_profile(by_id[member_id], hours, on_time)
+
+        batched = make_members()
+        loop.update_member_profiles(batched, completions)
+
+        for expected, actual in zip(sequential, batched):
+            assert actual.average_task_completion_time == expected.average_task_completion_time
+            assert actual.reliability_score == expected.reliability_score
+
+    def test_unknown_member_rejected(self, team_members):
+        """Test completions for unknown members raise"""
+        with pytest.raises(ValueError):
+            FeedbackLoop().update_member_profiles(team_members, [("ghost", 3.0, True)])
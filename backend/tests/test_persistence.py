@@ -0,0 +1,251 @@
+import pytest
+import threading
+from datetime import datetime, timedelta
+from src.data_model.sprint import Sprint
+from src.data_model.team_member import TeamMember, Skill
+from src.data_model.task import Task, Priority, TaskStatus
+from src.learning.feedback_loop import FeedbackLoop
+from src.persistence.event_log import EventLog
+from src.analytics.sprint_analytics import SprintAnalytics
+from src.data_model.assignment import Assignment
+from src.decision_engine.assignment_ledger import AssignmentLedger
+from src.persistence.state_store import PlannerState, StateStore
+
+
+def make_member(i: int) -> TeamMember:
+    return TeamMember(
+        id=f"member_{i}",
+        name=f"Member {i}",
+        email=f"member{i}@example.com",
+        skills=[Skill(name="Python", proficiency=0.8)],
+        total_hours_available=40.0
+    )
+
+
+def make_task(i: int) -> Task:
+    return Task(
+        id=f"task_{i}",
+        title=f"Task {i}",
+        description="Persisted task",
+        required_skills=["Python"],
+        complexity=0.5,
+        estimated_hours=8.0,
+        priority=Priority.HIGH,
+        deadline=datetime.utcnow() + timedelta(days=5)
+    )
+
+
+def open_store(path, snapshot_interval=10_000):
+    """Create and recover a store over fresh in-memory lists"""
+    state = PlannerState([], [], [], FeedbackLoop())
+    store = StateStore(str(path), state, snapshot_interval=snapshot_interval, fsync=False)
+    store.recover()
+    return store, state
+
+
+def add_member(store, state, member):
+    with store.mutation():
+        state.team_members.append(member)
+        store.record("member_created", {"member": member})
+
+
+class TestStateRecovery:
+    """Test crash recovery from the event log and snapshots"""
+
+    def test_replay_after_crash(self, tmp_path):
+        """Test state is rebuilt from the log when no snapshot was taken"""
+        store, state = open_store(tmp_path)
+        add_member(store, state, make_member(1))
+        task = make_task(1)
+        with store.mutation():
+            state.tasks.append(task)
+            store.record("task_created", {"task": task})
+
+        task.assigned_to = "member_1"
+        state.team_members[0].current_workload = 8.0
+        sprint = Sprint(
+            id="sprint_1",
+            name="Sprint 1",
+            start_date=datetime.utcnow(),
+            end_date=datetime.utcnow() + timedelta(days=14),
+            team_members=["member_1"]
+        )
+        with store.mutation():
+            state.sprints.append(sprint)
+            store.record("plan_committed", {"sprint": sprint, "tasks": [task], "members": state.team_members})
+        store.close(snapshot=False)  # Simulated crash: no final snapshot
+
+        recovered, recovered_state = open_store(tmp_path)
+        assert recovered_state.team_members == state.team_members
+        assert recovered_state.tasks == state.tasks
+        assert recovered_state.sprints == state.sprints
+        assert recovered_state.tasks[0].assigned_to == "member_1"
+        recovered.close()
+
+    def test_snapshot_bounds_replay(self, tmp_path):
+        """Test snapshots replace old log segments and only the tail is replayed"""
+        store, state = open_store(tmp_path, snapshot_interval=10)
+        for i in range(25):
+            add_member(store, state, make_member(i))
+        store.close(snapshot=False)
+
+        assert [p.name for p in tmp_path.glob("snapshot-*.json")] == ["snapshot-000000000020.json"]
+        assert [first for first, _ in store.log.segments()] == [21]
+
+        recovered, recovered_state = open_store(tmp_path)
+        assert [m.id for m in recovered_state.team_members] == [f"member_{i}" for i in range(25)]
+        assert recovered.log.last_seq == 25
+        recovered.close()
+
+        # A clean shutdown snapshots, so the next start replays nothing
+        stats = StateStore(str(tmp_path), PlannerState([], [], []), fsync=False).recover()
+        assert stats["snapshot_seq"] == 25
+        assert stats["replayed_events"] == 0
+
+    def test_torn_tail_is_discarded(self, tmp_path):
+        """Test a partially written last record is ignored and truncated"""
+        store, state = open_store(tmp_path)
+        add_member(store, state, make_member(1))
+        add_member(store, state, make_member(2))
+        store.close(snapshot=False)
+
+        _, segment = store.log.segments()[-1]
+        data = segment.read_bytes()
+        segment.write_bytes(data[:-20])
+
+        recovered, recovered_state = open_store(tmp_path)
+        assert [m.id for m in recovered_state.team_members] == ["member_1"]
+        add_member(recovered, recovered_state, make_member(3))
+        recovered.close(snapshot=False)
+
+        _, again = open_store(tmp_path)
+        assert [m.id for m in again.team_members] == ["member_1", "member_3"]
+
+    def test_feedback_history_is_recovered(self, tmp_path):
+        """Test feedback records logged by the FeedbackLoop survive a restart"""
+        state = PlannerState([], [], [])
+        store = StateStore(str(tmp_path), state, fsync=False)
+        store.recover()
+        feedback_loop = FeedbackLoop(state_store=store)
+        feedback_loop.collect_sprint_feedback([], [], [make_task(1)])
+        store.close(snapshot=False)
+
+        recovered, recovered_state = open_store(tmp_path)
+        history = recovered_state.feedback_loop.historical_data
+        assert len(history) == 1
+        assert isinstance(history[0]["timestamp"], datetime)
+        assert recovered_state.feedback_loop.get_learning_insights()["sprints_completed"] == 1
+        recovered.close()
+
+    def test_analytics_are_recovered(self, tmp_path):
+        """Test burndown and velocity rollups survive a snapshot plus log replay"""
+        analytics = SprintAnalytics()
+        state = PlannerState([], [], [], analytics=analytics)
+        store = StateStore(str(tmp_path), state, fsync=False)
+        store.recover()
+
+        start = datetime.utcnow() - timedelta(days=3)
+        sprint = Sprint(
+            id="sprint_1",
+            name="Sprint 1",
+            start_date=start,
+            end_date=start + timedelta(days=14),
+            team_members=["member_1"],
+            task_ids=["task_1", "task_2"]
+        )
+        sprint_tasks = [make_task(1), make_task(2)]
+        for task in sprint_tasks:
+            task.assigned_to = "member_1"
+            task.sprint_id = sprint.id
+        with store.mutation():
+            state.sprints.append(sprint)
+            state.tasks.extend(sprint_tasks)
+            analytics.open_sprint(sprint, sprint_tasks)
+            store.record("plan_committed", {"sprint": sprint, "tasks": sprint_tasks, "members": []})
+        store.snapshot()
+
+        with store.mutation():
+            sprint_tasks[0].status = TaskStatus.COMPLETED
+            at = start + timedelta(days=1)
+            analytics.record_transition(sprint_tasks[0], TaskStatus.PENDING, at)
+            store.record("task_status_changed", {
+                "task": sprint_tasks[0], "sprint": sprint, "previous": TaskStatus.PENDING, "at": at
+            })
+        with store.mutation():
+            at = start + timedelta(days=2)
+            analytics.close_sprint(sprint.id, at)
+            store.record("sprint_closed", {"sprint": sprint, "tasks": [], "members": [], "at": at})
+        store.close(snapshot=False)
+
+        recovered_analytics = SprintAnalytics()
+        recovered = StateStore(str(tmp_path), PlannerState([], [], [], analytics=recovered_analytics), fsync=False)
+        assert recovered.recover()["replayed_events"] == 2
+        assert recovered_analytics.burndown(sprint.id) == analytics.burndown(sprint.id)
+        assert recovered_analytics.velocity() == analytics.velocity()
+        assert recovered_analytics.velocity().carry_over_rate == 0.5
+        recovered.close()
+
+
+    def test_assignment_ledger_is_recovered(self, tmp_path):
+        """Test current assignments and history survive a snapshot plus log replay"""
+        ledger = AssignmentLedger()
+        state = PlannerState([], [], [], ledger=ledger)
+        store = StateStore(str(tmp_path), state, fsync=False)
+        store.recover()
+        
+        sprint = Sprint(
+            id="sprint_1", name="Sprint 1", start_date=datetime.utcnow(),
+            end_date=datetime.utcnow() + timedelta(days=14), team_members=["member_1"],
+            task_ids=["task_1", "task_2"]
+        )
+        assignments = [
+            Assignment(
+                id=f"a{i}", task_id=f"task_{i}", member_id="member_1", sprint_id=sprint.id, estimated_hours=8.0,
+                skill_compatibility_score=0.8, workload_penalty=0.0, urgency_boost=0.5, final_score=0.7
+            )
+            for i in (1, 2)
+        ]
+        with store.mutation():
+            ledger.record(assignments)
+            store.record("plan_committed", {
+                "sprint": sprint, "tasks": [make_task(1), make_task(2)], "members": [], "assignments": assignments
+            })
+        store.snapshot()
+        
+        completed = make_task(1)
+        completed.status = TaskStatus.COMPLETED
+        with store.mutation():
+            ledger.release(completed.id)
+            store.record("task_status_changed", {"task": completed, "previous": TaskStatus.PENDING, "at": datetime.utcnow()})
+        store.close(snapshot=False)
+        
+        recovered_ledger = AssignmentLedger()
+        recovered = StateStore(str(tmp_path), PlannerState([], [], [], ledger=recovered_ledger), fsync=False)
+        assert recovered.recover()["replayed_events"] == 1
+        assert [a.id for a in recovered_ledger.current_for_member("member_1")] == ["a2"]
+        assert [a.id for a in recovered_ledger.task_history("task_1")] == ["a1"]
+        recovered.close()
+
+
+class TestEventLog:
+    """Test the write-ahead log"""
+
+    def test_concurrent_appends_are_group_committed(self, tmp_path):
+        """Test concurrent writers share disk syncs and every event is kept in order"""
+        log = EventLog(str(tmp_path), group_commit_ms=5.0, fsync=False)
+        log.open()
+
+        def writer(n):
+            for i in range(25):
+                log.wait(log.append("test", {"writer": n, "i": i}))
+
+        threads = [threading.Thread(target=writer, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        log.close()
+
+        assert log.commits < 200
+        replayed = list(EventLog(str(tmp_path)).replay())
+        assert [seq for seq, _, _ in replayed] == list(range(1, 201))
@@ -0,0 +1,90 @@
+import pytest
+import cProfile
+import pstats
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+from config.settings import get_settings
+from src.api.profiling import (
+    ProfileStore,
+    ProfilingMiddleware,
+    ProfiledRoute,
+    RequestProfile,
+    build_admin_router,
+    collapsed_stacks
+)
+
+TOKEN = "secret-token"
+
+
+def busy_work(n: int) -> int:
+    return sum(i * i for i in range(n))
+
+
+@pytest.fixture
+def profiled_client(tmp_path, monkeypatch):
+    """App with a profiled sync endpoint and the admin endpoints"""
+    monkeypatch.setattr(get_settings(), "profiling_enabled", True)
+    router = APIRouter(route_class=ProfiledRoute)
+
+    @router.get("/work")
+    def work():
+        return {"total": busy_work(20000)}
+
+    store = ProfileStore(str(tmp_path), max_profiles=3)
+    app = FastAPI()
+    app.include_router(router)
+    app.include_router(build_admin_router(store, TOKEN))
+    app.add_middleware(ProfilingMiddleware, store=store, admin_token=TOKEN)
+    return TestClient(app), store
+
+
+class TestRequestProfiling:
+    """Test opt-in request profiling"""
+
+    def test_header_triggers_profile_with_worker_thread(self, profiled_client):
+        """Test a profiled request stores a profile that includes the sync endpoint's thread"""
+        client, store = profiled_client
+        assert "x-profile-id" not in client.get("/work").headers
+        assert "x-profile-id" not in client.get("/work", headers={"X-Profile": "wrong"}).headers
+
+        response = client.get("/work", headers={"X-Profile": TOKEN})
+        profile_id = response.headers["x-profile-id"]
+        listing = client.get("/admin/profiles", headers={"X-Admin-Token": TOKEN}).json()
+        assert [(p["id"], p["path"], p["status"], p["trigger"]) for p in listing] == [
+            (profile_id, "/work", 200, "header")
+        ]
+
+        collapsed = client.get(f"/admin/profiles/{profile_id}", headers={"X-Admin-Token": TOKEN}).text
+        assert any("busy_work (test_profiling.py" in line for line in collapsed.splitlines())
+        raw = client.get(f"/admin/profiles/{profile_id}?format=pstats", headers={"X-Admin-Token": TOKEN})
+        assert raw.status_code == 200 and raw.content
+
+    def test_admin_endpoints_require_token(self, profiled_client):
+        """Test profiles cannot be listed or downloaded without the admin token"""
+        client, _ = profiled_client
+        assert client.get("/admin/profiles").status_code == 403
+        assert client.get("/admin/profiles/../x", headers={"X-Admin-Token": TOKEN}).status_code == 404
+
+    def test_store_is_bounded(self, profiled_client):
+        """Test the oldest profiles are deleted beyond max_profiles"""
+        client, store = profiled_client
+        ids = [client.get("/work", headers={"X-Profile": TOKEN}).headers["x-profile-id"] for _ in range(5)]
+        assert sorted(p["id"] for p in store.list()) == sorted(ids)[-3:]
+        assert len(list(store.directory.glob("*.prof"))) == 3
+
+
+class TestCollapsedStacks:
+    """Test the flamegraph export"""
+
+    def test_nested_calls_become_stacks(self):
+        """Test time is attributed along the caller chain"""
+        profile = cProfile.Profile()
+        profile.enable()
+        busy_work(50000)
+        profile.disable()
+
+        lines = collapsed_stacks(pstats.Stats(profile)).splitlines()
+        stack, value = next(line for line in lines if "<genexpr>" in line).rsplit(" ", 1)
+        frames = stack.split(";")
+        assert frames.index(f"busy_work (test_profiling.py:{busy_work.__code__.co_firstlineno})") < len(frames) - 1
+        assert int(value) > 0
@@ -0,0 +1,151 @@
+import asyncio
+import json
+import socket
+import threading
+import time
+import pytest
+from src.llm import stub_server
+from src.llm.providers import LLMProvider, OpenAIProvider
+from src.llm.rationale_generator import RationaleGenerator
+from src.llm.stub_server import stub_rationales
+
+
+class StubProvider(LLMProvider):
+    """In-process provider answering like the local stub server"""
+
+    def __init__(self, name="stub", delay=0.0, fail=False):
+        self.name = name
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self.active = 0
+        self.peak_active = 0
+
+    async def complete(self, prompt: str) -> str:
+        self.calls += 1
+        self.active += 1
+        self.peak_active = max(self.peak_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.fail:
+                raise ConnectionError("provider down")
+            return json.dumps(stub_rationales(prompt))
+        finally:
+            self.active -= 1
+
+
+def make_items(count, title="Build API"):
+    return [
+        {
+            "assignment_id": f"a{i}", "task_id": f"t{i}", "member_id": "m1",
+            "task_title": f"{title} {i}", "required_skills": ["Python"], "priority": "high",
+            "member_name": "Alice", "member_skills": ["Python:0.9"],
+            "skill_match": 0.9, "workload": 0.2, "reliability": 0.8, "urgency": 0.7
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def stub_url():
+    """Base URL of the OpenAI-compatible stub server, run on a free port"""
+    pytest.importorskip("openai")
+    uvicorn = pytest.importorskip("uvicorn")
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    server = uvicorn.Server(uvicorn.Config(stub_server.app, log_level="warning"))
+    thread = threading.Thread(target=server.run, kwargs={"sockets": [sock]}, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 10
+    while not server.started and time.monotonic() < deadline:
+        time.sleep(0.01)
+    stub_server.app.state.requests.clear()
+    yield f"http://127.0.0.1:{sock.getsockname()[1]}/v1"
+    server.should_exit = True
+    thread.join(10)
+    stub_server.app.state.delay_seconds = 0.0
+    sock.close()
+
+
+class TestRationaleGenerator:
+    """Test batched, cached rationale generation"""
+
+    def test_batches_and_caches(self):
+        """Test assignments are batched per prompt and repeated features hit the cache"""
+        provider = StubProvider()
+        generator = RationaleGenerator([provider], batch_size=10)
+
+        first = asyncio.run(generator.generate(make_items(25)))
+        assert provider.calls == 3
+        assert {r["source"] for r in first.values()} == {"stub"}
+        assert "Alice" in first["a0"]["text"]
+
+        second = asyncio.run(generator.generate(make_items(25)))
+        assert provider.calls == 3
+        assert {r["source"] for r in second.values()} == {"cache"}
+
+    def test_falls_back_to_secondary_then_template(self):
+        """Test failed or slow providers fall back in order"""
+        primary = StubProvider("primary", fail=True)
+        secondary = StubProvider("secondary")
+        results = asyncio.run(RationaleGenerator([primary, secondary]).generate(make_items(3)))
+        assert {r["source"] for r in results.values()} == {"secondary"}
+
+        slow = StubProvider("slow", delay=1.0)
+        generator = RationaleGenerator([slow], timeout_seconds=0.05)
+        results = asyncio.run(generator.generate(make_items(2)))
+        assert {r["source"] for r in results.values()} == {"template"}
+
+    def test_provider_must_implement_complete(self):
+        """Test a provider without complete() fails when created, not on its first call"""
+        class Incomplete(LLMProvider):
+            name = "incomplete"
+
+        with pytest.raises(TypeError):
+            Incomplete()
+
+    def test_per_provider_concurrency_limit(self):
+        """Test concurrent batches never exceed the provider limit"""
+        provider = StubProvider(delay=0.01)
+        generator = RationaleGenerator([provider], batch_size=1, max_concurrency=3)
+        asyncio.run(generator.generate(make_items(12)))
+        assert provider.calls == 12
+        assert provider.peak_active == 3
+
+
+class TestOpenAIProviderOverHttp:
+    """Test OpenAIProvider against the stub server"""
+
+    def test_request_and_response(self, stub_url):
+        """Test the chat completion request the stub receives and the rationales parsed from its reply"""
+        provider = OpenAIProvider("stub-key", "gpt-stub", base_url=stub_url)
+        results = asyncio.run(RationaleGenerator([provider], batch_size=10).generate(make_items(3)))
+
+        assert {r["source"] for r in results.values()} == {"openai"}
+        assert results["a1"]["text"] == "Alice fits 'Build API 1' (skill match 90%, workload 20%)."
+
+        [received] = stub_server.app.state.requests
+        body = received["body"]
+        assert received["headers"]["authorization"] == "Bearer stub-key"
+        assert body["model"] == "gpt-stub"
+        assert body["temperature"] == 0
+        assert [m["role"] for m in body["messages"]] == ["system", "user"]
+        items = json.loads(body["messages"][1]["content"].split("Assignments:\n", 1)[1])
+        assert [item["index"] for item in items] == [0, 1, 2]
+        assert items[0]["task_title"] == "Build API 0"
+
+    def test_timeout_falls_back(self, stub_url):
+        """Test a stub slower than the timeout falls back to the secondary provider, then the template"""
+        stub_server.app.state.delay_seconds = 2.0
+
+        primary = OpenAIProvider("stub-key", "gpt-stub", base_url=stub_url)
+        generator = RationaleGenerator([primary, StubProvider("secondary")], timeout_seconds=0.2)
+        started = time.perf_counter()
+        results = asyncio.run(generator.generate(make_items(2)))
+        assert {r["source"] for r in results.values()} == {"secondary"}
+        assert time.perf_counter() - started < 1.5
+
+        primary = OpenAIProvider("stub-key", "gpt-stub", base_url=stub_url)
+        results = asyncio.run(RationaleGenerator([primary], timeout_seconds=0.2).generate(make_items(2, "Fix bug")))
+        assert {r["source"] for r in results.values()} == {"template"}
+        assert len(stub_server.app.state.requests) == 2
@@ -1,5 +1,9 @@
 import pytest
 from src.sprint_planner.sprint_optimizer import SprintOptimizer
+from src.sprint_planner.scenario_evaluator import ScenarioEvaluator, ScenarioSpec
+from src.sprint_planner.horizon_planner import HorizonPlanner
+from src.sprint_planner.plan_recording import PlanCapture, PlanRecorder, compare_results, load_records, replay_record
+from src.decision_engine.constraints import PinConstraint
 from src.data_model.sprint import Sprint
 from src.data_model.team_member import TeamMember, Skill
 from src.data_model.task import Task, Priority
@@ -177,3 +181,175 @@ class TestSprintMetrics:
         days = sprint.days_remaining()
         assert days >= 13  # Close to 14 days
         assert days <= 14
+
+
+class TestScenarioEvaluation:
+    """Test what-if scenario evaluation"""
+    
+    def test_baseline_matches_plan(self, sprint_optimizer, sprint, team_members, tasks):
+        """Test the baseline scenario reproduces SprintOptimizer's plan"""
+        as_of = datetime.utcnow()
+        baseline = ScenarioEvaluator().evaluate(tasks, team_members, [], as_of=as_of)[0]
+        
+        planned_sprint, selected_tasks, assignments = sprint_optimizer.plan_sprint_with_assignments(
+            sprint,
+            [t.model_copy(deep=True) for t in tasks],
+            [m.model_copy(deep=True) for m in team_members],
+            as_of=as_of
+        )
+        
+        assert baseline.name == "baseline"
+        assert baseline.planned_tasks == planned_sprint.planned_tasks
+        assert baseline.assignments == {a.task_id: a.member_id for a in assignments}
+        assert baseline.risk_level == planned_sprint.risk_level
+        assert baseline.total_score == pytest.approx(sum(a.final_score for a in assignments))
+    
+    def test_scenarios_have_no_side_effects(self, team_members, tasks):
+        """Test evaluation leaves members and tasks untouched"""
+        before = [m.model_dump() for m in team_members], [t.model_dump() for t in tasks]
+        ScenarioEvaluator().evaluate(tasks, team_members, [
+            ScenarioSpec(name="leave", on_leave_member_ids=["member_1"]),
+            ScenarioSpec(name="cut", scope_cut=0.5)
+        ])
+        assert ([m.model_dump() for m in team_members], [t.model_dump() for t in tasks]) == before
+    
+    def test_scenario_deltas(self, team_members, tasks):
+        """Test scenarios report changes relative to the baseline"""
+        hire = TeamMember(
+            id="member_3",
+            name="Carol",
+            email="carol@example.com",
+            skills=[Skill(name="Python", proficiency=1.0)],
+            total_hours_available=40.0,
+            reliability_score=1.0
+        )
+        baseline, leave, cut, hired = ScenarioEvaluator().evaluate(tasks, team_members, [
+            ScenarioSpec(name="leave", on_leave_member_ids=["member_1"]),
+            ScenarioSpec(name="cut", scope_cut=0.5),
+            ScenarioSpec(name="hire", add_members=[hire])
+        ])
+        
+        assert "member_1" not in leave.assignments.values()
+        assert leave.assigned_tasks < baseline.assigned_tasks
+        assert cut.dropped_task_ids == ["task_3", "task_4"]
+        assert cut.planned_tasks == 2
+        assert hired.total_capacity == baseline.total_capacity + 40.0
+        assert "member_3" in hired.assignments.values()
+        assert all(change["to"] == "member_3" for change in hired.reassigned.values())
+    
+    def test_unknown_member_rejected(self, team_members, tasks):
+        """Test scenarios naming unknown members are rejected"""
+        with pytest.raises(ValueError):
+            ScenarioEvaluator().evaluate(tasks, team_members, [
+                ScenarioSpec(name="typo", remove_member_ids=["nobody"])
+            ])
+
+
+class TestHorizonPlanning:
+    """Test multi-sprint roadmap planning"""
+    
+    def test_roadmap_respects_member_capacity(self, team_members, tasks):
+        """Test no member is planned beyond their per-sprint capacity"""
+        backlog = [
+            t.model_copy(update={"id": f"{t.id}_{i}"}) for i in range(5) for t in tasks
+        ]
+        roadmap = HorizonPlanner().plan(backlog, team_members, num_sprints=4)
+        
+        hours = {t.id: t.estimated_hours for t in backlog}
+        load = {}
+        for item in roadmap.scheduled:
+            key = (item.member_id, item.sprint_index)
+            load[key] = load.get(key, 0.0) + hours[item.task_id]
+        assert max(load.values()) <= 40.0 * 0.85
+        assert len(roadmap.scheduled) + len(roadmap.unscheduled) == len(backlog)
+        assert roadmap.sprints[-1].completed_fraction <= 1.0
+    
+    def test_roadmap_orders_dependencies(self, team_members, tasks):
+        """Test dependent tasks are planned in a later sprint"""
+        tasks[0].depends_on = ["task_4"]
+        roadmap = HorizonPlanner().plan(tasks, team_members, num_sprints=3)
+        
+        sprint_of = {item.task_id: item.sprint_index for item in roadmap.scheduled}
+        assert sprint_of["task_1"] > sprint_of["task_4"]
+        assert roadmap.release_date == roadmap.sprints[sprint_of["task_1"]].end_date
+    
+    def test_roadmap_flags_late_and_unplaceable_tasks(self, team_members, tasks):
+        """Test late tasks and tasks nobody can take are reported"""
+        tasks[1].required_skills = ["Rust"]
+        tasks[0].depends_on = ["task_4"]
+        tasks[0].deadline = datetime.utcnow() + timedelta(days=1)
+        roadmap = HorizonPlanner().plan(tasks, team_members, num_sprints=3)
+        
+        assert roadmap.unscheduled == {"task_2": "skills"}
+        assert "task_1" in roadmap.late_task_ids
+        assert roadmap.release_date is None
+    
+    def test_roadmap_rejects_dependency_cycles(self, team_members, tasks):
+        """Test cyclic dependencies are rejected"""
+        tasks[0].depends_on = ["task_3"]
+        tasks[2].depends_on = ["task_1"]
+        with pytest.raises(ValueError):
+            HorizonPlanner().plan(tasks, team_members, num_sprints=3)
+    
+    def test_roadmap_skips_sprints_on_leave(self, team_members, tasks):
+        """Test members on leave get no work in the sprints they are away"""
+        now = datetime.utcnow()
+        team_members[0].on_leave = True
+        team_members[0].leave_start = now
+        team_members[0].leave_end = now + timedelta(days=14)
+        roadmap = HorizonPlanner().plan(tasks, team_members, num_sprints=3, as_of=now)
+        
+        assert roadmap.sprints[0].capacity_hours == pytest.approx(40.0 * 0.85)
+        assert all(
+            item.sprint_index > 0 for item in roadmap.scheduled if item.member_id == "member_1"
+        )
+
+
+class TestPlanRecording:
+    """Test recording planning runs and replaying them"""
+    
+    def record_plan(self, sprint, team_members, tasks):
+        now = datetime.utcnow()
+        tasks[2].depends_on = ["task_1", "task_outside"]
+        constraints = [PinConstraint(task_id="task_3", member_id="member_2")]
+        capture = PlanCapture(team_members, tasks, constraints, 14, now, weights_version="builtin")
+        planned, _, assignments = SprintOptimizer().plan_sprint_with_assignments(
+            sprint, tasks, team_members, as_of=now, constraints=constraints
+        )
+        return capture.finish(planned, assignments, team_members, latency_ms=5.0)
+    
+    def test_capture_is_anonymized(self, sprint, team_members, tasks):
+        """Test records keep planning inputs but no names or real ids"""
+        record = self.record_plan(sprint, team_members, tasks)
+        text = str(record)
+        for secret in ("Alice", "alice@example.com", "member_1", "task_1", "Build Backend API", "task_outside"):
+            assert secret not in text
+        
+        assert [m["id"] for m in record["team"]] == ["m0", "m1"]
+        assert record["backlog"][2]["depends_on"] == ["t0", "t4"]
+        assert record["backlog"][0]["required_skills"] == ["Python", "FastAPI"]
+        assert record["constraints"] == [{"type": "pin", "task_id": "t2", "member_id": "m1"}]
+        assert record["result"]["assignments"]["t2"] == "m1"
+    
+    def test_replay_reproduces_plan(self, sprint, team_members, tasks):
+        """Test replaying a record with the same planner gives the same plan quality"""
+        record = self.record_plan(sprint, team_members, tasks)
+        replayed = replay_record(record, SprintOptimizer())
+        comparison = compare_results(record["result"], replayed)
+        
+        assert comparison["total_score_delta"] == pytest.approx(0.0)
+        assert comparison["workload_std_delta"] == pytest.approx(0.0)
+        assert comparison["assigned_tasks_delta"] == 0
+        assert not comparison["risk_changed"] and not comparison["feasibility_changed"]
+        assert comparison["assignment_agreement"] == 1.0
+    
+    def test_recorder_rotates_files(self, tmp_path, sprint, team_members, tasks):
+        """Test records are appended, read back and old files deleted"""
+        recorder = PlanRecorder(str(tmp_path), max_files=1)
+        (tmp_path / "plans-20000101T00.jsonl").write_text("{}\n")
+        record = self.record_plan(sprint, team_members, tasks)
+        recorder.save(record)
+        recorder.save(record)
+        
+        assert [p.name.startswith("plans-2000") for p in tmp_path.iterdir()] == [False]
+        assert [r["id"] for r in load_records([str(tmp_path)])] == [record["id"]] * 2
@@ -0,0 +1,31 @@
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).parent.parent
+
+
+class TestColdStart:
+    """Test the API process starts without optional subsystems"""
+
+    def test_import_budget(self):
+        """Test src.main imports within budget, lazily and without API keys"""
+        result = subprocess.run(
+            [sys.executable, "benchmarks/check_import_time.py", "--budget-ms", "5000"],
+            cwd=BACKEND_DIR,
+            capture_output=True,
+            text=True
+        )
+        assert result.returncode == 0, result.stdout + result.stderr
+
+    def test_import_has_no_side_effects(self, tmp_path):
+        """Test importing the app creates no log file"""
+        result = subprocess.run(
+            [sys.executable, "-c", "import src.main, src.utils.logger"],
+            cwd=tmp_path,
+            env={"PYTHONPATH": str(BACKEND_DIR)},
+            capture_output=True,
+            text=True
+        )
+        assert result.returncode == 0, result.stderr
+        assert not (tmp_path / "agile_planner.log").exists()